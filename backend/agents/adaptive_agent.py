@@ -1,4 +1,16 @@
+import math
 import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from core.scoring_engine import get_scoring_engine
 
 TRAITS = [
     "analytical","creative","social","leadership",
@@ -55,22 +67,148 @@ QUESTION_BANK = {
 }
 
 
-def initialize_state():
+# question selection strategies
+MIN_CONFIDENCE = "min_confidence"
+INFO_GAIN = "info_gain"
+DEFAULT_STRATEGY = INFO_GAIN
+
+# trait belief: unanswered traits are N(PRIOR_MEAN, PRIOR_VAR) on the 0-10
+# scale; answered ones centre on the answer mean (what the profile scores)
+# with variance ANSWER_VAR / answers
+PRIOR_MEAN = 5.0
+PRIOR_VAR = 2.5 ** 2
+ANSWER_VAR = 2.0 ** 2
+
+# stop once the top domain beats the runner-up with this probability
+RANKING_CONFIDENCE = 0.9
+
+
+def initialize_state(strategy=DEFAULT_STRATEGY):
     return {
         "scores": {t:0 for t in TRAITS},
         "asked": [],
-        "confidence": {t:0 for t in TRAITS}
+        "confidence": {t:0 for t in TRAITS},
+        "strategy": strategy
     }
 
 
-def choose_trait(state):
+# ---------- TRAIT POSTERIOR ----------
+def trait_posterior(state):
+    """Belief mean and variance of each trait, in TRAITS order."""
+    sums = np.array([state["scores"][t] for t in TRAITS], dtype=float)
+    counts = np.array([state["confidence"][t] for t in TRAITS], dtype=float)
+
+    answered = counts > 0
+    safe = np.where(answered, counts, 1)
+
+    mean = np.where(answered, sums / safe, PRIOR_MEAN)
+    var = np.where(answered, ANSWER_VAR / safe, PRIOR_VAR)
+
+    return mean, var
+
+
+def _domain_weights():
+    # domain_weights.json normalised per domain, columns in TRAITS order
+    engine = get_scoring_engine()
+    weights = np.zeros((len(engine.domains), len(TRAITS)))
+
+    for j, trait in enumerate(TRAITS):
+        if trait in engine.trait_index:
+            weights[:, j] = engine.normalised[:, engine.trait_index[trait]]
+
+    return weights
+
+
+def _top_two_gap(state):
+    # gap between the top-2 domains under the posterior: mean, variance
+    # and each trait's coefficient in the gap
+    weights = _domain_weights()
+
+    mean, var = trait_posterior(state)
+    scores = weights @ mean
+
+    if len(scores) < 2:
+        return 0.0, 0.0, np.zeros(len(TRAITS)), var
+
+    first, second = np.argsort(-scores, kind="stable")[:2]
+    coeffs = weights[first] - weights[second]
+
+    return float(scores[first] - scores[second]), float(coeffs ** 2 @ var), coeffs, var
+
+
+def unanswered_traits(state):
+    """Traits that carry domain weight but have no answer yet."""
+    weighted = _domain_weights().any(axis=0)
+    return [t for j, t in enumerate(TRAITS) if weighted[j] and not state["confidence"][t]]
+
+
+def ranking_confidence(state):
+    """
+    Probability that the current top domain really beats the runner-up.
+    0 until every weighted trait has been answered once, since the
+    profile scores unanswered traits as 0.
+    """
+    if unanswered_traits(state):
+        return 0.0
+
+    gap, gap_var, _, _ = _top_two_gap(state)
+
+    if gap_var <= 0:
+        return 1.0
+
+    return 0.5 * (1 + math.erf(gap / math.sqrt(2 * gap_var)))
+
+
+def questions_left(state, trait):
+    return any(q not in state["asked"] for q in QUESTION_BANK[trait])
+
+
+# ---------- TRAIT SELECTION ----------
+def choose_trait_min_confidence(state):
     return min(state["confidence"], key=state["confidence"].get)
 
 
-def next_question(state):
+def choose_trait_info_gain(state):
+    """
+    Trait whose next answer most reduces the variance of the top-2 gap -
+    the largest expected information gain about which domain wins.
+    None when every question has been asked.
+    """
+    _, _, coeffs, var = _top_two_gap(state)
+    counts = np.array([state["confidence"][t] for t in TRAITS], dtype=float)
+
+    # variance after one more answer: ANSWER_VAR / (n + 1)
+    reduction = coeffs ** 2 * (var - ANSWER_VAR / (counts + 1))
+
+    # the profile needs every weighted trait, so those come first
+    unanswered = set(unanswered_traits(state))
+    if unanswered:
+        reduction = np.where([t in unanswered for t in TRAITS], reduction + 1e6, reduction)
+
+    best = None
+    for i in np.argsort(-reduction, kind="stable").tolist():
+        if questions_left(state, TRAITS[i]):
+            best = TRAITS[i]
+            break
+
+    return best
+
+
+def choose_trait(state):
+
+    if state.get("strategy", DEFAULT_STRATEGY) == INFO_GAIN:
+        return choose_trait_info_gain(state)
+
+    return choose_trait_min_confidence(state)
+
+
+def next_question(state, rng=None):
 
     trait = choose_trait(state)
 
+    if trait is None:
+        return {"status":"complete"}
+
     remaining = [
         q for q in QUESTION_BANK[trait]
         if q not in state["asked"]
@@ -79,7 +217,7 @@ def next_question(state):
     if not remaining:
         return {"status":"complete"}
 
-    question = random.choice(remaining)
+    question = (rng or random).choice(remaining)
     state["asked"].append(question)
 
     return {
@@ -1,5 +1,13 @@
-import json
-import os
+import sys
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from core.ranking import top_k
+from services.data_loader import get_data, get_index
 
 
 # ---------- LOAD DOMAIN RELATIONSHIPS ----------
@@ -8,40 +16,18 @@ def load_domain_relationships():
     Loads mapping of domains and their alternatives.
     Shows skill overlap, transfer paths, and career relationships.
     """
-    path = os.path.join(
-        os.path.dirname(__file__),
-        "..",
-        "data",
-        "alternative_paths.json"
-    )
-    
-    if os.path.exists(path):
-        with open(path) as f:
-            return json.load(f)
-    
-    # Default fallback
-    return {
+    # Default fallback if the file is missing
+    return get_data("alternative_paths.json", {
         "domain_relationships": {},
         "skill_transfers": {},
         "pivot_paths": {}
-    }
+    })
 
 
 # ---------- LOAD CAREERS ----------
 def load_careers():
     """Loads career data with domain and trait requirements."""
-    path = os.path.join(
-        os.path.dirname(__file__),
-        "..",
-        "data",
-        "careers.json"
-    )
-    
-    if os.path.exists(path):
-        with open(path) as f:
-            return json.load(f)
-    
-    return []
+    return get_data("careers.json", [])
 
 
 # ---------- ANALYZE CURRENT SKILLS ----------
@@ -66,10 +52,8 @@ def analyze_user_skills(profile):
                 "level": "weak" if value < 4 else "moderate" if value < 7 else "strong"
             })
     
-    # Sort by strength (descending)
-    skills.sort(key=lambda x: x["strength"], reverse=True)
-    
-    return skills[:5]  # Return top 5 skills
+    # Top 5 by strength (descending)
+    return top_k(skills, 5, key=lambda x: x["strength"])
 
 
 # ---------- FIND SKILL OVERLAP ----------
@@ -299,8 +283,7 @@ def find_lateral_moves(current_domain, target_domain, profile):
         []
     )
     
-    careers = load_careers()
-    domain_careers = [c for c in careers if c["domain"] == target_domain]
+    domain_careers = get_index("careers_by_domain").get(target_domain, ())
     
     moves = []
     for career in domain_careers:
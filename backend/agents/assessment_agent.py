@@ -7,53 +7,36 @@ backend_path = str(Path(__file__).parent.parent)
 if backend_path not in sys.path:
     sys.path.insert(0, backend_path)
 
-from services.data_loader import load_weights
-
-WEIGHTS = load_weights()
+from core.scoring_engine import get_scoring_engine, verdict_for
 
 
 def evaluate_domain_fit(domain, profile):
 
-    domain = domain.lower()
-    weights = WEIGHTS.get(domain)
-
-    if not weights:
-        return {"error": f"{domain} not found"}
-
-    score = 0
-    strengths = []
-    weaknesses = []
+    # compiled domains x traits matrix, rebuilt only when the weights change
+    return get_scoring_engine().evaluate(domain, profile)
 
-    total_weight = sum(weights.values()) or 1
 
-    for skill, weight in weights.items():
+def evaluate_all_domain_fits(profile, top_k=None):
 
-        val = profile.get(skill, 0)
-        score += val * weight
+    # every domain in one matrix-vector product, best first
+    return get_scoring_engine().evaluate_all(profile, top_k)
 
-        if val >= 7:
-            strengths.append(skill)
-        elif val <= 4:
-            weaknesses.append(skill)
 
-    final_score = round(score / total_weight, 2)
+def evaluate_domain_fit_batch(profiles, top_k=3):
 
-    verdict = (
-        "Excellent Fit" if final_score >= 7
-        else "Moderate Fit" if final_score >= 4
-        else "Low Fit"
-    )
+    # whole cohort in one pass - profiles x traits array or list of profile dicts
+    engine = get_scoring_engine()
+    order, scores = engine.rank_batch(profiles, top_k)
 
-    confidence = round((len(strengths) / len(weights)) * 100, 2) if weights else 0
+    domains = engine.domains
 
-    return {
-        "domain": domain,
-        "score": final_score,
-        "verdict": verdict,
-        "confidence": confidence,
-        "strengths": strengths,
-        "weaknesses": weaknesses
-    }
+    return [
+        [
+            {"domain": domains[i], "score": score, "verdict": verdict_for(score)}
+            for i, score in zip(row_order, row_scores)
+        ]
+        for row_order, row_scores in zip(order.tolist(), scores.tolist())
+    ]
 
 
 
@@ -34,11 +34,11 @@ def generate_careers(domain, profile):
 
 def match_careers(profile):
 
-    ranked = rank_domains(profile)
+    ranked = rank_domains(profile, limit=5)
 
     output = []
 
-    for item in ranked[:5]:
+    for item in ranked:
         domain = item["domain"]
 
         careers = generate_careers(domain, profile)
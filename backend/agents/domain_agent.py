@@ -7,27 +7,19 @@ backend_path = str(Path(__file__).parent.parent)
 if backend_path not in sys.path:
     sys.path.insert(0, backend_path)
 
-from services.data_loader import load_careers
+from core.career_index import get_career_index
 
-careers_db = load_careers()
 
+def evaluate_all_domains(profile, limit=None):
 
-def evaluate_all_domains(profile):
+    # careers.json weights (trait lists count 1 each) via the career vector index
+    ranked = get_career_index().query(profile, limit)
 
-    results = []
-
-    for career in careers_db:
-
-        score = 0
-        weights = career["traits"]
-
-        for trait, weight in weights.items():
-            score += profile.get(trait,0)*weight
-
-        results.append({
+    return [
+        {
             "career":career["career"],
             "domain":career["domain"],
-            "score":round(score,2)
-        })
-
-    return sorted(results,key=lambda x:x["score"],reverse=True)
+            "score":score
+        }
+        for career, score in ranked
+    ]
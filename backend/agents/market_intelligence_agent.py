@@ -1,31 +1,32 @@
-import json
-import os
+import sys
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
 from datetime import datetime
 from collections import Counter
 
+from core.ranking import top_k
+from services.data_loader import get_data
+from services.market_store import domain_key, get_market_store
+from services.market_trends import LABEL_GROWTH, curated_trends, store_trends, trend_label
+from services.skill_vocabulary import get_skill_vocabulary
+
 
 # ---------- LOAD MARKET DATA SOURCES ----------
 def load_market_data_sources():
     """
     Loads market data configuration with free API sources and mock data.
     """
-    path = os.path.join(
-        os.path.dirname(__file__),
-        "..",
-        "data",
-        "market_data.json"
-    )
-    
-    if not os.path.exists(path):
-        return {
+    try:
+        return get_data("market_data.json", {
             "status": "offline",
             "message": "Market data unavailable"
-        }
-    
-    try:
-        with open(path, encoding='utf-8') as f:
-            return json.load(f)
-    except:
+        })
+    except ValueError:
         return {"status": "error"}
 
 
@@ -33,9 +34,22 @@ def load_market_data_sources():
 def fetch_market_data(domain, location="US"):
     """
     Retrieves market data for a specific domain and location.
-    Uses local market data cache.
+    Reads listings ingested in the background (services.market_ingest)
+    when the store has any for the domain, else market_data.json.
     """
     all_data = load_market_data_sources()
+
+    store = get_market_store()
+    ingested = store.domain_slice(domain) if store is not None else None
+
+    if ingested is not None:
+        curated = all_data.get("job_data", {}).get(domain_key(domain), {})
+        trends = store_trends(store)
+        trend = trends.trend(domain_key(domain))
+        ingested["trend"] = trend
+        ingested["hiring_trend"] = trend["label"] if trend else curated.get("hiring_trend", "stable")
+        ingested["rising_skills"] = rising_skills(trends, domain_key(domain))
+        return ingested
     
     if all_data.get("status") == "offline":
         return {"total_jobs": 0, "jobs": []}
@@ -48,11 +62,17 @@ def fetch_market_data(domain, location="US"):
             domain_data = all_data["job_data"][key]
             # Handle both "listings" and "jobs" keys
             jobs = domain_data.get("jobs", domain_data.get("listings", []))
-            
+
+            # computed from posting dates; the curated label if there are none
+            trends = curated_trends()
+            trend = trends.trend(key)
+
             return {
                 "total_jobs": len(jobs),
                 "jobs": jobs,
-                "hiring_trend": domain_data.get("hiring_trend", "stable"),
+                "trend": trend,
+                "hiring_trend": trend["label"] if trend else domain_data.get("hiring_trend", "stable"),
+                "rising_skills": rising_skills(trends, key),
                 "average_salary": domain_data.get("average_salary", 0),
                 "market_size": domain_data.get("market_size", "medium")
             }
@@ -60,12 +80,21 @@ def fetch_market_data(domain, location="US"):
     return {"total_jobs": 0, "jobs": [], "hiring_trend": "unknown"}
 
 
+# ---------- RISING SKILLS ----------
+def rising_skills(trends, domain, top_n=5):
+    """Skills whose listing rate grows fastest in a domain."""
+    return [
+        {"skill": skill.title(), "growth_30d": trend["growth_30d"], "listings": trend["listings"]}
+        for skill, trend in trends.skill_trends(domain, top_n)
+    ]
+
+
 # ---------- CALCULATE DEMAND SCORE (0-100) ----------
 def calculate_demand_score(market_data):
     """
     Calculates demand score based on:
     - Job openings (0-60 points)
-    - Hiring trend bonus (-10 to +20 points)
+    - Hiring trend bonus (-10 to +20 points), from the numeric monthly growth
     - Salary premium bonus (0-15 points)
     """
     total_jobs = market_data.get("total_jobs", 0)
@@ -73,9 +102,14 @@ def calculate_demand_score(market_data):
     # Job openings scoring
     job_points = min(60, (total_jobs / 10) * 60)
     
-    # Hiring trend bonus
-    trend = market_data.get("hiring_trend", "stable")
-    trend_bonus = {"booming": 20, "growing": 10, "stable": 0, "declining": -10}.get(trend, 0)
+    # Hiring trend bonus: 40 points per 100% monthly growth, capped
+    if market_data.get("trend"):
+        growth = market_data["trend"]["growth_30d"]
+        trend = trend_label(growth)
+    else:
+        trend = market_data.get("hiring_trend", "stable")
+        growth = LABEL_GROWTH.get(trend, 0.0)
+    trend_bonus = round(max(-10.0, min(20.0, growth * 40)), 2)
     
     # Salary premium bonus
     salary = market_data.get("average_salary", 0)
@@ -93,6 +127,7 @@ def calculate_demand_score(market_data):
             },
             "hiring_trend": {
                 "value": trend,
+                "growth_30d": growth,
                 "contribution": trend_bonus
             },
             "salary_premium": {
@@ -114,12 +149,13 @@ def calculate_competition_score(market_data, user_skills=None):
     - Skill match with user (±10 points)
     """
     jobs = market_data.get("jobs", [])
+    skills = get_skill_vocabulary().scope()
     
-    # Skills diversity
-    all_skills = []
+    # Skills diversity (aliases and spellings of a skill count once)
+    job_skills = 0
     for job in jobs:
-        all_skills.extend(job.get("required_skills", []))
-    unique_skills = len(set(all_skills))
+        job_skills |= skills.mask(job.get("required_skills", []))
+    unique_skills = job_skills.bit_count()
     skills_points = min(40, unique_skills * 2)
     
     # Experience requirements
@@ -133,11 +169,8 @@ def calculate_competition_score(market_data, user_skills=None):
     
     # Skill match
     skill_match = 0
-    if user_skills and jobs:
-        job_skills = set(s.lower() for j in jobs for s in j.get("required_skills", []))
-        user_skills_lower = set(s.lower() for s in user_skills)
-        if job_skills:
-            skill_match = (len(user_skills_lower & job_skills) / len(job_skills)) * 100
+    if user_skills and job_skills:
+        skill_match = ((skills.mask(user_skills) & job_skills).bit_count() / unique_skills) * 100
     
     score = skills_points + exp_points + entry_bonus - (skill_match / 10)
     
@@ -286,11 +319,12 @@ def extract_in_demand_skills(market_data, top_n=10):
     Shows which skills appear most across all job postings.
     """
     jobs = market_data.get("jobs", [])
+    skills = get_skill_vocabulary().scope()
     skill_freq = Counter()
     
     for job in jobs:
-        for skill in job.get("required_skills", []):
-            skill_freq[skill.lower()] += 1
+        # skill IDs in order of mention, each counted once per job
+        skill_freq.update(list(dict.fromkeys(skills.id(s) for s in job.get("required_skills", []))))
     
     total_jobs = len(jobs) if jobs else 1
     
@@ -298,7 +332,7 @@ def extract_in_demand_skills(market_data, top_n=10):
     for skill, freq in skill_freq.most_common(top_n):
         percentage = (freq / total_jobs) * 100
         skills_list.append({
-            "skill": skill.title(),
+            "skill": skills.name(skill),
             "frequency": freq,
             "percentage_of_jobs": f"{percentage:.1f}%"
         })
@@ -344,17 +378,18 @@ def generate_job_alerts(market_data, user_skills, top_n=5):
     Returns jobs ranked by skill match percentage.
     """
     jobs = market_data.get("jobs", [])
-    user_skills_lower = set(s.lower() for s in user_skills)
+    skills = get_skill_vocabulary().scope()
+    user_mask = skills.mask(user_skills)
     
     matched_jobs = []
     
     for job in jobs:
-        job_skills = set(s.lower() for s in job.get("required_skills", []))
-        matching = user_skills_lower & job_skills
-        missing = job_skills - user_skills_lower
+        job_mask = skills.mask(job.get("required_skills", []))
+        matching = user_mask & job_mask
+        missing = job_mask & ~user_mask
         
-        if job_skills:
-            match_score = (len(matching) / len(job_skills)) * 100
+        if job_mask:
+            match_score = (matching.bit_count() / job_mask.bit_count()) * 100
         else:
             match_score = 0
         
@@ -364,14 +399,12 @@ def generate_job_alerts(market_data, user_skills, top_n=5):
             "location": job.get("location"),
             "salary": f"${job.get('salary_range', {}).get('min', 0):,} - ${job.get('salary_range', {}).get('max', 0):,}",
             "match_score": match_score,
-            "matching_skills": [s.title() for s in matching],
-            "missing_skills": [s.title() for s in list(missing)[:3]]
+            "matching_skills": skills.mask_names(matching),
+            "missing_skills": skills.mask_names(missing)[:3]
         })
     
-    # Sort by match score descending
-    matched_jobs.sort(key=lambda x: x["match_score"], reverse=True)
-    
-    return matched_jobs[:top_n]
+    # Best top_n by match score (partial selection, no full sort)
+    return top_k(matched_jobs, top_n, key=lambda x: x["match_score"])
 
 
 # ---------- MAIN ANALYZE FUNCTION ----------
@@ -412,7 +445,8 @@ def analyze_market_intelligence(domain, profile, skill_gaps=None, location="US")
         "market_overview": {
             "total_job_openings": market_data.get("total_jobs", 0),
             "market_size_assessment": "large" if market_data.get("total_jobs", 0) > 100 else "medium" if market_data.get("total_jobs", 0) > 20 else "small",
-            "hiring_trend": market_data.get("hiring_trend", "stable")
+            "hiring_trend": market_data.get("hiring_trend", "stable"),
+            "hiring_growth_30d": demand_result["factors"]["hiring_trend"]["growth_30d"]
         },
         "scores": {
             "demand_score": {
@@ -443,7 +477,8 @@ def analyze_market_intelligence(domain, profile, skill_gaps=None, location="US")
                 "average": salary["average"],
                 "currency": salary["currency"]
             },
-            "top_job_matches": job_matches
+            "top_job_matches": job_matches,
+            "rising_skills": market_data.get("rising_skills", [])
         },
         "recommendation": recommendation,
         "next_steps": [
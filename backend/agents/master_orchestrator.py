@@ -1,5 +1,8 @@
 import sys
 import os
+import contextvars
+import queue
+import threading
 from pathlib import Path
 
 # Add backend directory to path for imports
@@ -7,8 +10,10 @@ backend_path = str(Path(__file__).parent.parent)
 if backend_path not in sys.path:
     sys.path.insert(0, backend_path)
 
-from agents.adaptive_agent import next_question
-from agents.assessment_agent import evaluate_domain_fit
+from agents.adaptive_agent import (
+    DEFAULT_STRATEGY, INFO_GAIN, RANKING_CONFIDENCE, next_question, ranking_confidence
+)
+from agents.assessment_agent import evaluate_all_domain_fits
 from agents.skillgap_agent import skill_gap_analysis
 from agents.roadmap_agent import generate_roadmap
 from agents.timeline_agent import generate_timeline
@@ -18,29 +23,58 @@ from agents.alternative_paths_agent import explore_alternative_paths
 from agents.resource_recommender_agent import recommend_resources
 from agents.market_intelligence_agent import analyze_market_intelligence
 
-from services.data_loader import load_weights
+from services.data_loader import pinned_snapshot
+from core.scoring_engine import scoring_scope
+from core.task_graph import Task, run_graph
+from services.report_cache import REPORT_CACHE, SECTION_INPUTS, section_key
+from services.report_store import PendingSections
 
 
 CONFIDENCE_THRESHOLD = 2
 STOP_THRESHOLD = 6.5
 DOMAIN_GAP_THRESHOLD = 1.0
 MAX_CLARIFY_QUESTIONS = 5
+REPORT_DEADLINE_S = 20.0
+
+# budgeted mode: seconds each section may take before the report goes out without it
+DEFAULT_SECTION_BUDGET_S = 1.0
+SECTION_BUDGETS_S = {
+    "market_intelligence": 2.0,
+    "resource_recommendations": 1.5
+}
+
+_FINISHED = object()
+
+REPORT_SECTIONS = [
+    "explanation", "skill_gap", "roadmap", "timeline", "pace_customization",
+    "alternative_paths", "resource_recommendations", "market_intelligence"
+]
 
 
 def should_continue(state):
+
+    if state.get("strategy", DEFAULT_STRATEGY) == INFO_GAIN:
+        return ranking_confidence(state) < RANKING_CONFIDENCE
+
     return any(c < CONFIDENCE_THRESHOLD for c in state["confidence"].values())
 
 
-def evaluate_all_domains(profile):
+def evaluate_all_domains(profile, top_k=None):
 
-    weights = load_weights()
+    return evaluate_all_domain_fits(profile, top_k)
 
-    results = [
-        evaluate_domain_fit(domain, profile)
-        for domain in weights.keys()
-    ]
 
-    return sorted(results, key=lambda x: x["score"], reverse=True)
+def top_two_domains(state, profile):
+    """
+    Best two {"domain", "score"} entries. Sessions keep running scores in
+    state["domain_scores"] (updated per answer); otherwise score the profile.
+    """
+    running = state.get("domain_scores")
+
+    if running is None:
+        return evaluate_all_domains(profile, top_k=2)
+
+    return [{"domain": d, "score": s} for d, s in running.top_two()]
 
 
 def need_domain_verification(results):
@@ -51,68 +85,229 @@ def need_domain_verification(results):
     return abs(results[0]["score"] - results[1]["score"]) < DOMAIN_GAP_THRESHOLD
 
 
-def build_full_report(best, results, profile):
+def build_full_report(best, results, profile, deadline=REPORT_DEADLINE_S, budgets=None, cache=REPORT_CACHE):
+    """
+    Full report for the best domain.
+    With budgets ({section: seconds}, e.g. SECTION_BUDGETS_S), sections that
+    miss their budget are returned as {"status": "pending", "token": ...}
+    and can be fetched from the report store once they finish.
+    Sections are served from cache when their inputs are unchanged;
+    pass cache=None to recompute everything.
+    """
+
+    # every section reads the same data snapshot, even if a reload lands mid-report
+    with pinned_snapshot(), scoring_scope():
+        return _build_full_report(best, results, profile, deadline, budgets, cache)
+
+
+def format_skill_gaps(skill_gap):
 
-    roadmap = generate_roadmap(best["domain"])
-    skill_gaps = skill_gap_analysis(profile, best)
-    
     # Transform skill gaps for resource recommender
     # Convert "improvement_plan" with "trait" keys to format expected by recommend_resources
     formatted_gaps = []
-    for gap_item in skill_gaps.get("improvement_plan", []):
+    for gap_item in skill_gap.get("improvement_plan", []):
         formatted_gaps.append({
             "skill": gap_item.get("trait", ""),
             "gap_value": gap_item.get("gap", 0),
             "priority": gap_item.get("priority", "medium"),
             "learning_tip": gap_item.get("advice", "")
         })
-    
+
+    return formatted_gaps
+
+
+def _cached(cache, name, profile, best, fn):
+
+    # key on the profile fields and upstream results this section reads
+    def run(**deps):
+        key = section_key(name, profile, best, deps)
+        return cache.get_or_compute(key, lambda: fn(**deps))
+
+    return run
+
+
+def report_sections(best, profile, budgets=None, cache=None):
+    """
+    Report sections as a dependency graph.
+    Only pace (needs the roadmap) and the gap-driven sections wait on others.
+    """
+    domain = best["domain"]
+
+    tasks = [
+        Task("roadmap", lambda: generate_roadmap(domain)),
+        Task("skill_gap", lambda: skill_gap_analysis(profile, best)),
+        Task("explanation", lambda: explain(best, profile)),
+        Task("timeline", lambda: generate_timeline(best)),
+        Task("alternative_paths", lambda: explore_alternative_paths(None, domain, profile)),
+        Task("formatted_gaps", format_skill_gaps, deps=("skill_gap",)),
+        Task("pace_customization", lambda roadmap: customize_pace(profile, roadmap), deps=("roadmap",)),
+        Task(
+            "resource_recommendations",
+            lambda formatted_gaps: recommend_resources(formatted_gaps, profile),
+            deps=("formatted_gaps",)
+        ),
+        Task(
+            "market_intelligence",
+            lambda formatted_gaps: analyze_market_intelligence(domain, profile, formatted_gaps),
+            deps=("formatted_gaps",)
+        )
+    ]
+
+    if budgets is not None:
+        for task in tasks:
+            task.budget = budgets.get(task.name, DEFAULT_SECTION_BUDGET_S)
+
+    if cache is not None:
+        for task in tasks:
+            if task.name in SECTION_INPUTS:
+                task.fn = _cached(cache, task.name, profile, best, task.fn)
+
+    return tasks
+
+
+def _build_full_report(best, results, profile, deadline=REPORT_DEADLINE_S, budgets=None, cache=None):
+
+    tasks = report_sections(best, profile, budgets, cache)
+
+    if budgets is None:
+        run = run_graph(tasks, deadline=deadline)
+        sections = run.results
+    else:
+        pending = PendingSections()
+        run = run_graph(tasks, deadline=deadline, on_late=pending.on_late)
+        sections = dict(run.results)
+
+        for name in REPORT_SECTIONS:
+            if run.status[name] == "pending":
+                sections[name] = {"status": "pending", "section": name, "token": pending.issue(name)}
+
+    # without budgets, sections that missed the deadline come back as None;
+    # report_timing says why
     return {
         "best_domain": best,
         "top_5": results[:5],
-        "explanation": explain(best, profile),
-        "skill_gap": skill_gaps,
-        "roadmap": roadmap,
-        "timeline": generate_timeline(best),
-        "pace_customization": customize_pace(profile, roadmap),
-        "alternative_paths": explore_alternative_paths(None, best["domain"], profile),
-        "resource_recommendations": recommend_resources(formatted_gaps, profile),
-        "market_intelligence": analyze_market_intelligence(best["domain"], profile, formatted_gaps)
+        "explanation": sections.get("explanation"),
+        "skill_gap": sections.get("skill_gap"),
+        "roadmap": sections.get("roadmap"),
+        "timeline": sections.get("timeline"),
+        "pace_customization": sections.get("pace_customization"),
+        "alternative_paths": sections.get("alternative_paths"),
+        "resource_recommendations": sections.get("resource_recommendations"),
+        "market_intelligence": sections.get("market_intelligence"),
+        "report_timing": run.summary()
     }
 
 
-def orchestrate(state, profile):
+def stream_full_report(best, results, profile, deadline=REPORT_DEADLINE_S, cache=REPORT_CACHE):
+    """
+    Yields (event, payload) pairs as report sections finish:
+    "best_domain" and "top_5" first, then each section in completion order,
+    then "done" with the timing summary ("error" if a section fails).
+    """
+    events = queue.Queue()
+
+    def _on_done(name, result):
+        if name in REPORT_SECTIONS:
+            events.put((name, result))
+
+    def _run():
+        try:
+            with pinned_snapshot(), scoring_scope():
+                tasks = report_sections(best, profile, cache=cache)
+                run = run_graph(tasks, deadline=deadline, on_done=_on_done)
+            events.put((_FINISHED, run))
+        except Exception as e:
+            events.put(("error", {"error": f"{type(e).__name__}: {e}"}))
+
+    threading.Thread(target=contextvars.copy_context().run, args=(_run,), daemon=True).start()
+
+    yield "best_domain", best
+    yield "top_5", results[:5]
+
+    sent = set()
+    while True:
+        event, payload = events.get()
 
+        if event == "error":
+            yield event, payload
+            return
+
+        if event is _FINISHED:
+            # a section can finish just before the run returns
+            for name in REPORT_SECTIONS:
+                if name in payload.results and name not in sent:
+                    yield name, payload.results[name]
+            yield "done", {"report_timing": payload.summary()}
+            return
+
+        sent.add(event)
+        yield event, payload
+
+
+def orchestrate(state, profile, budgets=None):
+
+    # one data snapshot and one profile projection for the whole request
+    with pinned_snapshot(), scoring_scope():
+        return _orchestrate(state, profile, budgets)
+
+
+def _orchestrate(state, profile, budgets=None):
+
+    step = next_action(state, profile)
+
+    if step["action"] == "ask_question":
+        return step
+
+    results = step.pop("results")
+
+    return {
+        "action": "final_result",
+        **build_full_report(results[0], results, profile, budgets=budgets),
+        **step
+    }
+
+
+def next_action(state, profile, rng=None):
+    """
+    Decides the next step without building the report:
+    {"action": "ask_question", "data": ...} or
+    {"action": "final_result", "results": top 5 domains}, plus an optional note.
+    rng (a random.Random) picks among a trait's questions; default: the
+    module-level generator.
+    """
     if "clarify_count" not in state:
         state["clarify_count"] = 0
 
+    if state.get("strategy", DEFAULT_STRATEGY) == INFO_GAIN:
+        return _next_action_info_gain(state, profile, rng)
+
     # STEP 1
     if should_continue(state):
         return {
             "action": "ask_question",
-            "data": next_question(state)
+            "data": next_question(state, rng)
         }
 
-    # STEP 2
-    results = evaluate_all_domains(profile)
-    best = results[0]
+    # STEP 2 - decisions only need the top two; the report reads the top 5
+    top = top_two_domains(state, profile)
+    best = top[0]
 
     # STEP 3
-    if need_domain_verification(results):
+    if need_domain_verification(top):
 
         if state["clarify_count"] < MAX_CLARIFY_QUESTIONS:
             state["clarify_count"] += 1
 
             return {
                 "action": "ask_question",
-                "data": next_question(state),
-                "note": f"Clarifying between {results[0]['domain']} and {results[1]['domain']}"
+                "data": next_question(state, rng),
+                "note": f"Clarifying between {top[0]['domain']} and {top[1]['domain']}"
             }
 
         else:
             return {
                 "action": "final_result",
-                **build_full_report(best, results, profile),
+                "results": evaluate_all_domains(profile, top_k=5),
                 "note": "Decision made after clarification phase"
             }
 
@@ -121,13 +316,32 @@ def orchestrate(state, profile):
 
         return {
             "action": "final_result",
-            **build_full_report(best, results, profile)
+            "results": evaluate_all_domains(profile, top_k=5)
         }
 
     # STEP 5
     return {
         "action": "ask_question",
-        "data": next_question(state)
+        "data": next_question(state, rng)
+    }
+
+
+def _next_action_info_gain(state, profile, rng=None):
+
+    # ask until the top-2 ranking is settled, then stop - the posterior
+    # replaces the fixed confidence counts and the clarification phase
+    if should_continue(state):
+        question = next_question(state, rng)
+
+        if question.get("status") != "complete":
+            return {
+                "action": "ask_question",
+                "data": question
+            }
+
+    return {
+        "action": "final_result",
+        "results": evaluate_all_domains(profile, top_k=5)
     }
 
 
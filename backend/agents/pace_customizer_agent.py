@@ -1,5 +1,12 @@
-import json
-import os
+import sys
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from services.data_loader import get_data
 
 
 # ---------- LOAD PACE ACCELERATION FACTORS ----------
@@ -8,19 +15,8 @@ def load_pace_config():
     Loads configuration for pace customization factors.
     Returns default if file doesn't exist.
     """
-    path = os.path.join(
-        os.path.dirname(__file__),
-        "..",
-        "data",
-        "pace_config.json"
-    )
-    
-    if os.path.exists(path):
-        with open(path) as f:
-            return json.load(f)
-    
     # Default configuration
-    return {
+    return get_data("pace_config.json", {
         "hours_per_week_categories": {
             "low": {"min": 0, "max": 5, "multiplier": 1.5},
             "medium": {"min": 5, "max": 15, "multiplier": 1.0},
@@ -37,7 +33,7 @@ def load_pace_config():
             "average": {"multiplier": 1.0, "retention_risk": "medium"},
             "fast": {"multiplier": 0.75, "retention_risk": "low"}
         }
-    }
+    })
 
 
 # ---------- ANALYZE LEARNING PACE PROFILE ----------
@@ -1,5 +1,26 @@
-import json
-import os
+import sys
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+import numpy as np
+
+from core.path_optimizer import solve_cover
+from core.ranking import bottom_k, top_k_indices
+from core.resource_index import RankedResource, ResourceColumns, get_resource_index, score_columns
+from services.data_loader import get_data
+
+
+LEARNING_HORIZON_WEEKS = 12
+# spend allowed by budget preference, the same tiers everywhere: per resource
+# in recommend_by_budget, for the whole path in optimize_learning_path;
+# other preferences ("any", "premium") have no limit
+BUDGET_LIMITS = {"free": 0, "affordable": 100}
+# ranked candidates per gap the path optimizer chooses from
+PATH_CANDIDATES = 6
 
 
 # ---------- LOAD RESOURCE CATALOG ----------
@@ -7,25 +28,15 @@ def load_resource_catalog():
     """
     Loads comprehensive catalog of learning resources.
     Includes courses, books, videos, certifications, projects.
+    Served read-only from the shared data registry.
     """
-    path = os.path.join(
-        os.path.dirname(__file__),
-        "..",
-        "data",
-        "resource_catalog.json"
-    )
-    
-    if os.path.exists(path):
-        with open(path) as f:
-            return json.load(f)
-    
-    return {
+    return get_data("resource_catalog.json", {
         "courses": {},
         "books": {},
         "videos": {},
         "certifications": {},
         "projects": {}
-    }
+    })
 
 
 # ---------- SKILL TO RESOURCE MAPPING ----------
@@ -38,37 +49,26 @@ def get_resources_for_skill(skill_name, resource_type="all"):
         resource_type: "course", "book", "video", "cert", "project", "all"
     
     Returns:
-        List of resources matching the skill
+        List of read-only ResourceRecord views matching the skill,
+        in catalog order (served from the inverted skill index)
     """
     
-    catalog = load_resource_catalog()
-    resources = []
-    
-    # Search all resource types if "all"
-    types_to_search = {
-        "course": catalog.get("courses", {}),
-        "book": catalog.get("books", {}),
-        "video": catalog.get("videos", {}),
-        "cert": catalog.get("certifications", {}),
-        "project": catalog.get("projects", {})
-    }
-    
-    if resource_type != "all":
-        types_to_search = {resource_type: types_to_search.get(resource_type, {})}
-    
-    # Search for skill in each type
-    for rtype, resources_dict in types_to_search.items():
-        for resource_id, resource_data in resources_dict.items():
-            if skill_name.lower() in resource_data.get("skills", []):
-                resource_data["type"] = rtype
-                resource_data["id"] = resource_id
-                resources.append(resource_data)
-    
-    return resources
+    index = get_resource_index()
+    return index.resources(index.lookup(skill_name, resource_type))
+
+
+def get_resources_for_skills(skill_names, match="any", resource_type="all"):
+    """
+    Gets resources for several skills at once.
+    match="any" returns resources teaching at least one of the skills,
+    match="all" only those teaching every one of them.
+    """
+    index = get_resource_index()
+    return index.resources(index.lookup_many(skill_names, match, resource_type))
 
 
 # ---------- RANK RESOURCES ----------
-def rank_resources(resources, criteria=None):
+def rank_resources(resources, criteria=None, limit=None):
     """
     Ranks resources by relevance, quality, and fit.
     
@@ -80,67 +80,28 @@ def rank_resources(resources, criteria=None):
             "learning_style": "visual" or "hands-on" or "reading" or "mixed",
             "difficulty": "beginner" or "intermediate" or "advanced" or "any"
         }
+        limit: Only return the best N (partial selection, no full sort)
     
     Returns:
-        Ranked list of resources
+        Ranked list of RankedResource (id, score) views; the resources
+        themselves are never modified, so shared records are safe to rank
     """
     
-    if criteria is None:
-        criteria = {"max_hours": 100, "budget": "any", "learning_style": "any", "difficulty": "any"}
-    
-    scored_resources = []
-    
-    for resource in resources:
-        score = 100  # Starting score
-        
-        # Budget filtering
-        if criteria.get("budget") != "any":
-            if criteria["budget"] == "free" and resource.get("price", 0) > 0:
-                continue  # Skip paid if looking for free
-            if criteria["budget"] == "paid" and resource.get("price", 0) == 0:
-                continue  # Skip free if looking for paid
-        
-        # Hours constraint
-        hours = resource.get("hours_to_complete", 50)
-        if hours > criteria.get("max_hours", 100):
-            score -= (hours - criteria.get("max_hours", 100)) / 10
-        
-        # Learning style match
-        learning_style = criteria.get("learning_style", "any")
-        if learning_style != "any":
-            resource_style = resource.get("learning_style", [])
-            if learning_style in resource_style:
-                score += 15
-            else:
-                score -= 10
-        
-        # Difficulty match
-        difficulty = criteria.get("difficulty", "any")
-        if difficulty != "any":
-            if resource.get("difficulty") == difficulty:
-                score += 10
-        
-        # Quality rating
-        rating = resource.get("rating", 4.0)
-        score += (rating - 3.0) * 10  # Convert 1-5 rating to score bonus/penalty
-        
-        # Popularity (more reviews = trusted)
-        reviews = resource.get("reviews", 0)
-        popularity_bonus = min((reviews / 1000) * 5, 20)  # Cap at 20 points
-        score += popularity_bonus
-        
-        # Recency bonus (newer = better source)
-        year = resource.get("updated_year", 2024)
-        recency_bonus = max((year - 2020) * 2, 0)  # More recent = higher score
-        score += recency_bonus
-        
-        resource["score"] = max(0, round(score, 1))
-        scored_resources.append(resource)
-    
-    # Sort by score
-    scored_resources.sort(key=lambda x: x["score"], reverse=True)
-    
-    return scored_resources
+    # static quality terms come precomputed from the catalog index;
+    # resources from elsewhere get their columns built here
+    index = get_resource_index()
+    rows = index.positions(resources)
+
+    if rows is None:
+        kept, scores = score_columns(ResourceColumns(resources), np.arange(len(resources)), criteria)
+    else:
+        kept, scores = score_columns(index.columns, rows, criteria)
+
+    # Sort by score (top-k selection when only a prefix is needed)
+    return [
+        RankedResource(resources[kept[i]], max(0, scores[i].item()))
+        for i in top_k_indices(scores, limit).tolist()
+    ]
 
 
 # ---------- GENERATE LEARNING PATH ----------
@@ -160,13 +121,7 @@ def generate_learning_path(skill_gaps, profile=None):
     if profile is None:
         profile = {}
     
-    # Extract criteria from profile
-    criteria = {
-        "max_hours": profile.get("hours_per_week", 10) * 12,  # 12 weeks of learning
-        "budget": profile.get("budget_preference", "any"),
-        "learning_style": profile.get("learning_style", "any"),
-        "difficulty": profile.get("difficulty_preference", "any")
-    }
+    criteria = profile_criteria(profile)
     
     # Sort skill gaps by severity (highest gap = most important)
     sorted_gaps = sorted(skill_gaps, key=lambda x: x.get("gap_value", 0), reverse=True)
@@ -182,8 +137,8 @@ def generate_learning_path(skill_gaps, profile=None):
         if not all_resources:
             continue  # Skip if no resources available
         
-        # Rank resources based on criteria
-        ranked = rank_resources(all_resources, criteria)
+        # Rank resources based on criteria (only the top 5 are used)
+        ranked = rank_resources(all_resources, criteria, limit=5)
         
         if ranked:
             learning_path.append({
@@ -191,7 +146,7 @@ def generate_learning_path(skill_gaps, profile=None):
                 "skill": skill,
                 "gap_value": gap.get("gap_value", 0),
                 "gap_severity": assess_gap_severity(gap.get("gap_value", 0)),
-                "recommended_resources": ranked[:5],  # Top 5 resources
+                "recommended_resources": [r.to_dict() for r in ranked],  # Top 5 resources
                 "estimated_hours": sum(r.get("hours_to_complete", 20) for r in ranked[:3]) / 3,
                 "learning_tip": gap.get("learning_tip", "")
             })
@@ -199,6 +154,106 @@ def generate_learning_path(skill_gaps, profile=None):
     return learning_path
 
 
+def profile_criteria(profile):
+    """Ranking criteria from a profile's learning preferences."""
+    return {
+        "max_hours": profile.get("hours_per_week", 10) * LEARNING_HORIZON_WEEKS,
+        "budget": profile.get("budget_preference", "any"),
+        "learning_style": profile.get("learning_style", "any"),
+        "difficulty": profile.get("difficulty_preference", "any")
+    }
+
+
+# ---------- OPTIMIZED LEARNING PATH ----------
+def optimize_learning_path(skill_gaps, profile=None, horizon_weeks=LEARNING_HORIZON_WEEKS):
+    """
+    Picks one set of resources for the whole path instead of the best
+    few per gap. Maximises gap-weighted resource score, with the distinct
+    resources' total hours within hours_per_week x horizon_weeks and their
+    total price within the budget preference (BUDGET_LIMITS, or the
+    profile's "max_budget"). A resource covering several gaps is taken,
+    and paid for, once.
+    
+    Returns:
+        Steps in gap order with their resource, the distinct resources,
+        uncovered skills, totals and solver details
+    """
+    
+    if profile is None:
+        profile = {}
+    
+    criteria = profile_criteria(profile)
+    hours_per_week = profile.get("hours_per_week", 10)
+    max_hours = hours_per_week * horizon_weeks
+    max_cost = profile.get("max_budget", BUDGET_LIMITS.get(criteria["budget"]))
+    
+    sorted_gaps = sorted(skill_gaps, key=lambda x: x.get("gap_value", 0), reverse=True)
+    
+    # candidates per gap; resources are deduplicated by catalog position
+    items, item_of, options = [], {}, []
+    for gap in sorted_gaps:
+        gap_options = []
+        for ranked in rank_resources(get_resources_for_skill(gap.get("skill", "")), criteria, PATH_CANDIDATES):
+            key = getattr(ranked.resource, "position", ranked.id)
+            if key not in item_of:
+                item_of[key] = len(items)
+                items.append(ranked)
+            gap_options.append((item_of[key], ranked.score))
+        options.append(gap_options)
+    
+    solved = solve_cover(
+        [gap.get("gap_value", 0) for gap in sorted_gaps],
+        options,
+        [(r.get("hours_to_complete", 0), r.get("price", 0)) for r in items],
+        max_hours,
+        max_cost
+    )
+    
+    steps, resources, covers = [], [], {}
+    for gap, item in zip(sorted_gaps, solved["assignment"]):
+        skill = gap.get("skill", "unknown")
+        shared = item in covers
+        
+        if item is not None:
+            if not shared:
+                covers[item] = []
+                resources.append(item)
+            covers[item].append(skill)
+        
+        steps.append({
+            "skill": skill,
+            "gap_value": gap.get("gap_value", 0),
+            "gap_severity": assess_gap_severity(gap.get("gap_value", 0)),
+            "resource": items[item].to_dict() if item is not None else None,
+            "shared_with_earlier_step": shared
+        })
+    
+    total_hours = sum(items[i].get("hours_to_complete", 0) for i in resources)
+    total_weight = sum(gap.get("gap_value", 0) for gap in sorted_gaps)
+    covered_weight = sum(
+        gap.get("gap_value", 0) for gap, item in zip(sorted_gaps, solved["assignment"]) if item is not None
+    )
+    
+    return {
+        "budget": {"hours": max_hours, "cost": max_cost, "horizon_weeks": horizon_weeks},
+        "steps": steps,
+        "resources": [dict(items[i].to_dict(), covers=covers[i]) for i in resources],
+        "uncovered_skills": [step["skill"] for step in steps if step["resource"] is None],
+        "totals": {
+            "hours": round(total_hours, 1),
+            "cost": round(sum(items[i].get("price", 0) for i in resources), 2),
+            "weeks": round(total_hours / hours_per_week, 1) if hours_per_week else None,
+            "coverage": round(covered_weight / total_weight, 3) if total_weight else 1.0,
+            "weighted_score": round(solved["value"], 2)
+        },
+        "solver": {
+            "optimal": solved["optimal"],
+            "states": solved["states"],
+            "candidates_per_gap": solved["width"]
+        }
+    }
+
+
 # ---------- ASSESS GAP SEVERITY ----------
 def assess_gap_severity(gap_value):
     """
@@ -319,7 +374,7 @@ def recommend_by_type(skill, resource_type="course"):
         "skill": skill,
         "type": resource_type,
         "count": len(ranked),
-        "resources": ranked[:5]
+        "resources": [r.to_dict() for r in ranked[:5]]
     }
 
 
@@ -330,7 +385,7 @@ def recommend_by_budget(skill_gaps, budget="free"):
     
     Args:
         skill_gaps: List of skills needing resources
-        budget: "free", "affordable" (<$100), "premium" (any price)
+        budget: "free", "affordable" (up to $100 each, BUDGET_LIMITS), "premium" (any price)
     
     Returns:
         Resources grouped by skill, filtered by budget
@@ -342,12 +397,7 @@ def recommend_by_budget(skill_gaps, budget="free"):
         skill = gap.get("skill", "")
         
         # Determine price filter
-        if budget == "free":
-            max_price = 0
-        elif budget == "affordable":
-            max_price = 100
-        else:
-            max_price = float('inf')
+        max_price = BUDGET_LIMITS.get(budget, float('inf'))
         
         resources = get_resources_for_skill(skill)
         
@@ -355,7 +405,7 @@ def recommend_by_budget(skill_gaps, budget="free"):
         filtered = [r for r in resources if r.get("price", 0) <= max_price]
         
         if filtered:
-            ranked = rank_resources(filtered)
+            ranked = rank_resources(filtered, limit=3)
             recommendations.append({
                 "skill": skill,
                 "gap_severity": assess_gap_severity(gap.get("gap_value", 0)),
@@ -440,6 +490,7 @@ def recommend_resources(skill_gaps, profile=None):
             "learning_style": profile.get("learning_style", "any")
         },
         "learning_path": learning_path,
+        "optimized_path": optimize_learning_path(skill_gaps, profile),
         "statistics": {
             "critical_skills": critical_gaps,
             "significant_skills": len([s for s in learning_path if s["gap_severity"] == "significant"]),
@@ -515,12 +566,13 @@ def get_quick_start_resources(skill, hours_available=5):
     
     if not quick_resources:
         # Get shortest resources available
-        quick_resources = sorted(
+        quick_resources = bottom_k(
             resources,
+            5,
             key=lambda x: x.get("hours_to_complete", 100)
-        )[:5]
+        )
     
-    ranked = rank_resources(quick_resources)
+    ranked = rank_resources(quick_resources, limit=3)
     
     return {
         "skill": skill,
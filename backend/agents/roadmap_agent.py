@@ -1,18 +1,19 @@
-import json
-import os
+import sys
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
 import random
 
-def load_templates():
+from services.data_loader import get_data
 
-    path = os.path.join(
-        os.path.dirname(__file__),
-        "..",
-        "data",
-        "roadmap_templates.json"
-    )
 
-    with open(path) as f:
-        return json.load(f)
+def load_templates():
+
+    return get_data("roadmap_templates.json")
 
 
 def generate_roadmap(career):
@@ -0,0 +1,122 @@
+import sys
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from agents.master_orchestrator import (
+    MAX_CLARIFY_QUESTIONS, build_full_report, evaluate_all_domains, next_action
+)
+from core.scoring_engine import scoring_scope
+from services.data_loader import pinned_snapshot
+from services.session_store import COMPLETE, MAX_SCORE, MIN_SCORE, QUESTION_INDEX, SESSIONS, TRAITS
+
+
+MIN_ANSWER = MIN_SCORE
+MAX_ANSWER = MAX_SCORE
+
+
+# ---------- START ----------
+def start_session(profile=None, store=SESSIONS):
+    """
+    New assessment session.
+    profile may carry preferences (hours_per_week, budget_preference, ...)
+    and, optionally, trait scores that count as one answer each.
+    Raises ValueError (and keeps no session) for an invalid trait score.
+    """
+    record = store.create()
+
+    if profile:
+        try:
+            record.set_profile(profile)
+        except ValueError:
+            store.delete(record.session_id)
+            raise
+        store.save(record)
+
+    return record
+
+
+# ---------- NEXT QUESTION ----------
+def next_session_question(record, store=SESSIONS):
+    """
+    The question to answer next, or {"action": "complete"} once the
+    orchestrator is confident enough to produce the final result.
+    Asking again before answering returns the same question.
+    """
+    with store.lock(record.session_id):
+        return _next_question(record, store)
+
+
+def _next_question(record, store):
+    if record.status == COMPLETE:
+        return {"action": "complete"}
+
+    if record.pending >= 0:
+        return {"action": "ask_question", "data": record.pending_question()}
+
+    # only the decision; the report is built by /result and the stream
+    state = record.to_state()
+    with pinned_snapshot(), scoring_scope():
+        result = next_action(state, record.profile())
+    record.apply_state(state)
+
+    data = result.get("data") or {}
+
+    if result["action"] == "final_result" or data.get("status") == "complete":
+        record.status = COMPLETE
+        store.save(record)
+        return {"action": "complete"}
+
+    record.pending = QUESTION_INDEX[data["question"]]
+    store.save(record)
+
+    response = {"action": "ask_question", "data": data}
+    if "note" in result:
+        response["note"] = result["note"]
+
+    return response
+
+
+# ---------- ANSWER ----------
+def answer_session_question(record, score, store=SESSIONS):
+    """Records a 0-10 answer for the pending question."""
+    with store.lock(record.session_id):
+        return _record_answer(record, score, store)
+
+
+def _record_answer(record, score, store):
+    if record.pending < 0:
+        raise ValueError("no question is pending; ask for the next question first")
+
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or not MIN_ANSWER <= score <= MAX_ANSWER:
+        raise ValueError(f"score must be a number from {MIN_ANSWER} to {MAX_ANSWER}")
+
+    trait = record.pending_question()["trait"]
+    record.record_answer(trait, score)
+    record.pending = -1
+    store.save(record)
+
+    return {
+        "trait": trait,
+        "answers": record.confidence[TRAITS.index(trait)],
+        "status": record.status
+    }
+
+
+# ---------- RESULT ----------
+def session_result(record):
+    """Final report for a completed session."""
+    if record.status != COMPLETE:
+        return None
+
+    profile = record.profile()
+    results = evaluate_all_domains(profile, top_k=5)
+
+    result = {"action": "final_result", **build_full_report(results[0], results, profile)}
+    if record.clarify_count >= MAX_CLARIFY_QUESTIONS:
+        result["note"] = "Decision made after clarification phase"
+
+    return result
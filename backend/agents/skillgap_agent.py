@@ -1,34 +1,25 @@
-import json
-import os
+import sys
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from services.data_loader import get_data
 
 
 # ---------- LOAD DOMAIN VECTORS ----------
 def load_domain_vectors():
 
-    path = os.path.join(
-        os.path.dirname(__file__),
-        "..",
-        "data",
-        "domain_vectors.json"
-    )
-
-    with open(path) as f:
-        return json.load(f)
+    return get_data("domain_vectors.json")
 
 
 
 # ---------- LOAD IMPROVEMENT TIPS ----------
 def load_tips():
 
-    path = os.path.join(
-        os.path.dirname(__file__),
-        "..",
-        "data",
-        "trait_tips.json"
-    )
-
-    with open(path) as f:
-        return json.load(f)
+    return get_data("trait_tips.json")
 
 
 
@@ -1,13 +1,13 @@
-import json
-import os
+import sys
 from pathlib import Path
 
-# Load domain vectors from data directory
-current_dir = Path(__file__).parent.parent
-vectors_path = current_dir / "data" / "domain_vectors.json"
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
 
-with open(vectors_path) as f:
-    DOMAIN_VECTORS = json.load(f)
+from core.ranking import top_k
+from core.scoring_engine import domain_vector_scores
 
 
 def cosine_score(profile, domain_vector):
@@ -22,15 +22,8 @@ def cosine_score(profile, domain_vector):
     return score / total if total else 0
 
 
-def rank_domains(profile):
-    results = []
+def rank_domains(profile, limit=None):
+    # same weighted mean as cosine_score, from the compiled scoring core
+    ranked = top_k(domain_vector_scores(profile), limit, key=lambda x: x[1])
 
-    for domain, vector in DOMAIN_VECTORS.items():
-        score = cosine_score(profile, vector)
-
-        results.append({
-            "domain": domain,
-            "score": round(score,3)
-        })
-
-    return sorted(results, key=lambda x: x["score"], reverse=True)
+    return [{"domain": domain, "score": score} for domain, score in ranked]
@@ -0,0 +1,277 @@
+"""
+Budgeted set cover for learning paths.
+
+Each gap has a weight and a short list of candidate items (resources) with
+a quality for that gap; an item costs hours and money once, however many
+gaps it covers. solve_cover assigns at most one item to each gap so that
+
+    sum(weight[gap] * quality[gap, item])    over assigned gaps
+
+is maximal with total hours and cost of the distinct items within budget.
+
+The exact solver is a knapsack-style DP over gaps, memoised on
+(gap, hours left, cost left, items already bought that later gaps could
+reuse). Hours and cost are rounded up to whole units so states repeat.
+An upper bound (best remaining quality per gap) prunes options that
+cannot beat the best one found for a state. If the state count or time
+cap is hit, the DP is retried on each gap's best half of the options
+(down to one), and as a last resort the greedy path is returned; such
+results are marked as not optimal.
+
+Benchmark: python -m core.path_optimizer --bench
+"""
+
+import math
+import sys
+import time
+
+
+MAX_STATES = 200000
+TIME_LIMIT_S = 0.25
+
+
+class _OverBudget(Exception):
+    pass
+
+
+def _units(value):
+    return int(math.ceil(value - 1e-9)) if value else 0
+
+
+def solve_cover(weights, options, items, max_hours=None, max_cost=None,
+                max_states=MAX_STATES, time_limit_s=TIME_LIMIT_S):
+    """
+    Args:
+        weights: weight per gap
+        options: per gap, a list of (item index, quality) candidates
+        items: per item, (hours, cost)
+        max_hours, max_cost: totals for the distinct chosen items (None = no limit)
+
+    Returns:
+        {"assignment": item index or None per gap, "value", "hours", "cost",
+         "optimal": True if the DP finished on all options, "states": DP states
+         visited, "width": options per gap the DP used (0 = greedy)}
+    """
+    hours = [_units(h) for h, _ in items]
+    costs = [_units(c) for _, c in items]
+    hours_cap = _units(max_hours) if max_hours is not None else None
+    cost_cap = _units(max_cost) if max_cost is not None else None
+
+    # drop candidates that could never fit, best quality first
+    fits = [
+        sorted(
+            ((item, weight * quality) for item, quality in gap_options
+             if (hours_cap is None or hours[item] <= hours_cap)
+             and (cost_cap is None or costs[item] <= cost_cap)),
+            key=lambda option: -option[1]
+        )
+        for weight, gap_options in zip(weights, options)
+    ]
+    start = time.perf_counter()
+    full_width = width = max((len(gap_options) for gap_options in fits), default=0)
+    share = 0.5
+
+    # over the caps, retry on each gap's best half of the options; each
+    # attempt may use half of the time still left
+    while True:
+        narrowed = [gap_options[:width] for gap_options in fits]
+        deadline = start + time_limit_s * share
+        try:
+            assignment, states = _solve(narrowed, hours, costs, hours_cap, cost_cap, max_states, deadline)
+        except _OverBudget:
+            if width <= 1:
+                break
+            width //= 2
+            share = (1 + share) / 2 if width > 1 else 1.0
+            continue
+        return dict(_totals(assignment, fits, hours, costs), optimal=width == full_width, states=states, width=width)
+
+    return dict(_greedy(fits, hours, costs, hours_cap, cost_cap), optimal=False, states=0, width=0)
+
+
+def _solve(fits, hours, costs, hours_cap, cost_cap, max_states, deadline):
+    """Memoised DP over gaps; raises _OverBudget past the state or time cap."""
+    n = len(fits)
+
+    # items later gaps could still use, and the best value left per suffix
+    later = [0] * (n + 1)
+    bound = [0.0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        later[i] = later[i + 1]
+        for item, _ in fits[i]:
+            later[i] |= 1 << item
+        bound[i] = bound[i + 1] + (fits[i][0][1] if fits[i] else 0.0)
+
+    memo = {}
+
+    def best(i, hours_left, cost_left, owned):
+        """(value, -hours, -cost) of the best suffix from gap i, and the choice."""
+        if i == n:
+            return (0.0, 0, 0), None
+
+        key = (i, hours_left, cost_left, owned & later[i])
+        found = memo.get(key)
+        if found is not None:
+            return found
+
+        if len(memo) >= max_states or (len(memo) & 1023 == 0 and time.perf_counter() > deadline):
+            raise _OverBudget()
+
+        # leaving the gap uncovered is always possible
+        (value, neg_hours, neg_cost), _ = best(i + 1, hours_left, cost_left, owned)
+        result = ((value, neg_hours, neg_cost), None)
+
+        for item, gain in fits[i]:
+            if result[0][0] > gain + bound[i + 1]:
+                break   # options are sorted, nothing after this can win
+
+            bit = 1 << item
+            if owned & bit:
+                (value, neg_hours, neg_cost), _ = best(i + 1, hours_left, cost_left, owned)
+            else:
+                h, c = hours[item], costs[item]
+                if (hours_left is not None and h > hours_left) or (cost_left is not None and c > cost_left):
+                    continue
+                (value, neg_hours, neg_cost), _ = best(
+                    i + 1,
+                    None if hours_left is None else hours_left - h,
+                    None if cost_left is None else cost_left - c,
+                    owned | bit
+                )
+                neg_hours -= h
+                neg_cost -= c
+
+            candidate = (value + gain, neg_hours, neg_cost)
+            if candidate > result[0]:
+                result = (candidate, item)
+
+        memo[key] = result
+        return result
+
+    best(0, hours_cap, cost_cap, 0)
+
+    # walk the memo to read the chosen path
+    assignment = []
+    hours_left, cost_left, owned = hours_cap, cost_cap, 0
+    for i in range(n):
+        _, item = memo[(i, hours_left, cost_left, owned & later[i])]
+        assignment.append(item)
+        if item is not None and not owned & (1 << item):
+            owned |= 1 << item
+            hours_left = None if hours_left is None else hours_left - hours[item]
+            cost_left = None if cost_left is None else cost_left - costs[item]
+
+    return assignment, len(memo)
+
+
+def _greedy(fits, hours, costs, hours_cap, cost_cap):
+    """Per gap in order, the best option already bought or still affordable."""
+    assignment = []
+    owned = set()
+    hours_left, cost_left = hours_cap, cost_cap
+
+    for gap_options in fits:
+        choice = None
+        for item, _ in gap_options:
+            if item in owned:
+                choice = item
+                break
+            if (hours_left is None or hours[item] <= hours_left) and (cost_left is None or costs[item] <= cost_left):
+                choice = item
+                owned.add(item)
+                hours_left = None if hours_left is None else hours_left - hours[item]
+                cost_left = None if cost_left is None else cost_left - costs[item]
+                break
+        assignment.append(choice)
+
+    return _totals(assignment, fits, hours, costs)
+
+
+def _totals(assignment, fits, hours, costs):
+    gains = [dict(gap_options) for gap_options in fits]
+    chosen = {item for item in assignment if item is not None}
+    return {
+        "assignment": assignment,
+        "value": sum(gains[i][item] for i, item in enumerate(assignment) if item is not None),
+        "hours": sum(hours[item] for item in chosen),
+        "cost": sum(costs[item] for item in chosen)
+    }
+
+
+# ---------- BENCHMARK ----------
+def random_problem(gaps, per_gap=6, shared=0.3, seed=3):
+    """Gaps with per_gap candidates each; a share of items cover several gaps."""
+    import random
+
+    rng = random.Random(seed)
+    items, options = [], []
+    pool = []
+
+    for _ in range(gaps):
+        gap_options = []
+        for _ in range(per_gap):
+            if pool and rng.random() < shared:
+                item = rng.choice(pool)
+            else:
+                item = len(items)
+                items.append((rng.choice([2, 5, 10, 20, 40, 70]), rng.choice([0, 0, 15, 39, 49, 199])))
+                pool.append(item)
+            if item not in dict(gap_options):
+                gap_options.append((item, round(rng.uniform(90, 170), 1)))
+        options.append(gap_options)
+
+    weights = [round(rng.uniform(0.1, 0.5), 2) for _ in range(gaps)]
+    return weights, options, items
+
+
+def brute_force(weights, options, items, max_hours=None, max_cost=None):
+    """Exhaustive search over every assignment (tiny problems only)."""
+    from itertools import product
+
+    best = None
+    for choice in product(*[[None] + [item for item, _ in gap_options] for gap_options in options]):
+        chosen = {item for item in choice if item is not None}
+        h = sum(_units(items[item][0]) for item in chosen)
+        c = sum(_units(items[item][1]) for item in chosen)
+        if (max_hours is not None and h > _units(max_hours)) or (max_cost is not None and c > _units(max_cost)):
+            continue
+        value = sum(
+            weights[i] * dict(options[i])[item] for i, item in enumerate(choice) if item is not None
+        )
+        if best is None or value > best + 1e-9:
+            best = value
+    return best
+
+
+def benchmark(sizes=(4, 8, 12, 16, 24), per_gap=6):
+    results = []
+
+    for gaps in sizes:
+        weights, options, items = random_problem(gaps, per_gap)
+        for hours, cost in ((60, 50), (150, None)):
+            start = time.perf_counter()
+            solved = solve_cover(weights, options, items, hours, cost)
+            ms = (time.perf_counter() - start) * 1000
+            greedy = solve_cover(weights, options, items, hours, cost, max_states=0)
+
+            results.append({
+                "gaps": gaps,
+                "budget": (hours, cost),
+                "ms": round(ms, 2),
+                "states": solved["states"],
+                "optimal": solved["optimal"],
+                "value": round(solved["value"], 2),
+                "greedy_value": round(greedy["value"], 2)
+            })
+
+    return results
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        for row in benchmark():
+            print(
+                f"gaps={row['gaps']:>3} budget={str(row['budget']):>11}"
+                f" | {row['ms']:>8} ms, {row['states']:>6} states, optimal={row['optimal']!s:>5}"
+                f" | value {row['value']:>7} vs greedy {row['greedy_value']:>7}"
+            )
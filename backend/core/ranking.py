@@ -0,0 +1,106 @@
+"""
+Shared top-k selection for ranking paths that only need a prefix.
+
+top_k(items, k, key) returns exactly sorted(items, key=key, reverse=True)[:k]
+(ties keep input order) in O(n log k) instead of O(n log n).
+top_k_indices(scores, k) is the NumPy equivalent of
+np.argsort(-scores, kind="stable")[:k] using a linear-time partition.
+
+Benchmark: python -m core.ranking --bench
+"""
+
+import heapq
+import sys
+
+import numpy as np
+
+
+# ---------- PYTHON OBJECTS ----------
+def top_k(items, k, key=None):
+    """Largest k items, best first; equal keys keep their input order."""
+    if k is None:
+        return sorted(items, key=key, reverse=True)
+    if k <= 0:
+        return []
+    # heapq.nlargest breaks ties by input position, so it is a stable prefix
+    return heapq.nlargest(k, items, key=key)
+
+
+def bottom_k(items, k, key=None):
+    """Smallest k items, smallest first; equal keys keep their input order."""
+    if k is None:
+        return sorted(items, key=key)
+    if k <= 0:
+        return []
+    return heapq.nsmallest(k, items, key=key)
+
+
+# ---------- NUMPY SCORES ----------
+def top_k_indices(scores, k=None):
+    """
+    Indices of the k largest scores, best first.
+    Ties are broken by lower index first, same as a stable full argsort.
+    """
+    scores = np.asarray(scores)
+    n = len(scores)
+
+    if k is None or k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # k-th largest value; everything above it is in, ties fill the rest by index
+    kth = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+
+    selected = np.concatenate([above, ties])
+    selected.sort()
+
+    return selected[np.argsort(-scores[selected], kind="stable")]
+
+
+# ---------- BENCHMARK ----------
+def benchmark(sizes=(1000, 10000, 100000), k=10, rounds=5, seed=3):
+    """Full sort + slice vs top-k selection, for dict lists and score arrays."""
+    import random
+    import time
+
+    rng = random.Random(seed)
+    results = []
+
+    def _time(fn):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return (time.perf_counter() - start) / rounds * 1000
+
+    for n in sizes:
+        # coarse scores so there are plenty of ties to break
+        items = [{"id": i, "score": round(rng.uniform(0, 100), 1)} for i in range(n)]
+        scores = np.array([item["score"] for item in items])
+        key = lambda x: x["score"]
+
+        assert top_k(items, k, key) == sorted(items, key=key, reverse=True)[:k]
+        assert (top_k_indices(scores, k) == np.argsort(-scores, kind="stable")[:k]).all()
+
+        results.append({
+            "n": n,
+            "sorted_ms": round(_time(lambda: sorted(items, key=key, reverse=True)[:k]), 3),
+            "top_k_ms": round(_time(lambda: top_k(items, k, key)), 3),
+            "argsort_ms": round(_time(lambda: np.argsort(-scores, kind="stable")[:k]), 3),
+            "top_k_indices_ms": round(_time(lambda: top_k_indices(scores, k)), 3)
+        })
+
+    return results
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        for row in benchmark():
+            print(
+                f"n={row['n']:>6} | sorted()[:10] {row['sorted_ms']:>8} ms"
+                f" | top_k {row['top_k_ms']:>7} ms"
+                f" | argsort[:10] {row['argsort_ms']:>7} ms"
+                f" | top_k_indices {row['top_k_indices_ms']:>6} ms"
+            )
@@ -0,0 +1,453 @@
+"""
+Inverted skill index over the learning resource catalog.
+
+Every resource gets a position, grouped by type in catalog order (courses,
+books, videos, certifications, projects), so a type is one contiguous
+range of positions. Each skill ID of the shared SkillVocabulary maps to a
+sorted int32 postings array of positions (aliases and spellings of a
+skill share one ID, so "ML fundamentals" finds Machine Learning
+resources); the postings of one type are the slice of that array
+inside the type's range (two binary searches, no separate lists to keep
+in sync). Lookups cost O(postings) and return resources in the same order
+as a scan of the catalog.
+
+Resources are served as immutable ResourceRecord views over the shared
+catalog entries and rankings as RankedResource (id, score) views, so one
+index can be shared by concurrent requests without copying or locking.
+Responses turn the few resources they return into dicts with to_dict().
+
+ResourceColumns holds the ranking inputs as column arrays. The static
+quality terms (rating, popularity, recency) are computed once per catalog
+snapshot; score_columns adds the query terms (hours, style, difficulty)
+and the budget mask over a candidate set in a few NumPy operations.
+
+Benchmark: python -m core.resource_index --bench
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from core.scoring_engine import round_scores
+from services.data_loader import get_data
+from services.skill_vocabulary import SkillVocabulary, get_skill_vocabulary, skill_key
+
+
+# (resource type, catalog section), in search order
+RESOURCE_TYPES = (
+    ("course", "courses"),
+    ("book", "books"),
+    ("video", "videos"),
+    ("cert", "certifications"),
+    ("project", "projects")
+)
+
+EMPTY = np.empty(0, dtype=np.int32)
+
+# ranking defaults for fields a resource leaves out
+DEFAULT_HOURS = 50
+DEFAULT_RATING = 4.0
+DEFAULT_YEAR = 2024
+DEFAULT_CRITERIA = {"max_hours": 100, "budget": "any", "learning_style": "any", "difficulty": "any"}
+
+_MISSING = object()
+
+
+# ---------- RECORDS ----------
+class _ReadOnly:
+    """Dict-style reads over get(); attributes are fixed after __init__."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    __delattr__ = __setattr__
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+
+class ResourceRecord(_ReadOnly):
+    """One catalog resource: its index position, type, id and read-only fields."""
+
+    __slots__ = ("position", "type", "id", "data")
+
+    def __init__(self, position, rtype, resource_id, data):
+        object.__setattr__(self, "position", position)
+        object.__setattr__(self, "type", rtype)
+        object.__setattr__(self, "id", resource_id)
+        object.__setattr__(self, "data", data)
+
+    def get(self, key, default=None):
+        if key == "type":
+            return self.type
+        if key == "id":
+            return self.id
+        return self.data.get(key, default)
+
+    def to_dict(self):
+        return dict(self.data, type=self.type, id=self.id)
+
+    def __repr__(self):
+        return f"ResourceRecord({self.type}:{self.id})"
+
+
+class RankedResource(_ReadOnly):
+    """
+    (id, score) view of a ranked resource. Other fields read through to the
+    record (or plain dict) it ranks, which is never written to.
+    """
+
+    __slots__ = ("resource", "score")
+
+    def __init__(self, resource, score):
+        object.__setattr__(self, "resource", resource)
+        object.__setattr__(self, "score", score)
+
+    @property
+    def id(self):
+        return self.resource.get("id")
+
+    def get(self, key, default=None):
+        if key == "score":
+            return self.score
+        return self.resource.get(key, default)
+
+    def to_dict(self):
+        resource = self.resource
+        fields = resource.to_dict() if isinstance(resource, ResourceRecord) else dict(resource)
+        fields["score"] = self.score
+        return fields
+
+    def __iter__(self):
+        return iter((self.id, self.score))
+
+    def __repr__(self):
+        return f"RankedResource({self.id!r}, {self.score})"
+
+
+# ---------- RANKING COLUMNS ----------
+class ResourceColumns:
+    """
+    Ranking inputs of a list of resources as column arrays.
+    The query-independent terms are kept as separate columns so
+    score_columns can add them in the original order and round the same.
+    """
+
+    def __init__(self, resources):
+        self.price = np.array([r.get("price", 0) for r in resources], dtype=float)
+        self.hours = np.array([r.get("hours_to_complete", DEFAULT_HOURS) for r in resources], dtype=float)
+
+        rating = np.array([r.get("rating", DEFAULT_RATING) for r in resources], dtype=float)
+        reviews = np.array([r.get("reviews", 0) for r in resources], dtype=float)
+        year = np.array([r.get("updated_year", DEFAULT_YEAR) for r in resources], dtype=float)
+
+        # static quality: rating bonus/penalty, popularity (capped), recency
+        self.static_terms = (
+            (rating - 3.0) * 10,
+            np.minimum((reviews / 1000) * 5, 20),
+            np.maximum((year - 2020) * 2, 0)
+        )
+
+        # value -> membership mask, for the small style and difficulty vocabularies
+        self.styles = _masks([r.get("learning_style", ()) for r in resources])
+        self.difficulty = _masks([(r.get("difficulty"),) for r in resources])
+        self.size = len(resources)
+
+    def mask(self, masks, value):
+        found = masks.get(value)
+        return found if found is not None else np.zeros(self.size, dtype=bool)
+
+
+def _masks(values):
+    masks = {}
+    for i, found in enumerate(values):
+        for value in found:
+            if value not in masks:
+                masks[value] = np.zeros(len(values), dtype=bool)
+            masks[value][i] = True
+    return masks
+
+
+def score_columns(columns, rows, criteria=None):
+    """
+    Scores candidate rows of columns for a query.
+    Returns (indices into rows kept by the budget filter, their scores).
+    """
+    criteria = criteria or DEFAULT_CRITERIA
+    rows = np.asarray(rows, dtype=np.intp)
+    kept = np.arange(len(rows))
+
+    # budget filter
+    budget = criteria.get("budget", "any")
+    if budget == "free":
+        kept = kept[columns.price[rows] <= 0]
+    elif budget == "paid":
+        kept = kept[columns.price[rows] != 0]
+    rows = rows[kept]
+
+    # hours over the limit cost a point per 10 hours
+    max_hours = criteria.get("max_hours", 100)
+    hours = columns.hours[rows]
+    score = 100 - np.where(hours > max_hours, (hours - max_hours) / 10, 0.0)
+
+    learning_style = criteria.get("learning_style", "any")
+    if learning_style != "any":
+        score += np.where(columns.mask(columns.styles, learning_style)[rows], 15, -10)
+
+    difficulty = criteria.get("difficulty", "any")
+    if difficulty != "any":
+        score += np.where(columns.mask(columns.difficulty, difficulty)[rows], 10, 0)
+
+    for term in columns.static_terms:
+        score += term[rows]
+
+    return kept, np.maximum(round_scores(score, 1), 0)
+
+
+class ResourceIndex:
+    """
+    Skill ID -> postings of resource positions, per catalog snapshot.
+    vocabulary: SkillVocabulary resolving skill names (default: the
+    catalog's own skill names, without synonyms).
+    """
+
+    def __init__(self, catalog, source=None, vocabulary=None):
+        self.source = source
+        self.vocabulary = vocabulary or SkillVocabulary(_catalog_skills(catalog))
+        self.records = []
+        self.type_ranges = {}
+        postings = {}
+        # raw catalog spelling -> skill ID (catalogs repeat a small vocabulary)
+        names = {}
+        missing = object()
+
+        for rtype, section in RESOURCE_TYPES:
+            start = len(self.records)
+
+            for resource_id, resource in catalog.get(section, {}).items():
+                position = len(self.records)
+                self.records.append(ResourceRecord(position, rtype, resource_id, resource))
+                skills = set()
+                for raw in resource.get("skills", ()):
+                    skill = names.get(raw, missing)
+                    if skill is missing:
+                        skill = names[raw] = self.vocabulary.resolve(raw)
+                    # a skill the vocabulary does not know could never be looked up
+                    if skill is not None:
+                        skills.add(skill)
+                for skill in skills:
+                    postings.setdefault(skill, []).append(position)
+
+            self.type_ranges[rtype] = (start, len(self.records))
+
+        self.postings = {skill: np.array(p, dtype=np.int32) for skill, p in postings.items()}
+        self.columns = ResourceColumns([record.data for record in self.records])
+
+    def __len__(self):
+        return len(self.records)
+
+    def skills(self):
+        """Canonical names of the skills with postings."""
+        return [self.vocabulary.name(skill_id) for skill_id in self.postings]
+
+    # ---------- POSTINGS ----------
+    def _of_type(self, positions, resource_type):
+        if resource_type == "all":
+            return positions
+
+        bounds = self.type_ranges.get(resource_type)
+        if bounds is None:
+            return EMPTY
+
+        low, high = np.searchsorted(positions, bounds)
+        return positions[low:high]
+
+    def _postings(self, skill):
+        skill_id = self.vocabulary.resolve(skill)
+        return EMPTY if skill_id is None else self.postings.get(skill_id, EMPTY)
+
+    def lookup(self, skill, resource_type="all"):
+        """Sorted positions of resources teaching skill (or an alias of it)."""
+        return self._of_type(self._postings(skill), resource_type)
+
+    def lookup_many(self, skills, match="any", resource_type="all"):
+        """
+        Positions of resources teaching any (union) or all (intersection)
+        of the skills. Intersections start from the shortest postings.
+        """
+        lists = [self._postings(s) for s in skills]
+        if not lists:
+            return EMPTY
+
+        if match == "all":
+            lists.sort(key=len)
+            found = lists[0]
+            for positions in lists[1:]:
+                if not len(found):
+                    break
+                found = np.intersect1d(found, positions, assume_unique=True)
+        else:
+            found = lists[0] if len(lists) == 1 else np.unique(np.concatenate(lists))
+
+        return self._of_type(found, resource_type)
+
+    def positions(self, resources):
+        """Positions of records from this index, or None if any resource is not one."""
+        records = self.records
+        found = []
+        for resource in resources:
+            position = getattr(resource, "position", None)
+            if position is None or position >= len(records) or records[position] is not resource:
+                return None
+            found.append(position)
+        return np.array(found, dtype=np.intp)
+
+    def resources(self, positions):
+        """Shared, immutable records for positions (nothing is copied)."""
+        records = self.records
+        return [records[i] for i in positions.tolist()]
+
+
+def _catalog_skills(catalog):
+    return [
+        skill
+        for _, section in RESOURCE_TYPES
+        for resource in catalog.get(section, {}).values()
+        for skill in resource.get("skills", ())
+    ]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_resource_index():
+    """
+    Index over resource_catalog.json with the shared skill vocabulary,
+    rebuilt when the registry serves a new catalog or vocabulary.
+    """
+    global _index
+
+    catalog = get_data("resource_catalog.json", {})
+    vocabulary = get_skill_vocabulary()
+    index = _index
+
+    if index is None or index.source is not catalog or index.vocabulary is not vocabulary:
+        with _index_lock:
+            if _index is None or _index.source is not catalog or _index.vocabulary is not vocabulary:
+                _index = ResourceIndex(catalog, source=catalog, vocabulary=vocabulary)
+            index = _index
+
+    return index
+
+
+# ---------- BENCHMARK ----------
+def synthetic_catalog(n, skills=2000, seed=7):
+    """A catalog of n resources over a Zipf-ish skill vocabulary."""
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"skill {i}" for i in range(skills)]
+    weights = 1.0 / np.arange(1, skills + 1)
+    weights /= weights.sum()
+
+    catalog = {section: {} for _, section in RESOURCE_TYPES}
+    sections = [section for _, section in RESOURCE_TYPES]
+
+    # up to 5 skills per resource, drawn together for the whole catalog
+    picked = rng.choice(skills, size=(n, 5), p=weights)
+    counts = rng.integers(1, 6, size=n)
+    price = rng.choice([0.0, 15.0, 49.0, 199.0], size=n)
+    hours = rng.integers(1, 120, size=n)
+    rating = np.round(rng.uniform(3.0, 5.0, size=n), 1)
+    reviews = rng.integers(0, 20000, size=n)
+    year = rng.integers(2018, 2026, size=n)
+
+    for i in range(n):
+        catalog[sections[i % len(sections)]][f"resource_{i}"] = {
+            "title": f"Resource {i}",
+            "skills": [vocabulary[s] for s in dict.fromkeys(picked[i, :counts[i]].tolist())],
+            "price": price[i].item(),
+            "hours_to_complete": hours[i].item(),
+            "rating": rating[i].item(),
+            "reviews": reviews[i].item(),
+            "updated_year": year[i].item()
+        }
+
+    return catalog
+
+
+def scan(catalog, skill, resource_type="all", vocabulary=None):
+    """The linear catalog scan the index replaces (vocabulary: resolve aliases too)."""
+    key = vocabulary.resolve if vocabulary is not None else skill_key
+    skill = key(skill)
+    found = []
+    if skill is None:
+        return found
+    for rtype, section in RESOURCE_TYPES:
+        if resource_type not in ("all", rtype):
+            continue
+        for resource_id, resource in catalog.get(section, {}).items():
+            if skill in {key(s) for s in resource.get("skills", ())}:
+                found.append(dict(resource, type=rtype, id=resource_id))
+    return found
+
+
+def benchmark(sizes=(10000, 100000), queries=50, seed=7):
+    import time
+
+    results = []
+
+    for n in sizes:
+        catalog = synthetic_catalog(n, seed=seed)
+
+        start = time.perf_counter()
+        index = ResourceIndex(catalog)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # a mix of common and rare skills
+        skills = [f"skill {i}" for i in np.random.default_rng(seed).integers(0, 200, size=queries)]
+
+        def _time(fn):
+            start = time.perf_counter()
+            for skill in skills:
+                fn(skill)
+            return (time.perf_counter() - start) / queries * 1000
+
+        assert [r.to_dict() for r in index.resources(index.lookup(skills[0]))] == scan(catalog, skills[0])
+
+        results.append({
+            "n": n,
+            "build_ms": round(build_ms, 1),
+            "scan_ms": round(_time(lambda s: scan(catalog, s)), 3),
+            "lookup_ms": round(_time(lambda s: index.resources(index.lookup(s))), 3),
+            "copy_ms": round(_time(lambda s: [r.to_dict() for r in index.resources(index.lookup(s))]), 3),
+            "postings_ms": round(_time(lambda s: index.lookup(s)), 4)
+        })
+
+    return results
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        for row in benchmark():
+            print(
+                f"n={row['n']:>6} | build {row['build_ms']:>7} ms"
+                f" | scan {row['scan_ms']:>8} ms"
+                f" | index + records {row['lookup_ms']:>6} ms"
+                f" (+ dict copies {row['copy_ms']:>6} ms)"
+                f" | postings {row['postings_ms']:>6} ms"
+            )
@@ -0,0 +1,566 @@
+import contextvars
+import math
+import sys
+import threading
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from core.ranking import top_k_indices
+from services.data_loader import get_data, load_careers, load_weights
+
+
+TRAITS = [
+    "analytical", "creative", "social", "leadership",
+    "practical", "empathy", "risk", "focus", "curiosity"
+]
+
+STRENGTH_THRESHOLD = 7
+WEAKNESS_THRESHOLD = 4
+
+
+# ---------- ROUNDING ----------
+def round_scores(values, decimals=2):
+    """
+    Vectorised round(x, decimals) that agrees with Python's round.
+    np.round only differs when x * 10**decimals lands next to .5, so just
+    those entries are re-rounded in Python.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, decimals)
+
+    scaled = values * 10 ** decimals
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+
+    if near_half.any():
+        rounded[near_half] = [round(v, decimals) for v in values[near_half].tolist()]
+
+    return rounded
+
+
+# ---------- VERDICT ----------
+def verdict_for(score):
+    return (
+        "Excellent Fit" if score >= 7
+        else "Moderate Fit" if score >= 4
+        else "Low Fit"
+    )
+
+
+# ---------- WEIGHT SOURCES ----------
+def _mapping_rows(data):
+    # {"row": {"trait": weight}} files (domain_weights, domain_vectors)
+    return [(key, list(weights.items()), None) for key, weights in data.items()]
+
+
+def career_rows(data):
+    # careers list "traits" as names (weight 1 each) or as {"trait": weight}
+    rows = []
+    for career in data:
+        traits = career.get("traits", ())
+        pairs = list(traits.items()) if isinstance(traits, dict) else [(t, 1) for t in traits]
+        rows.append((career["career"], pairs, career))
+    return rows
+
+
+WEIGHT_SOURCES = {}
+
+
+def register_weight_source(name, load, rows=_mapping_rows):
+    """
+    Plugs a weight source into the scoring core.
+    load() returns the registry data; rows(data) turns it into
+    [(key, [(trait, weight), ...], meta), ...].
+    """
+    WEIGHT_SOURCES[name] = (load, rows)
+
+
+register_weight_source("domain_weights", load_weights)
+register_weight_source("domain_vectors", lambda: get_data("domain_vectors.json"))
+register_weight_source("careers", load_careers, career_rows)
+
+
+# ---------- COMPILED WEIGHTS ----------
+class CompiledWeights:
+    """
+    One weight source compiled into a dense rows x traits matrix.
+
+    Products are evaluated over a per-row layout that keeps each row's
+    traits in JSON order, and rows are reduced with a running sum.
+    That pins the summation order, so scores round exactly like the
+    original dict loops instead of drifting in the last float bit.
+    """
+
+    def __init__(self, source_rows, source=None):
+        self.source = source
+        self.keys = [key for key, _, _ in source_rows]
+        self.meta = [meta for _, _, meta in source_rows]
+        self.key_index = {k: i for i, k in enumerate(self.keys)}
+
+        # canonical traits first, then any extra trait a row weights
+        extra = [t for _, pairs, _ in source_rows for t, _ in pairs if t not in TRAITS]
+        self.traits = TRAITS + list(dict.fromkeys(extra))
+        self.trait_index = {t: i for i, t in enumerate(self.traits)}
+
+        self.trait_counts = [len(pairs) for _, pairs, _ in source_rows]
+        width = max(self.trait_counts, default=0) or 1
+
+        # dense rows x traits matrix, plus the same weights in JSON order per row
+        self.matrix = np.zeros((len(self.keys), len(self.traits)))
+        self.layout_cols = np.zeros((len(self.keys), width), dtype=np.intp)
+        self.layout_weights = np.zeros((len(self.keys), width))
+
+        for i, (_, pairs, _) in enumerate(source_rows):
+            cols = [self.trait_index[t] for t, _ in pairs]
+            values = [w for _, w in pairs]
+
+            np.add.at(self.matrix[i], cols, values)
+            self.layout_cols[i, :len(cols)] = cols
+            self.layout_weights[i, :len(cols)] = values
+
+        totals = np.cumsum(self.layout_weights, axis=1)[:, -1]
+        self.totals = np.where(totals == 0, 1, totals)
+        self.normalised = self.matrix / self.totals[:, None]
+
+        # plain lists for per-row Python passes (strengths, weaknesses)
+        self.row_cols = [row[:n] for row, n in zip(self.layout_cols.tolist(), self.trait_counts)]
+
+    # ---------- PROFILE ----------
+    def profile_vector(self, profile):
+        return project(profile).vector(self.traits)
+
+    def profile_matrix(self, profiles):
+        """
+        profiles x traits array from a list of profile dicts or an array.
+        Array columns follow self.traits (TRAITS order for the first 9).
+        Raises ValueError for null (NaN) or infinite trait scores.
+        """
+        if isinstance(profiles, np.ndarray):
+            matrix = np.asarray(profiles, dtype=float)
+            if matrix.ndim != 2 or matrix.shape[1] > len(self.traits):
+                raise ValueError(f"expected a profiles x {len(self.traits)} array, got {matrix.shape}")
+            if matrix.shape[1] < len(self.traits):
+                matrix = np.pad(matrix, ((0, 0), (0, len(self.traits) - matrix.shape[1])))
+        else:
+            traits = self.traits
+            matrix = np.array([[p.get(t, 0) for t in traits] for p in profiles], dtype=float).reshape(-1, len(traits))
+
+        # None becomes NaN in a float array, and NaN scores cannot be ranked or encoded
+        if not np.isfinite(matrix).all():
+            raise ValueError("trait scores must be finite numbers")
+
+        return matrix
+
+    # ---------- WEIGHTED SUMS ----------
+    def sums(self, vector):
+        """Weighted trait sum per row, in row JSON order."""
+        return np.cumsum(self.layout_weights * vector[self.layout_cols], axis=1)[:, -1]
+
+    def present_sums(self, vector, present):
+        """
+        Weighted sum and weight total per row over only the traits
+        present in the profile (absent traits are skipped, not zero).
+        """
+        weights = self.layout_weights * present[self.layout_cols]
+        sums = np.cumsum(weights * vector[self.layout_cols], axis=1)[:, -1]
+        return sums, np.cumsum(weights, axis=1)[:, -1]
+
+    def sums_batch(self, matrix):
+        products = self.layout_weights * matrix[:, self.layout_cols]
+        return np.cumsum(products, axis=2)[:, :, -1]
+
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def get_compiled(name):
+    """
+    Compiled weights for a registered source.
+    Rebuilt only when the registry serves new data for it.
+    """
+    load, rows = WEIGHT_SOURCES[name]
+    data = load()
+    compiled = _compiled.get(name)
+
+    if compiled is None or compiled.source is not data:
+        with _compiled_lock:
+            compiled = _compiled.get(name)
+            if compiled is None or compiled.source is not data:
+                factory = DomainScoringEngine if name == "domain_weights" else CompiledWeights
+                compiled = factory(rows(data), source=data)
+                _compiled[name] = compiled
+
+    return compiled
+
+
+# ---------- PROFILE PROJECTION ----------
+class ProfileProjection:
+    """
+    A profile projected onto trait columns, with memoised per-source scores.
+    Inside a scoring_scope every caller shares one projection per profile.
+    """
+
+    __slots__ = ("profile", "_vectors", "_scores")
+
+    def __init__(self, profile):
+        self.profile = profile
+        self._vectors = {}
+        self._scores = {}
+
+    def vector(self, traits):
+        key = tuple(traits)
+        cached = self._vectors.get(key)
+        if cached is None:
+            profile = self.profile
+            cached = self._vectors[key] = np.array([profile.get(t, 0) for t in traits], dtype=float)
+        return cached
+
+    def present(self, traits):
+        key = ("present", tuple(traits))
+        cached = self._vectors.get(key)
+        if cached is None:
+            profile = self.profile
+            cached = self._vectors[key] = np.array([t in profile for t in traits], dtype=float)
+        return cached
+
+    def memo(self, key, compute):
+        if key not in self._scores:
+            self._scores[key] = compute()
+        return self._scores[key]
+
+
+_SCOPE = contextvars.ContextVar("scoring_scope", default=None)
+
+
+@contextmanager
+def scoring_scope():
+    """Shares profile projections across every scorer called inside the block."""
+    if _SCOPE.get() is not None:
+        yield
+        return
+
+    token = _SCOPE.set({})
+    try:
+        yield
+    finally:
+        _SCOPE.reset(token)
+
+
+def project(profile):
+    scope = _SCOPE.get()
+    if scope is None:
+        return ProfileProjection(profile)
+
+    # keyed by identity; the entry keeps the profile alive so ids are not reused
+    projection = scope.get(id(profile))
+    if projection is None or projection.profile is not profile:
+        projection = scope[id(profile)] = ProfileProjection(profile)
+    return projection
+
+
+# ---------- DOMAIN FIT VIEW ----------
+class DomainScoringEngine(CompiledWeights):
+    """
+    domain_weights.json as a domains x traits matrix.
+    Score = weighted mean of the profile's traits; strengths and
+    weaknesses come from threshold masks over the profile vector.
+    """
+
+    @property
+    def domains(self):
+        return self.keys
+
+    @property
+    def domain_index(self):
+        return self.key_index
+
+    def raw_scores(self, vector):
+        return self.sums(vector) / self.totals
+
+    def scores(self, vector):
+        # Python round (not np.round) so half-way cases match the dict-based scorer
+        return [round(s, 2) for s in self.raw_scores(vector).tolist()]
+
+    def raw_scores_batch(self, matrix):
+        return self.sums_batch(matrix) / self.totals
+
+    def rank_batch(self, profiles, top_k=None):
+        """
+        Scores and ranks every profile against every domain at once.
+        Returns (domain index matrix, score matrix), both profiles x top_k,
+        best first with ties kept in JSON domain order like evaluate_all.
+        """
+        scores = round_scores(self.raw_scores_batch(self.profile_matrix(profiles)))
+
+        # one stable argsort across all rows; domain counts are small, so a
+        # per-row partition would cost more than it saves
+        k = len(self.domains) if top_k is None else max(0, min(top_k, len(self.domains)))
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+        return order, np.take_along_axis(scores, order, axis=1)
+
+    def _result(self, i, score, strong, weak):
+        cols = self.row_cols[i]
+        strengths = [self.traits[c] for c in cols if strong[c]]
+        weaknesses = [self.traits[c] for c in cols if weak[c]]
+        count = self.trait_counts[i]
+
+        return {
+            "domain": self.domains[i],
+            "score": score,
+            "verdict": verdict_for(score),
+            "confidence": round((len(strengths) / count) * 100, 2) if count else 0,
+            "strengths": strengths,
+            "weaknesses": weaknesses
+        }
+
+    def _masks(self, projection):
+        vector = projection.vector(self.traits)
+        return projection.memo(
+            (id(self), "masks"),
+            lambda: ((vector >= STRENGTH_THRESHOLD).tolist(), (vector <= WEAKNESS_THRESHOLD).tolist())
+        )
+
+    def evaluate(self, domain, profile):
+        domain = domain.lower()
+        i = self.domain_index.get(domain)
+
+        if i is None or not self.trait_counts[i]:
+            return {"error": f"{domain} not found"}
+
+        projection = project(profile)
+        scores = projection.memo((id(self), "scores"), lambda: self.scores(projection.vector(self.traits)))
+        strong, weak = self._masks(projection)
+
+        return self._result(i, scores[i], strong, weak)
+
+    def total_weights(self):
+        """Weight total per domain as a plain list, shared by every RunningScores."""
+        totals = self.__dict__.get("_total_weights")
+        if totals is None:
+            totals = self._total_weights = self.totals.tolist()
+        return totals
+
+    def trait_columns(self):
+        """Per trait: [(domain index, weight)] for the domains that use it."""
+        columns = self.__dict__.get("_trait_columns")
+        if columns is None:
+            columns = self._trait_columns = [
+                [(i, w) for i, w in enumerate(self.matrix[:, j].tolist()) if w]
+                for j in range(len(self.traits))
+            ]
+        return columns
+
+    def evaluate_all(self, profile, top_k=None):
+        """All domains (or the best top_k), best first; ties keep the JSON order."""
+        projection = project(profile)
+        scores = projection.memo((id(self), "scores"), lambda: self.scores(projection.vector(self.traits)))
+        strong, weak = self._masks(projection)
+
+        order = top_k_indices(np.array(scores), top_k).tolist()
+
+        return [
+            self._result(i, scores[i], strong, weak) if self.trait_counts[i]
+            else {"error": f"{self.domains[i]} not found"}
+            for i in order
+        ]
+
+
+def get_scoring_engine():
+    """Compiled domain-fit engine for the current domain weights."""
+    return get_compiled("domain_weights")
+
+
+# ---------- RUNNING SCORES ----------
+class RunningScores:
+    """
+    Per-session domain scores kept up to date one trait at a time.
+
+    Changing one trait is a rank-1 update: the change times that trait's
+    column of the weight matrix, so an answer costs O(domains) instead of
+    re-scoring every domain from the whole profile.
+
+    Kept per session, so the state is one array('d'): the trait values,
+    then the raw weighted sum per domain. Weight totals are the engine's
+    shared list.
+    """
+
+    __slots__ = ("engine", "state", "updates")
+
+    # re-sum from scratch now and then so float drift never accumulates
+    REFRESH_EVERY = 64
+
+    def __init__(self, profile, engine=None):
+        self.engine = engine or get_scoring_engine()
+        self.reset(profile)
+
+    def reset(self, profile):
+        vector = self.engine.profile_vector(profile)
+        self.state = array("d", vector.tolist() + self.engine.sums(vector).tolist())
+        self.updates = 0
+
+    def set(self, trait, value):
+        engine = self.engine
+        j = engine.trait_index.get(trait)
+        if j is None:
+            return
+
+        state = self.state
+        delta = value - state[j]
+        if not delta:
+            return
+
+        state[j] = value
+        offset = len(engine.traits)
+        for i, weight in engine.trait_columns()[j]:
+            state[offset + i] += delta * weight
+
+        self.updates += 1
+        if self.updates % self.REFRESH_EVERY == 0:
+            state[offset:] = array("d", engine.sums(np.array(state[:offset])).tolist())
+
+    def _exact(self, i):
+        # the engine's pinned summation order for one domain
+        total = 0.0
+        cols = self.engine.layout_cols[i].tolist()
+        weights = self.engine.layout_weights[i].tolist()
+        state = self.state
+        for c, w in zip(cols, weights):
+            total += w * state[c]
+        return total
+
+    def scores(self):
+        scores = []
+        raw = self.state[len(self.engine.traits):]
+
+        for i, (r, t) in enumerate(zip(raw, self.engine.total_weights())):
+            value = r / t
+            # drift only matters next to a rounding boundary; re-sum those exactly
+            scaled = value * 100
+            if abs(scaled - math.floor(scaled) - 0.5) < 1e-6:
+                value = self._exact(i) / t
+            scores.append(round(value, 2))
+
+        return scores
+
+    def top_two(self):
+        """[(domain, score)] for the best two domains; ties keep the JSON order."""
+        scores = self.scores()
+        domains = self.engine.domains
+
+        first = second = None
+        for i, score in enumerate(scores):
+            if first is None or score > scores[first]:
+                first, second = i, first
+            elif second is None or score > scores[second]:
+                second = i
+
+        return [(domains[i], scores[i]) for i in (first, second) if i is not None]
+
+
+# ---------- DOMAIN VECTOR VIEW ----------
+def domain_vector_scores(profile):
+    """
+    (domain, score) per domain_vectors.json row: weighted mean over the
+    traits the profile actually contains, rounded to 3 places.
+    """
+    compiled = get_compiled("domain_vectors")
+    projection = project(profile)
+
+    def compute():
+        sums, totals = compiled.present_sums(
+            projection.vector(compiled.traits),
+            projection.present(compiled.traits)
+        )
+        return [
+            (key, round(s / t, 3) if t else 0)
+            for key, s, t in zip(compiled.keys, sums.tolist(), totals.tolist())
+        ]
+
+    return projection.memo((id(compiled), "scores"), compute)
+
+
+# ---------- BATCH BENCHMARK ----------
+def benchmark_batch(n_profiles=10000, seed=7):
+    """Profiles per second: batch ranking vs the per-profile evaluate_all loop."""
+    import time
+
+    engine = get_scoring_engine()
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(0, 11, size=(n_profiles, len(TRAITS))).astype(float)
+    profiles = [dict(zip(TRAITS, row)) for row in matrix.tolist()]
+
+    start = time.perf_counter()
+    for profile in profiles:
+        engine.evaluate_all(profile)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.rank_batch(profiles)
+    batch_dicts_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.rank_batch(matrix)
+    batch_array_s = time.perf_counter() - start
+
+    return {
+        "profiles": n_profiles,
+        "loop_per_sec": round(n_profiles / loop_s),
+        "batch_dicts_per_sec": round(n_profiles / batch_dicts_s),
+        "batch_array_per_sec": round(n_profiles / batch_array_s)
+    }
+
+
+def benchmark_running(answers=20000, seed=7):
+    """Microseconds per answer: rank-1 RunningScores update vs full re-scoring."""
+    import random
+    import time
+
+    engine = get_scoring_engine()
+    rng = random.Random(seed)
+    stream = [(rng.choice(TRAITS), rng.randint(0, 10)) for _ in range(answers)]
+
+    profile = {}
+    start = time.perf_counter()
+    for trait, value in stream:
+        profile = dict(profile, **{trait: value})
+        engine.evaluate_all(profile, top_k=2)
+    full_s = time.perf_counter() - start
+
+    running = RunningScores({}, engine)
+    start = time.perf_counter()
+    for trait, value in stream:
+        running.set(trait, value)
+        running.top_two()
+    running_s = time.perf_counter() - start
+
+    return {
+        "answers": answers,
+        "full_us": round(full_s / answers * 1e6, 2),
+        "running_us": round(running_s / answers * 1e6, 2)
+    }
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        result = benchmark_running()
+        print(
+            f"per answer | full re-score {result['full_us']} us"
+            f" | rank-1 update {result['running_us']} us"
+        )
+
+        for n in (1000, 10000, 50000):
+            result = benchmark_batch(n)
+            print(
+                f"{n:>6} profiles | loop {result['loop_per_sec']:>9,}/s"
+                f" | batch (dicts) {result['batch_dicts_per_sec']:>10,}/s"
+                f" | batch (array) {result['batch_array_per_sec']:>11,}/s"
+            )
@@ -0,0 +1,336 @@
+"""
+Small dependency-graph runner for request fan-out.
+
+Each task names the tasks whose results it needs; independent tasks run
+concurrently on a shared thread pool, so latency follows the critical path
+instead of the sum of all tasks. Every task runs in a copy of the caller's
+context, so pinned data snapshots and scoring scopes carry over.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+MAX_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Process-wide pool shared by all graph runs."""
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="task-graph")
+
+    return _executor
+
+
+class Task:
+    """
+    fn(**deps) - receives the results of the tasks listed in deps.
+    budget caps, in seconds from when a worker starts the task, how long
+    the caller waits for it; time queued behind other runs does not count,
+    but a task may wait in the queue no longer than its budget either.
+    """
+
+    __slots__ = ("name", "fn", "deps", "budget")
+
+    def __init__(self, name, fn, deps=(), budget=None):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.budget = budget
+
+
+class GraphRun:
+    """Outcome of run_graph: results, per-task status and wall time."""
+
+    __slots__ = ("results", "status", "timings_ms", "total_ms", "critical_path_ms")
+
+    def __init__(self):
+        self.results = {}
+        self.status = {}
+        self.timings_ms = {}
+        self.total_ms = 0.0
+        self.critical_path_ms = 0.0
+
+    def summary(self):
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "critical_path_ms": round(self.critical_path_ms, 2),
+            "sections": {
+                name: {"status": self.status[name], "ms": self.timings_ms.get(name)}
+                for name in self.status
+            }
+        }
+
+
+def _timed(fn, kwargs):
+    start = time.perf_counter()
+    result = fn(**kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _validate(tasks):
+    names = {t.name for t in tasks}
+    if len(names) != len(tasks):
+        raise ValueError("task names must be unique")
+
+    for task in tasks:
+        missing = [d for d in task.deps if d not in names]
+        if missing:
+            raise ValueError(f"task {task.name!r} depends on unknown tasks {missing}")
+
+    # Kahn's algorithm, only to reject cycles up front
+    indegree = {t.name: len(t.deps) for t in tasks}
+    dependents = {t.name: [] for t in tasks}
+    for task in tasks:
+        for dep in task.deps:
+            dependents[dep].append(task.name)
+
+    ready = [name for name, d in indegree.items() if d == 0]
+    seen = 0
+    while ready:
+        name = ready.pop()
+        seen += 1
+        for child in dependents[name]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+
+    if seen != len(tasks):
+        raise ValueError("task graph has a cycle")
+
+    return dependents
+
+
+class _Scheduler:
+    """
+    Callback-driven scheduling: a finished task submits its ready
+    dependents from the worker thread, so a run can keep going after
+    run_graph has returned (on_late mode).
+    """
+
+    def __init__(self, tasks, dependents, executor, on_late, on_done=None):
+        self.by_name = {t.name: t for t in tasks}
+        self.dependents = dependents
+        self.executor = executor
+        self.on_late = on_late
+        self.on_done = on_done
+        self.context = contextvars.copy_context()
+
+        self.cond = threading.Condition()
+        self.waiting = {t.name: set(t.deps) for t in tasks}
+        self.running = {}
+        self.submitted = {}
+        self.started = {}
+        self.results = {}
+        self.timings_ms = {}
+        self.finished_at = {}
+        self.error = None
+        self.returned = False
+
+    def start(self):
+        with self.cond:
+            for name in [n for n, deps in self.waiting.items() if not deps]:
+                self._submit(name)
+
+    def _submit(self, name):
+        # called with the lock held
+        del self.waiting[name]
+        task = self.by_name[name]
+        kwargs = {dep: self.results[dep] for dep in task.deps}
+
+        self.submitted[name] = time.perf_counter()
+        future = self.executor.submit(self._run, name, task.fn, kwargs)
+        self.running[name] = future
+        future.add_done_callback(lambda f, name=name: self._done(name, f))
+
+    def _run(self, name, fn, kwargs):
+        # the task's budget starts here, not when it was queued
+        with self.cond:
+            self.started[name] = time.perf_counter()
+            self.cond.notify_all()
+        return self.context.copy().run(_timed, fn, kwargs)
+
+    def _done(self, name, future):
+        late = []
+        done = None
+
+        with self.cond:
+            self.running.pop(name, None)
+
+            if future.cancelled():
+                return
+
+            error = future.exception()
+
+            if error is not None:
+                if not self.returned:
+                    self.error = self.error or error
+                elif self.on_late:
+                    late = [(n, None, error) for n in self._descendants(name)]
+                    late.insert(0, (name, None, error))
+                self.cond.notify_all()
+            else:
+                result, ms = future.result()
+                self.results[name] = result
+                self.timings_ms[name] = round(ms, 2)
+
+                task = self.by_name[name]
+                self.finished_at[name] = ms + max((self.finished_at[d] for d in task.deps), default=0.0)
+
+                if self.returned:
+                    if self.on_late is None:
+                        return
+                    late.append((name, result, None))
+                elif self.on_done is not None:
+                    done = (name, result)
+
+                if self.error is None:
+                    for child in self.dependents[name]:
+                        deps = self.waiting.get(child)
+                        if deps is None:
+                            continue
+                        deps.discard(name)
+                        if not deps:
+                            self._submit(child)
+
+                self.cond.notify_all()
+
+        if done is not None:
+            self.on_done(*done)
+
+        for args in late:
+            self.on_late(*args)
+
+    def _descendants(self, name):
+        found = []
+        stack = list(self.dependents[name])
+        while stack:
+            child = stack.pop()
+            if child in self.waiting and child not in found:
+                del self.waiting[child]
+                found.append(child)
+                stack.extend(self.dependents[child])
+        return found
+
+    def _expiry(self, name, budgets):
+        """
+        When the caller stops waiting for a submitted task: its budget from
+        the start of its run, or from submission while it is still queued.
+        """
+        budget = budgets[name]
+        if budget is None:
+            return float("inf")
+        return self.started.get(name, self.submitted[name]) + budget
+
+    def _live(self, name, budgets, now, memo):
+        """
+        Whether the caller should still wait for a task: running or queued
+        within its budget, or waiting only on live dependencies.
+        """
+        if name not in memo:
+            memo[name] = True
+            if name in self.submitted:
+                memo[name] = now < self._expiry(name, budgets)
+            elif name in self.waiting:
+                memo[name] = all(
+                    self._live(dep, budgets, now, memo)
+                    for dep in self.waiting[name]
+                )
+        return memo[name]
+
+    def wait(self, budgets, expiry):
+        """
+        Blocks until every task is done or past its budget, or until
+        expiry (the run's deadline) passes.
+        """
+        with self.cond:
+            while self.error is None:
+                outstanding = [n for n in self.by_name if n not in self.results]
+                if not outstanding:
+                    break
+
+                now = time.perf_counter()
+                if now >= expiry:
+                    break
+
+                memo = {}
+                if not any(self._live(n, budgets, now, memo) for n in outstanding):
+                    break
+
+                wake = [self._expiry(n, budgets) for n in outstanding if n in self.submitted]
+                soonest = min([expiry] + [t for t in wake if t > now])
+                self.cond.wait(None if soonest == float("inf") else soonest - now)
+
+            self.returned = True
+
+            if self.error is not None or self.on_late is None:
+                # nobody will read these results; free the workers they would hold
+                for future in list(self.running.values()):
+                    future.cancel()
+
+            if self.error is not None:
+                raise self.error
+
+            running = {n for n in self.running if n in self.started}
+            return dict(self.results), dict(self.timings_ms), dict(self.finished_at), running
+
+
+def run_graph(tasks, deadline=None, executor=None, on_late=None, on_done=None):
+    """
+    Runs tasks as soon as their dependencies finish.
+
+    Each task's budget counts from when a worker starts it, so waiting
+    behind other runs on the shared pool does not use it up; a task still
+    queued after its budget (from submission) is given up on. deadline
+    (seconds from the call) caps the whole call, queue waits included. The
+    call returns once every task is done or past its budget, or at the
+    deadline, and the first task error is re-raised.
+
+    Without on_late, tasks past their budget are marked "timeout" if they
+    were running (their threads finish in the background) or "skipped" if
+    they never started; queued tasks are cancelled so they do not hold
+    workers for a caller that has gone. With on_late(name, result, error),
+    late tasks are marked "pending" and keep running - dependents included -
+    and each one is handed to on_late when it finishes.
+
+    on_done(name, result), if given, is called from the worker thread as
+    each task finishes within its budget - for streaming partial results.
+    """
+    tasks = list(tasks)
+    dependents = _validate(tasks)
+
+    start = time.perf_counter()
+    budgets = {task.name: task.budget for task in tasks}
+    expiry = float("inf") if deadline is None else start + deadline
+
+    scheduler = _Scheduler(tasks, dependents, executor or get_executor(), on_late, on_done)
+    scheduler.start()
+    results, timings_ms, finished_at, running = scheduler.wait(budgets, expiry)
+
+    run = GraphRun()
+    run.results = results
+    run.timings_ms = timings_ms
+
+    for task in tasks:
+        if task.name in results:
+            run.status[task.name] = "done"
+        elif on_late is not None:
+            run.status[task.name] = "pending"
+        elif task.name in running:
+            run.status[task.name] = "timeout"
+        else:
+            run.status[task.name] = "skipped"
+
+    run.total_ms = (time.perf_counter() - start) * 1000
+    run.critical_path_ms = max(finished_at.values(), default=0.0)
+
+    return run
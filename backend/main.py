@@ -1,10 +1,39 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from routes.assessment import router as assessment_router
+from routes.data import router as data_router
+from routes.market import router as market_router
+from routes.report import router as report_router
+from routes.session import router as session_router
+from services.data_loader import DataWatcher, warm_registry
+from services.market_ingest import INGEST_ENABLED, MarketIngestor
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # load all data files once so requests never touch the disk
+    warm_registry()
+
+    # pick up edits to backend/data without restarting workers
+    watcher = DataWatcher().start()
+
+    # keep the local market store filled so requests never call Adzuna
+    ingestor = MarketIngestor().start() if INGEST_ENABLED else None
+    yield
+    watcher.stop()
+    if ingestor is not None:
+        ingestor.stop()
+
 
-app = FastAPI(title="PathForge AI")
+app = FastAPI(title="PathForge AI", lifespan=lifespan)
 
 # register routes
 app.include_router(assessment_router)
+app.include_router(data_router)
+app.include_router(market_router)
+app.include_router(report_router)
+app.include_router(session_router)
 
 @app.get("/")
 def home():
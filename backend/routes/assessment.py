@@ -1,5 +1,6 @@
-from fastapi import APIRouter
-from agents.assessment_agent import evaluate_domain_fit
+import numpy as np
+from fastapi import APIRouter, HTTPException
+from agents.assessment_agent import evaluate_domain_fit, evaluate_domain_fit_batch
 
 router = APIRouter(prefix="/assessment", tags=["Assessment"])
 
@@ -7,3 +8,41 @@ router = APIRouter(prefix="/assessment", tags=["Assessment"])
 @router.post("/evaluate/{domain}")
 def evaluate(domain: str, data: dict):
     return evaluate_domain_fit(domain, data["profile"])
+
+
+@router.post("/evaluate-batch")
+def evaluate_batch(data: dict):
+    """
+    Ranks domains for a whole cohort.
+    profiles: list of profile objects, or list of trait rows in TRAITS order.
+    """
+    profiles = data.get("profiles")
+
+    if not isinstance(profiles, list):
+        raise HTTPException(status_code=422, detail="profiles must be a list")
+
+    top_k = data.get("top_k", 3)
+
+    if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1):
+        raise HTTPException(status_code=422, detail="top_k must be a positive integer or null")
+
+    if profiles and all(isinstance(p, list) for p in profiles):
+        if len({len(p) for p in profiles}) != 1:
+            raise HTTPException(status_code=422, detail="trait rows must all have the same length")
+        try:
+            profiles = np.array(profiles, dtype=float)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=422, detail="trait rows must contain only numbers")
+    elif not all(isinstance(p, dict) for p in profiles):
+        raise HTTPException(status_code=422, detail="profiles must all be objects or all be trait rows")
+
+    # null or infinite trait scores (rows or objects) are rejected by the engine
+    try:
+        results = evaluate_domain_fit_batch(profiles, top_k)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return {
+        "count": len(results),
+        "results": results
+    }
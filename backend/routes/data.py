@@ -0,0 +1,27 @@
+import os
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException
+from services.data_loader import registry_stats, reload_registry
+
+router = APIRouter(prefix="/data", tags=["Data"])
+
+# POST /data/reload requires this in X-Admin-Token; unset disables the
+# endpoint (DataWatcher still picks up edits on its own)
+ADMIN_TOKEN = os.environ.get("PATHFORGE_ADMIN_TOKEN")
+
+
+@router.get("/status")
+def status():
+    return registry_stats()
+
+
+@router.post("/reload")
+def reload(x_admin_token: str = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="reload is disabled; set PATHFORGE_ADMIN_TOKEN")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="invalid admin token")
+
+    changed = reload_registry()
+    return {"changed": changed, **registry_stats()}
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from services.market_service import MARKET_CACHE
+from services.upstream_guard import upstream_metrics
+
+router = APIRouter(prefix="/market", tags=["Market"])
+
+
+@router.get("/status")
+def status():
+    """Circuit breaker and rate limiter state per upstream, plus cache stats."""
+    return {"upstreams": upstream_metrics(), "cache": MARKET_CACHE.stats()}
@@ -0,0 +1,56 @@
+import math
+
+from fastapi import APIRouter, HTTPException
+from agents.master_orchestrator import REPORT_SECTIONS, SECTION_BUDGETS_S, build_full_report, evaluate_all_domains
+from services.report_cache import REPORT_CACHE
+from services.report_store import REPORT_STORE
+
+router = APIRouter(prefix="/report", tags=["Report"])
+
+
+@router.post("")
+def report(data: dict):
+    """
+    Full report for a profile, delivered within the section budgets.
+    Slow sections come back as {"status": "pending", "token": ...}.
+    """
+    profile = data.get("profile")
+
+    if not isinstance(profile, dict):
+        raise HTTPException(status_code=422, detail="profile must be an object")
+
+    budgets = data.get("budgets", {})
+
+    if not isinstance(budgets, dict):
+        raise HTTPException(status_code=422, detail="budgets must be an object of section: seconds")
+
+    unknown = sorted(set(budgets) - set(REPORT_SECTIONS))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"unknown report sections {unknown}; sections are {REPORT_SECTIONS}")
+
+    for name, seconds in budgets.items():
+        # null means no budget of its own: the section may take up to the report deadline
+        if seconds is None:
+            continue
+        if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or not math.isfinite(seconds) or seconds < 0:
+            raise HTTPException(status_code=422, detail=f"budget for {name!r} must be a non-negative number of seconds or null")
+
+    budgets = {**SECTION_BUDGETS_S, **budgets}
+    results = evaluate_all_domains(profile, top_k=5)
+
+    return build_full_report(results[0], results, profile, budgets=budgets)
+
+
+@router.get("/sections/{token}")
+def section(token: str):
+    entry = REPORT_STORE.get(token)
+
+    if entry is None:
+        raise HTTPException(status_code=404, detail="unknown or expired token")
+
+    return entry
+
+
+@router.get("/cache")
+def cache_stats():
+    return REPORT_CACHE.stats()
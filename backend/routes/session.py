@@ -0,0 +1,89 @@
+import json
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from agents.master_orchestrator import evaluate_all_domains, stream_full_report
+from agents.session_agent import (
+    answer_session_question, next_session_question, session_result, start_session
+)
+from services.session_store import COMPLETE, SESSIONS
+
+router = APIRouter(prefix="/session", tags=["Session"])
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+def _session(session_id):
+    record = SESSIONS.get(session_id)
+
+    if record is None:
+        raise HTTPException(status_code=404, detail="unknown or expired session")
+
+    return record
+
+
+@router.post("")
+def start(data: dict = None):
+    """
+    Starts a session. Optional "profile": preferences such as
+    hours_per_week, and trait scores that count as one answer each.
+    """
+    profile = (data or {}).get("profile")
+
+    if profile is not None and not isinstance(profile, dict):
+        raise HTTPException(status_code=422, detail="profile must be an object")
+
+    try:
+        record = start_session(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return {"session_id": record.session_id, "status": record.status}
+
+
+@router.get("/{session_id}/question")
+def question(session_id: str):
+    return next_session_question(_session(session_id))
+
+
+@router.post("/{session_id}/answer")
+def answer(session_id: str, data: dict):
+    try:
+        return answer_session_question(_session(session_id), data.get("score"))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get("/{session_id}/result")
+def result(session_id: str):
+    report = session_result(_session(session_id))
+
+    if report is None:
+        raise HTTPException(status_code=409, detail="assessment not complete; keep answering questions")
+
+    return report
+
+
+@router.get("/{session_id}/report/stream")
+def report_stream(session_id: str):
+    """
+    Server-sent events: one event per report section as soon as it is ready,
+    then "done" (or "error"). Like /result, only for a completed session.
+    """
+    record = _session(session_id)
+
+    if record.status != COMPLETE:
+        raise HTTPException(status_code=409, detail="assessment not complete; keep answering questions")
+
+    profile = record.profile()
+    results = evaluate_all_domains(profile, top_k=5)
+
+    events = (_sse(event, payload) for event, payload in stream_full_report(results[0], results, profile))
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
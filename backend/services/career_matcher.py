@@ -1,34 +1,16 @@
-import json
-import os
-
-def load_careers():
-
-    path = os.path.join(
-        os.path.dirname(__file__),
-        "..",
-        "data",
-        "careers.json"
-    )
-
-    with open(path) as f:
-        return json.load(f)
+from core.career_index import get_career_index
 
 
 def match_careers(profile):
 
-    careers = load_careers()
-    results = []
+    # top 10 career trait sums from the career vector index
+    best = get_career_index().query(profile, 10)
 
-    for career in careers:
-
-        score = 0
-        for trait in career["traits"]:
-            score += profile.get(trait,0)
-
-        results.append({
+    return [
+        {
             "career": career["career"],
             "domain": career["domain"],
-            "score": round(score,2)
-        })
-
-    return sorted(results,key=lambda x:x["score"],reverse=True)[:10]
\ No newline at end of file
+            "score": score
+        }
+        for career, score in best
+    ]
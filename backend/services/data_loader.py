@@ -1,18 +1,347 @@
+import contextvars
 import json
 import os
+import threading
+import time
+from contextlib import contextmanager
 
 
 BASE_PATH = os.path.dirname(os.path.dirname(__file__))
+DATA_PATH = os.path.join(BASE_PATH, "data")
 
+_MISSING = object()
 
-def _load_json(filename):
-    path = os.path.join(BASE_PATH, "data", filename)
 
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"{filename} not found in data folder")
+# ---------- READ-ONLY VIEWS ----------
+class FrozenDict(dict):
+    """
+    Read-only dict used for shared registry data.
+    Still a real dict, so it serializes to JSON like the original file.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("registry data is read-only - copy it before modifying")
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+    __ior__ = _readonly
+
+    def __hash__(self):
+        return hash(tuple(sorted(self.items())))
+
+    def __reduce__(self):
+        # default dict pickling replays __setitem__, which is blocked
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def copy(self):
+        return dict(self)
+
+
+def freeze(obj):
+    """Recursively converts parsed JSON into FrozenDict / tuple views."""
+    if isinstance(obj, dict):
+        return FrozenDict((k, freeze(v)) for k, v in obj.items())
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj):
+    """Returns a mutable deep copy of a frozen registry value."""
+    if isinstance(obj, dict):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+# ---------- PRECOMPUTED INDEXES ----------
+def build_indexes(files):
+    """
+    Lookup tables derived from the raw files.
+    Built once per snapshot (or at snapshot compile time) instead of per request.
+    """
+    weights = files.get("domain_weights.json")
+    careers = files.get("careers.json")
+
+    domains = tuple(weights) if isinstance(weights, dict) else ()
+
+    careers_by_domain = {}
+    if isinstance(careers, tuple):
+        for career in careers:
+            if isinstance(career, dict) and "domain" in career:
+                careers_by_domain.setdefault(career["domain"], []).append(career)
+
+    return FrozenDict({
+        "domains": domains,
+        "careers_by_domain": freeze(careers_by_domain)
+    })
+
+
+# ---------- DATA SNAPSHOT ----------
+class DataSnapshot:
+    """
+    Immutable set of parsed data files plus the mtimes they were read at.
+    A reload builds a new snapshot; existing ones are never changed.
+    """
+
+    __slots__ = ("version", "files", "mtimes", "indexes")
+
+    def __init__(self, version, files, mtimes, indexes=None):
+        self.version = version
+        self.files = files
+        self.mtimes = mtimes
+        self.indexes = indexes if indexes is not None else build_indexes(files)
+
+    def index(self, name):
+        return self.indexes[name]
+
+    def get(self, filename, default=_MISSING):
+        value = self.files.get(filename, _MISSING)
+
+        if value is _MISSING:
+            if default is _MISSING:
+                raise FileNotFoundError(f"{filename} not found in data folder")
+            return freeze(default)
+
+        if isinstance(value, Exception):
+            raise value
+
+        return value
+
+
+# ---------- DATA REGISTRY ----------
+class DataRegistry:
+    """
+    Loads every JSON file in the data folder once per process.
+    Agents read frozen views instead of re-opening files per call.
+    reload() re-parses only files whose mtime changed and swaps in a new snapshot.
+    """
+
+    def __init__(self, data_path=DATA_PATH):
+        self.data_path = data_path
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self.reload_count = 0
+        self.last_reload_latency_ms = None
+        self.last_reloaded_files = ()
+        # filename -> mtime of a broken version already reported
+        self._broken = {}
+
+    def _scan(self):
+        mtimes = {}
+
+        for filename in sorted(os.listdir(self.data_path)):
+            if filename.endswith(".json"):
+                mtimes[filename] = os.stat(os.path.join(self.data_path, filename)).st_mtime_ns
+
+        return mtimes
+
+    def _parse(self, filename):
+        path = os.path.join(self.data_path, filename)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return freeze(json.load(f))
+        except ValueError as e:
+            # keep the error so callers see it on access, like a direct load
+            return e
+
+    def _load_all(self):
+        mtimes = self._scan()
+
+        # fast path: precompiled binary snapshot, if present and not stale
+        from services.data_snapshot import read_snapshot
+        compiled = read_snapshot(self.data_path, mtimes)
+        if compiled is not None:
+            return DataSnapshot(1, compiled["files"], mtimes, compiled["indexes"])
+
+        files = {filename: self._parse(filename) for filename in mtimes}
+        return DataSnapshot(1, files, mtimes)
+
+    def warm(self):
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load_all()
+        return self
+
+    def snapshot(self):
+        return self.warm()._snapshot
+
+    def files(self):
+        return tuple(self.snapshot().files)
+
+    def get(self, filename, default=_MISSING):
+        return self.snapshot().get(filename, default)
 
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    def reload(self):
+        """
+        Re-parses changed, new and removed files and atomically swaps the snapshot.
+        Returns the list of replaced or removed filenames (empty if nothing
+        was swapped, e.g. when the only change is a file that is still broken).
+        """
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._load_all()
+                return []
+
+            start = time.perf_counter()
+            current = self._snapshot
+            mtimes = self._scan()
+
+            changed = [
+                filename for filename, mtime in mtimes.items()
+                if current.mtimes.get(filename) != mtime
+            ]
+            removed = [filename for filename in current.files if filename not in mtimes]
+
+            if not changed and not removed:
+                return []
+
+            files = dict(current.files)
+            new_mtimes = dict(current.mtimes)
+            replaced = []
+
+            for filename in removed:
+                files.pop(filename, None)
+                new_mtimes.pop(filename, None)
+
+            for filename in changed:
+                value = self._parse(filename)
+
+                if isinstance(value, Exception) and filename in current.files:
+                    # half-written file - keep serving the last good version
+                    # and leave the old mtime so the next poll retries it
+                    if self._broken.get(filename) != mtimes[filename]:
+                        self._broken[filename] = mtimes[filename]
+                        print(f"Data reload: keeping the last good {filename}: {value}")
+                    continue
+
+                self._broken.pop(filename, None)
+                files[filename] = value
+                new_mtimes[filename] = mtimes[filename]
+                replaced.append(filename)
+
+            if not replaced and not removed:
+                # nothing was swapped; a new version would only invalidate caches
+                return []
+
+            # single reference assignment - readers see old or new, never a mix
+            self._snapshot = DataSnapshot(current.version + 1, files, new_mtimes)
+
+            self.reload_count += 1
+            self.last_reload_latency_ms = round((time.perf_counter() - start) * 1000, 3)
+            self.last_reloaded_files = tuple(replaced + removed)
+
+            return replaced + removed
+
+    def stats(self):
+        snapshot = self.snapshot()
+        return {
+            "version": snapshot.version,
+            "files": len(snapshot.files),
+            "reload_count": self.reload_count,
+            "last_reload_latency_ms": self.last_reload_latency_ms,
+            "last_reloaded_files": list(self.last_reloaded_files)
+        }
+
+
+REGISTRY = DataRegistry()
+
+# snapshot pinned for the current request (see pinned_snapshot)
+_PINNED = contextvars.ContextVar("pinned_data_snapshot", default=None)
+
+
+def current_snapshot():
+    return _PINNED.get() or REGISTRY.snapshot()
+
+
+def get_data(filename, default=_MISSING):
+    return current_snapshot().get(filename, default)
+
+
+def get_index(name):
+    return current_snapshot().index(name)
+
+
+def warm_registry():
+    return REGISTRY.warm()
+
+
+def reload_registry():
+    return REGISTRY.reload()
+
+
+def registry_stats():
+    return REGISTRY.stats()
+
+
+@contextmanager
+def pinned_snapshot(snapshot=None):
+    """
+    Pins one data snapshot for everything inside the block.
+    In-flight requests keep reading the snapshot they started with
+    even if the watcher swaps in a newer one.
+    """
+    if _PINNED.get() is not None and snapshot is None:
+        # nested call - keep the outer pin
+        yield _PINNED.get()
+        return
+
+    token = _PINNED.set(snapshot or REGISTRY.snapshot())
+    try:
+        yield _PINNED.get()
+    finally:
+        _PINNED.reset(token)
+
+
+# ---------- FILE WATCHER ----------
+class DataWatcher:
+    """
+    Polls data file mtimes on a daemon thread and reloads changed files.
+    """
+
+    def __init__(self, registry=REGISTRY, interval=2.0):
+        self.registry = registry
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.registry.reload()
+            except OSError as e:
+                print("Data reload error:", e)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+
+def _load_json(filename):
+    return get_data(filename)
 
 
 # ---------- DOMAIN WEIGHTS ----------
@@ -0,0 +1,137 @@
+"""
+Precompiled binary snapshot of the backend/data folder.
+
+Build step (run after editing any data file, e.g. in the deploy script):
+
+    cd backend
+    python -m services.data_snapshot            # compile data/data.snapshot
+    python -m services.data_snapshot --bench    # compare cold-start times
+
+Workers load the snapshot with one read. If it is missing, from another
+format version, or older than any JSON file, the registry falls back to JSON.
+The snapshot is a trusted build artifact (pickle) - never load one from
+an untrusted location.
+"""
+
+import os
+import pickle
+import sys
+import time
+
+from services.data_loader import DATA_PATH, DataRegistry, build_indexes
+
+
+SNAPSHOT_FILE = "data.snapshot"
+SNAPSHOT_MAGIC = b"PFSNAP"
+FORMAT_VERSION = 1
+
+_HEADER = SNAPSHOT_MAGIC + bytes([FORMAT_VERSION])
+
+
+def snapshot_path(data_path=DATA_PATH):
+    return os.path.join(data_path, SNAPSHOT_FILE)
+
+
+# ---------- BUILD ----------
+def compile_snapshot(data_path=DATA_PATH):
+    """
+    Parses every JSON file once and writes the frozen data, source mtimes
+    and precomputed indexes into a single versioned file.
+    """
+    registry = DataRegistry(data_path)
+    mtimes = registry._scan()
+
+    files = {}
+    for filename in mtimes:
+        value = registry._parse(filename)
+        if isinstance(value, Exception):
+            raise ValueError(f"cannot compile {filename}: {value}")
+        files[filename] = value
+
+    payload = {
+        "mtimes": mtimes,
+        "files": files,
+        "indexes": build_indexes(files)
+    }
+
+    path = snapshot_path(data_path)
+    tmp_path = path + ".tmp"
+
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER)
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # atomic replace so a running worker never reads a half-written snapshot
+    os.replace(tmp_path, path)
+
+    return path
+
+
+# ---------- LOAD ----------
+def read_snapshot(data_path=DATA_PATH, mtimes=None):
+    """
+    Returns {"files", "indexes"} from the compiled snapshot,
+    or None if it is missing, from another format version or stale.
+    """
+    path = snapshot_path(data_path)
+
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return None
+
+    if not raw.startswith(_HEADER):
+        return None
+
+    try:
+        payload = pickle.loads(raw[len(_HEADER):])
+    except Exception:
+        return None
+
+    # stale if any JSON file was added, removed or touched after the build
+    if mtimes is not None and payload.get("mtimes") != mtimes:
+        return None
+
+    return payload
+
+
+# ---------- COLD START BENCHMARK ----------
+def benchmark_cold_start(data_path=DATA_PATH, rounds=50):
+    """Average time for a fresh registry to load, JSON vs compiled snapshot."""
+
+    def _time_load():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            DataRegistry(data_path).warm()
+        return (time.perf_counter() - start) / rounds * 1000
+
+    path = snapshot_path(data_path)
+    had_snapshot = os.path.exists(path)
+    if had_snapshot:
+        os.replace(path, path + ".bak")
+
+    try:
+        json_ms = _time_load()
+    finally:
+        if had_snapshot:
+            os.replace(path + ".bak", path)
+
+    compile_snapshot(data_path)
+    snapshot_ms = _time_load()
+
+    return {
+        "json_ms": round(json_ms, 3),
+        "snapshot_ms": round(snapshot_ms, 3),
+        "speedup": round(json_ms / snapshot_ms, 2) if snapshot_ms else None
+    }
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        result = benchmark_cold_start()
+        print(f"JSON cold start:     {result['json_ms']} ms")
+        print(f"Snapshot cold start: {result['snapshot_ms']} ms")
+        print(f"Speedup:             {result['speedup']}x")
+    else:
+        print("Snapshot written to", compile_snapshot())
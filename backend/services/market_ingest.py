@@ -0,0 +1,117 @@
+"""
+Scheduled market ingestion.
+
+MarketIngestor pulls Adzuna listings for every domain and role on a daemon
+thread every INGEST_INTERVAL_S and appends them to the market store, so
+requests read local data and never wait on the API.
+
+Ingestion is off unless PATHFORGE_MARKET_INGEST=1. Every process that has
+it on calls Adzuna on its own schedule, so enable it in one worker only
+(or run the module from cron and leave it off in the app).
+
+Run once by hand: python -m services.market_ingest
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from services.data_loader import get_data, load_domains
+from services.market_service import get_job_listings
+from services.market_store import get_market_store
+
+
+INGEST_ENABLED = os.environ.get("PATHFORGE_MARKET_INGEST", "0") == "1"
+INGEST_INTERVAL_S = 6 * 3600
+INGEST_LOCATION = "us"
+# a full run is up to 2 pages x 19 roles = 38 requests, more than the
+# 25-call burst; requests wait for tokens instead of being dropped, so the
+# rest of the run is paced at the refill rate (about 30 s more)
+INGEST_MAX_PAGES = 2
+INGEST_TOKEN_WAIT_S = 120
+
+
+def fetch_listings(domain, location, max_pages):
+    """Default fetch for ingestion: Adzuna listings, paced by the rate limit."""
+    return get_job_listings(domain, location, max_pages=max_pages, wait_s=INGEST_TOKEN_WAIT_S)
+
+
+def ingest_domains():
+    """Domains of the assessment plus those with curated market data."""
+    domains = list(load_domains())
+    for domain in get_data("market_data.json", {}).get("job_data", {}):
+        if domain not in domains:
+            domains.append(domain)
+    return domains
+
+
+def run_ingestion(domains=None, store=None, fetch=None, day=None):
+    """
+    One ingestion pass. fetch(domain, location, max_pages) returns raw
+    listings (fetch_listings by default). Returns per-domain counts and
+    how many listings fell out of retention.
+    """
+    store = store or get_market_store(create=True)
+    fetch = fetch or fetch_listings
+    summary = {}
+
+    for domain in domains or ingest_domains():
+        start = time.perf_counter()
+        listings = fetch(domain, INGEST_LOCATION, max_pages=INGEST_MAX_PAGES)
+        added = store.append(domain, listings, day)
+
+        summary[domain] = {
+            "fetched": len(listings),
+            "added": added,
+            "ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+
+    return {"domains": summary, "pruned": store.prune()}
+
+
+class MarketIngestor:
+    """Runs run_ingestion now and then every interval on a daemon thread."""
+
+    def __init__(self, interval=INGEST_INTERVAL_S, **options):
+        self.interval = interval
+        self.options = options
+        self.last_run = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                self.last_run = run_ingestion(**self.options)
+            except Exception as e:
+                print("Market ingestion error:", e)
+
+            if self._stop.wait(self.interval):
+                break
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="market-ingest", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+if __name__ == "__main__":
+    result = run_ingestion()
+    for domain, counts in result["domains"].items():
+        print(f"{domain:>18}: {counts}")
+    print(f"pruned {result['pruned']} listings past retention")
@@ -1,6 +1,30 @@
-import requests
-import httpx
+"""
+Live job-market data from the Adzuna search API.
+
+All requests go through shared pooled clients (keep-alive, HTTP/2 when the
+h2 package is installed). A domain's role queries are sent concurrently, and
+so are result pages after the first, so a lookup costs roughly one or two
+round-trips instead of one per role and page.
+
+get_cached_market_data puts a stale-while-revalidate cache in front of it,
+keyed by (domain, location) and persisted to data/market_cache.json.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+from services.market_trends import MarketTrends
+from services.upstream_guard import register_upstream
 
 
 # ==============================
@@ -9,6 +33,28 @@ from datetime import datetime
 
 ADZUNA_APP_ID = "960f8b21"
 ADZUNA_APP_KEY = "8fb4058a6c35aa1cb7ba18ee322e9f39"
+ADZUNA_BASE_URL = "https://api.adzuna.com/v1/api/jobs"
+
+RESULTS_PER_PAGE = 20
+# pages fetched per role; 1 keeps a lookup to a single round of requests
+MAX_PAGES = 1
+MAX_CONCURRENCY = 8
+REQUEST_TIMEOUT_S = 10
+KEEPALIVE_EXPIRY_S = 30
+
+# Adzuna's default quota is 25 calls a minute; the bucket allows that
+# as a burst and refills at the same average rate
+ADZUNA_RATE_PER_S = 25 / 60
+ADZUNA_BURST = 25
+ADZUNA_GUARD = register_upstream("adzuna", ADZUNA_RATE_PER_S, ADZUNA_BURST)
+
+# market data cache: fresh for MARKET_TTL_S, then served stale (and
+# refreshed in the background) until MARKET_MAX_STALE_S
+MARKET_TTL_S = 15 * 60
+MARKET_MAX_STALE_S = 24 * 3600
+MARKET_FAILURE_TTL_S = 60
+REFRESH_WORKERS = 4
+MARKET_CACHE_PATH = Path(__file__).parent.parent / "data" / "market_cache.json"
 
 
 # ==============================
@@ -41,43 +87,137 @@ def fallback_market_data(domain):
 
 
 # ==============================
-# 🔵 SYNC VERSION
+# 🔌 SHARED HTTP CLIENTS
 # ==============================
 
-def get_market_data(domain, location="us"):
-    try:
-        url = f"https://api.adzuna.com/v1/api/jobs/{location}/search/1"
-        job_roles = map_domain_to_roles(domain)
+def _http2_available():
+    return importlib.util.find_spec("h2") is not None
 
-        all_jobs = []
-        seen_titles = set()
-        salaries = []
 
-        for role in job_roles:
+def _client_options():
+    return {
+        "timeout": REQUEST_TIMEOUT_S,
+        "headers": {"User-Agent": "career-ai-agent"},
+        "limits": httpx.Limits(
+            max_connections=MAX_CONCURRENCY,
+            max_keepalive_connections=MAX_CONCURRENCY,
+            keepalive_expiry=KEEPALIVE_EXPIRY_S
+        ),
+        # one multiplexed connection when the server speaks HTTP/2
+        "http2": _http2_available()
+    }
 
-            params = {
-                "app_id": ADZUNA_APP_ID,
-                "app_key": ADZUNA_APP_KEY,
-                "what": role,
-                "results_per_page": 20
-            }
 
-            response = requests.get(
-                url,
-                params=params,
-                timeout=10,
-                headers={"User-Agent": "career-ai-agent"}
-            )
+_client = None
+_async_clients = weakref.WeakKeyDictionary()
+_pools = {}
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Process-wide pooled client; connections are kept alive between calls."""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(**_client_options())
+
+    return _client
+
+
+def get_async_client():
+    """Pooled async client for the running event loop (one per loop)."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+
+    if client is None or client.is_closed:
+        client = _async_clients[loop] = httpx.AsyncClient(**_client_options())
+
+    return client
+
+
+def _get_pool(name):
+    # pool size is the sync fan-out bound; roles and pages get separate
+    # pools so role tasks waiting on their pages can never starve them
+    pool = _pools.get(name)
+
+    if pool is None:
+        with _client_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = _pools[name] = ThreadPoolExecutor(
+                    max_workers=MAX_CONCURRENCY, thread_name_prefix=f"adzuna-{name}"
+                )
+
+    return pool
+
 
-            if response.status_code != 200:
-                continue
+def close_clients():
+    """Closes the shared sync client (async ones close with their loop)."""
+    global _client
 
-            data = response.json()
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
 
-            if "results" not in data:
-                continue
 
-            for job in data["results"]:
+# ==============================
+# 🧩 REQUEST / RESPONSE HELPERS
+# ==============================
+
+def _search_url(location, page, base_url=None):
+    return f"{base_url or ADZUNA_BASE_URL}/{location}/search/{page}"
+
+
+def _search_params(role):
+    return {
+        "app_id": ADZUNA_APP_ID,
+        "app_key": ADZUNA_APP_KEY,
+        "what": role,
+        "results_per_page": RESULTS_PER_PAGE
+    }
+
+
+def _upstream_failed(response):
+    # 5xx and 429 mean the upstream is struggling; other statuses are answers
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def _page_results(response):
+    """Decoded search page, or None if the page is unusable."""
+    if response is None or response.status_code != 200:
+        return None
+
+    data = response.json()
+
+    if "results" not in data:
+        return None
+
+    return data
+
+
+def _extra_pages(data, max_pages):
+    """Page numbers after page 1 worth fetching, from the reported total."""
+    count = data.get("count") or 0
+    last = min(max_pages, -(-count // RESULTS_PER_PAGE))
+    return range(2, last + 1)
+
+
+def _build_market_data(domain, location, role_pages):
+    """
+    role_pages holds each role's result pages, in role and page order, so
+    the output does not depend on which request finished first.
+    """
+    all_jobs = []
+    seen_titles = set()
+    salaries = []
+    trends = MarketTrends()
+
+    for pages in role_pages:
+        for results in pages:
+            for job in results:
 
                 title = job.get("title")
 
@@ -92,6 +232,13 @@ def get_market_data(domain, location="us"):
                 if salary_min and salary_max:
                     salaries.append((salary_min + salary_max) / 2)
 
+                # Adzuna dates each listing ("created"); undated ones add no trend
+                try:
+                    if job.get("created"):
+                        trends.add_listing(domain, job["created"])
+                except ValueError:
+                    pass
+
                 all_jobs.append({
                     "title": title,
                     "company": job.get("company", {}).get("display_name"),
@@ -99,103 +246,420 @@ def get_market_data(domain, location="us"):
                     "salary": salary_max,
                 })
 
-        if not all_jobs:
-            return fallback_market_data(domain)
+    if not all_jobs:
+        return fallback_market_data(domain)
+
+    avg_salary = round(sum(salaries) / len(salaries), 2) if salaries else None
+    trend = trends.trend(domain)
+
+    return {
+        "domain": domain,
+        "location": location,
+        "timestamp": datetime.now().isoformat(),
+        "job_count": len(all_jobs),
+        "average_salary": avg_salary,
+        "salary_samples": len(salaries),
+        # from the listing dates' growth moment, like the ingested and curated data
+        "trend": trend,
+        "hiring_trend": trend["label"] if trend else "unknown",
+        "jobs": all_jobs
+    }
+
+
+# ==============================
+# 🔵 SYNC VERSION
+# ==============================
+
+class _Inline:
+    """Executor stand-in that runs each call on the caller's thread."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
 
-        avg_salary = round(sum(salaries) / len(salaries), 2) if salaries else None
 
-        return {
-            "domain": domain,
-            "location": location,
-            "timestamp": datetime.now().isoformat(),
-            "job_count": len(all_jobs),
-            "average_salary": avg_salary,
-            "salary_samples": len(salaries),
-            "hiring_trend": "growing" if len(all_jobs) > 25 else "stable",
-            "jobs": all_jobs
-        }
+_INLINE = _Inline()
+
+
+def _guarded_get(client, guard, url, role, wait_s=0):
+    """Response, or None if the guard refused the call or it failed."""
+    if guard.allow(wait_s) is not None:
+        return None
+
+    recorded = False
+    try:
+        try:
+            response = client.get(url, params=_search_params(role))
+        except httpx.HTTPError as e:
+            print("Market API Error:", e)
+            guard.breaker.record_failure()
+            recorded = True
+            return None
+
+        if _upstream_failed(response):
+            guard.breaker.record_failure()
+        else:
+            guard.breaker.record_success()
+        recorded = True
+
+        return response
+    finally:
+        # any other exception must not leave a half-open probe claimed forever
+        if not recorded:
+            guard.breaker.abandon()
+
+
+def _fetch_page(client, guard, url, role, wait_s=0):
+    return _page_results(_guarded_get(client, guard, url, role, wait_s))
+
+
+def _fetch_role(client, guard, pool, role, location, max_pages, base_url, wait_s=0):
+    first = _fetch_page(client, guard, _search_url(location, 1, base_url), role, wait_s)
+    if first is None:
+        return []
+
+    futures = [
+        pool.submit(_fetch_page, client, guard, _search_url(location, page, base_url), role, wait_s)
+        for page in _extra_pages(first, max_pages)
+    ]
+
+    pages = [first["results"]]
+    for future in futures:
+        data = future.result()
+        if data is not None:
+            pages.append(data["results"])
+    return pages
+
+
+def _fetch_role_pages(domain, location, max_pages, base_url, client, guard, wait_s=0):
+    """
+    Raw result pages per role of a domain, in role order. With wait_s,
+    requests wait for rate-limit tokens and run one at a time on the
+    calling thread, so the shared pools are never blocked.
+    """
+    client = client or get_client()
+    if wait_s:
+        roles_pool = pages_pool = _INLINE
+    else:
+        roles_pool, pages_pool = _get_pool("roles"), _get_pool("pages")
+
+    futures = [
+        roles_pool.submit(_fetch_role, client, guard, pages_pool, role, location, max_pages, base_url, wait_s)
+        for role in map_domain_to_roles(domain)
+    ]
+    return [future.result() for future in futures]
+
+
+def get_market_data(domain, location="us", max_pages=MAX_PAGES, base_url=None, client=None, guard=None):
+    """
+    Jobs for every role of a domain. Roles are queried concurrently on the
+    shared client (at most MAX_CONCURRENCY requests in flight), and pages
+    2..max_pages of each role are fetched concurrently once page 1 reports
+    the total.
+
+    Every request passes the upstream guard (ADZUNA_GUARD by default):
+    failed or refused requests are skipped, and with the circuit open the
+    fallback is returned without touching the network.
+    """
+    guard = guard or ADZUNA_GUARD
+    if guard.breaker.reject_if_open():
+        return fallback_market_data(domain)
+
+    try:
+        role_pages = _fetch_role_pages(domain, location, max_pages, base_url, client, guard)
+        return _build_market_data(domain, location, role_pages)
 
     except Exception as e:
         print("Market API Error:", e)
         return fallback_market_data(domain)
 
 
-# ==============================
-# 🟢 ASYNC VERSION (FastAPI)
-# ==============================
+def get_job_listings(domain, location="us", max_pages=MAX_PAGES, base_url=None, client=None, guard=None,
+                     wait_s=0):
+    """
+    Raw Adzuna listings for every role of a domain (not deduplicated),
+    for ingestion. Empty if the upstream is unavailable. wait_s > 0 paces
+    the requests: each waits up to wait_s for a rate-limit token instead
+    of being dropped.
+    """
+    guard = guard or ADZUNA_GUARD
+    if guard.breaker.reject_if_open():
+        return []
 
-async def async_get_market_data(domain, location="us"):
     try:
-        url = f"https://api.adzuna.com/v1/api/jobs/{location}/search/1"
-        job_roles = map_domain_to_roles(domain)
+        role_pages = _fetch_role_pages(domain, location, max_pages, base_url, client, guard, wait_s)
+    except Exception as e:
+        print("Market API Error:", e)
+        return []
 
-        all_jobs = []
-        seen_titles = set()
-        salaries = []
+    return [job for pages in role_pages for results in pages for job in results]
 
-        async with httpx.AsyncClient() as client:
 
-            for role in job_roles:
+# ==============================
+# 🟢 ASYNC VERSION (FastAPI)
+# ==============================
 
-                params = {
-                    "app_id": ADZUNA_APP_ID,
-                    "app_key": ADZUNA_APP_KEY,
-                    "what": role,
-                    "results_per_page": 20
-                }
+async def _async_guarded_get(client, guard, semaphore, url, role):
+    async with semaphore:
+        if guard.allow() is not None:
+            return None
 
-                response = await client.get(url, params=params, timeout=10)
+        recorded = False
+        try:
+            try:
+                response = await client.get(url, params=_search_params(role))
+            except httpx.HTTPError as e:
+                print("Async Market API Error:", e)
+                guard.breaker.record_failure()
+                recorded = True
+                return None
 
-                if response.status_code != 200:
-                    continue
+            if _upstream_failed(response):
+                guard.breaker.record_failure()
+            else:
+                guard.breaker.record_success()
+            recorded = True
+        finally:
+            # also covers cancellation while the request is in flight
+            if not recorded:
+                guard.breaker.abandon()
 
-                data = response.json()
+    return response
 
-                if "results" not in data:
-                    continue
 
-                for job in data["results"]:
+async def _async_fetch_page(client, guard, semaphore, url, role):
+    return _page_results(await _async_guarded_get(client, guard, semaphore, url, role))
 
-                    title = job.get("title")
 
-                    if title in seen_titles:
-                        continue
-                    seen_titles.add(title)
+async def _async_fetch_role(client, guard, semaphore, role, location, max_pages, base_url):
+    first = await _async_fetch_page(client, guard, semaphore, _search_url(location, 1, base_url), role)
+    if first is None:
+        return []
 
-                    salary_min = job.get("salary_min")
-                    salary_max = job.get("salary_max")
+    rest = await asyncio.gather(*[
+        _async_fetch_page(client, guard, semaphore, _search_url(location, page, base_url), role)
+        for page in _extra_pages(first, max_pages)
+    ])
 
-                    if salary_min and salary_max:
-                        salaries.append((salary_min + salary_max) / 2)
+    return [first["results"]] + [data["results"] for data in rest if data is not None]
 
-                    all_jobs.append({
-                        "title": title,
-                        "company": job.get("company", {}).get("display_name"),
-                        "location": job.get("location", {}).get("display_name"),
-                        "salary": salary_max,
-                    })
 
-        if not all_jobs:
-            return fallback_market_data(domain)
+async def async_get_market_data(domain, location="us", max_pages=MAX_PAGES, base_url=None, client=None, guard=None):
+    """Async get_market_data: roles and extra pages are gathered under a semaphore."""
+    guard = guard or ADZUNA_GUARD
+    if guard.breaker.reject_if_open():
+        return fallback_market_data(domain)
+
+    try:
+        client = client or get_async_client()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
 
-        avg_salary = round(sum(salaries) / len(salaries), 2) if salaries else None
+        role_pages = await asyncio.gather(*[
+            _async_fetch_role(client, guard, semaphore, role, location, max_pages, base_url)
+            for role in map_domain_to_roles(domain)
+        ])
 
-        return {
-            "domain": domain,
-            "location": location,
-            "timestamp": datetime.now().isoformat(),
-            "job_count": len(all_jobs),
-            "average_salary": avg_salary,
-            "salary_samples": len(salaries),
-            "hiring_trend": "growing" if len(all_jobs) > 25 else "stable",
-            "jobs": all_jobs
-        }
+        return _build_market_data(domain, location, role_pages)
 
     except Exception as e:
         print("Async Market API Error:", e)
         return fallback_market_data(domain)
 
 
+# ==============================
+# 🗄️ MARKET DATA CACHE
+# ==============================
+
+def is_live(data):
+    """True for real API results, False for fallback_market_data."""
+    return "jobs" in data
+
+
+class MarketDataCache:
+    """
+    Stale-while-revalidate cache of market data keyed by (domain, location).
+
+    Fresh entries (younger than ttl) are served as-is. Stale ones are
+    served at once while a single background refresh runs. Entries past
+    max_stale, and misses, block on a fetch - but concurrent callers for
+    the same key share one in-flight fetch, so a burst of users costs one
+    upstream lookup.
+
+    A failed refresh keeps the last good entry. Fallback results are only
+    cached for failure_ttl and never served stale. Live entries are
+    written to a JSON file, so a restarted worker starts warm.
+    """
+
+    def __init__(self, fetch=None, path=MARKET_CACHE_PATH, ttl=MARKET_TTL_S,
+                 max_stale=MARKET_MAX_STALE_S, failure_ttl=MARKET_FAILURE_TTL_S):
+        self.fetch = fetch or get_market_data
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.failure_ttl = failure_ttl
+
+        self._entries = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="market-refresh")
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.fetches = 0
+        self.failures = 0
+
+        self._load()
+
+    @staticmethod
+    def _key(domain, location):
+        return (domain.lower(), location.lower())
+
+    # ---------- PERSISTENCE ----------
+    def _load(self):
+        if self.path is None or not self.path.exists():
+            return
+
+        try:
+            stored = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print("Market cache load error:", e)
+            return
+
+        for row in stored.get("entries", []):
+            self._entries[(row["domain"], row["location"])] = (row["data"], row["fetched_at"], self.ttl)
+
+    def _save(self):
+        if self.path is None:
+            return
+
+        with self._lock:
+            rows = [
+                {"domain": domain, "location": location, "data": data, "fetched_at": fetched_at}
+                for (domain, location), (data, fetched_at, _) in self._entries.items()
+                if is_live(data)
+            ]
+
+        # write-then-rename, so readers never see a half-written file; the temp
+        # name is unique per process and thread, as workers share the cache file
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps({"entries": rows}), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print("Market cache save error:", e)
+
+    # ---------- FETCHING ----------
+    def _run_fetch(self, key, domain, location):
+        try:
+            data = self.fetch(domain, location)
+        except Exception as e:
+            print("Market refresh error:", e)
+            data = fallback_market_data(domain)
+
+        now = time.time()
+        live = is_live(data)
+
+        with self._lock:
+            self.fetches += 1
+            previous = self._entries.get(key)
+
+            if live:
+                self._entries[key] = (data, now, self.ttl)
+            else:
+                self.failures += 1
+                if previous is not None and is_live(previous[0]):
+                    # keep serving the last good data, and retry after failure_ttl
+                    data, fetched_at, _ = previous
+                    self._entries[key] = (data, fetched_at, now - fetched_at + self.failure_ttl)
+                else:
+                    # remember the failure briefly so an outage is not hammered
+                    self._entries[key] = (data, now, self.failure_ttl)
+
+            self._inflight.pop(key, None)
+
+        if live:
+            self._save()
+
+        return data
+
+    def _fetch_future(self, key, domain, location):
+        """The key's in-flight fetch, starting one if there is none (lock held)."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = self._pool.submit(self._run_fetch, key, domain, location)
+        else:
+            self.coalesced += 1
+        return future
+
+    def lookup(self, domain, location="us"):
+        """(cached data or None, future to wait on or None)."""
+        key = self._key(domain, location)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                data, fetched_at, fresh_for = entry
+                age = now - fetched_at
+
+                if age < fresh_for:
+                    self.hits += 1
+                    return data, None
+
+                if age < self.max_stale and is_live(data):
+                    self.stale_hits += 1
+                    self._fetch_future(key, domain, location)
+                    return data, None
+
+            self.misses += 1
+            return None, self._fetch_future(key, domain, location)
+
+    def get(self, domain, location="us"):
+        data, future = self.lookup(domain, location)
+        return data if future is None else future.result()
+
+    async def async_get(self, domain, location="us"):
+        data, future = self.lookup(domain, location)
+        return data if future is None else await asyncio.wrap_future(future)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "refreshing": len(self._inflight),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "fetches": self.fetches,
+                "failures": self.failures
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+MARKET_CACHE = MarketDataCache()
+
+
+def get_cached_market_data(domain, location="us"):
+    """Market data through the shared stale-while-revalidate cache."""
+    return MARKET_CACHE.get(domain, location)
+
+
+async def async_get_cached_market_data(domain, location="us"):
+    return await MARKET_CACHE.async_get(domain, location)
+
+
 # ==============================
 # 📊 DEMAND SCORE
 # ==============================
@@ -0,0 +1,406 @@
+"""
+Local store of ingested job listings.
+
+Listings live in SQLite, partitioned by (domain, day): the listings table is
+clustered on (domain, day, listing_key), so reading a domain's recent
+partitions is one range scan and retention drops whole days. domain_daily
+keeps per-partition aggregates (job count, salary sum and samples), updated
+as listings are appended, so slices never aggregate over raw listings.
+
+A listing is identified by its Adzuna id, or by a hash of its normalised
+title, company and location. Each listing is stored once per domain, in the
+partition of the day it was first seen - the daily counts are new listings
+per day, which is the history trend computation needs.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from services.data_loader import get_data
+from services.skill_vocabulary import SkillVocabulary, get_skill_vocabulary
+
+
+MARKET_STORE_PATH = os.environ.get(
+    "PATHFORGE_MARKET_STORE", str(Path(backend_path) / "data" / "market_store.db")
+)
+
+# days of partitions a slice covers, and listings it returns
+SLICE_DAYS = 30
+SLICE_MAX_JOBS = 200
+RETENTION_DAYS = 365
+
+HOURS_PER_YEAR = 2080
+
+# title words -> (seniority level, typical years of experience)
+SENIORITY = (
+    (("intern", "internship", "trainee", "graduate", "junior", "jr", "entry"), "entry-level", 0),
+    (("principal", "staff", "lead", "head", "director"), "senior", 7),
+    (("senior", "sr"), "senior", 5)
+)
+DEFAULT_SENIORITY = ("mid-level", 2)
+
+
+# ---------- NORMALISATION ----------
+def domain_key(domain):
+    return domain.lower().strip().replace(" ", "_")
+
+
+def _clean(text):
+    # Adzuna highlights search terms with <strong> tags
+    return re.sub(r"\s+", " ", re.sub(r"<[^>]+>", "", text or "")).strip()
+
+
+def _display(value):
+    if isinstance(value, dict):
+        return value.get("display_name")
+    return value
+
+
+def annual_salary(value):
+    """Yearly figure for an hourly, monthly or yearly amount, judged by size."""
+    if not value or value <= 0:
+        return None
+    if value < 500:
+        return round(value * HOURS_PER_YEAR, 2)
+    if value < 20000:
+        return round(value * 12, 2)
+    return float(value)
+
+
+_SALARY_AMOUNT = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(k\b)?", re.IGNORECASE)
+
+
+def parse_salary(text):
+    """(min, max) from text like "$150,000 - $200,000" or "80k-95k"."""
+    amounts = []
+    for number, thousands in _SALARY_AMOUNT.findall(text or ""):
+        value = float(number.replace(",", ""))
+        amounts.append(value * 1000 if thousands else value)
+
+    if not amounts:
+        return None, None
+    return amounts[0], amounts[-1]
+
+
+def normalise_salary(low, high):
+    """Annual (min, max); a missing bound takes the other's value."""
+    low, high = annual_salary(low), annual_salary(high)
+    low, high = low or high, high or low
+    if low is not None and low > high:
+        low, high = high, low
+    return low, high
+
+
+def seniority(title):
+    words = set(re.findall(r"[a-z]+", title.lower()))
+    for keywords, level, years in SENIORITY:
+        if words.intersection(keywords):
+            return level, years
+    return DEFAULT_SENIORITY
+
+
+def skill_vocabulary():
+    """Every skill named in market_data.json's skill_demand, as a tuple."""
+    demand = get_data("market_data.json", {}).get("skill_demand", {})
+    return tuple(sorted({skill for skills in demand.values() for skill in skills}))
+
+
+@lru_cache(maxsize=8)
+def _text_vocabulary(shared, names):
+    # the shared vocabulary (with its aliases) limited to names, unless
+    # some name is unknown to it - then a vocabulary of just those names
+    ids = [shared.resolve(name) for name in names]
+    if None in ids:
+        return SkillVocabulary(names), None
+    return shared, frozenset(ids)
+
+
+def extract_skills(text, vocabulary=None):
+    """Vocabulary skills mentioned in text (or their aliases), canonical names in order of first mention."""
+    vocabulary = vocabulary or skill_vocabulary()
+    if not vocabulary or not text:
+        return []
+
+    skills, restrict = _text_vocabulary(get_skill_vocabulary(), tuple(vocabulary))
+    return [skills.name(skill_id) for skill_id in skills.find(text, restrict)]
+
+
+def listing_key(job, title, company, location):
+    if job.get("id"):
+        return f"adzuna:{job['id']}"
+
+    parts = "|".join(_clean(part).lower() for part in (title, company or "", location or ""))
+    return hashlib.blake2b(parts.encode(), digest_size=12).hexdigest()
+
+
+def normalise_listing(job, day, vocabulary=None):
+    """
+    Flat listing record from an Adzuna result (or an already flat listing
+    like the ones in market_data.json).
+    """
+    title = _clean(job.get("title"))
+    company = _display(job.get("company"))
+    location = _display(job.get("location"))
+
+    if job.get("salary_min") or job.get("salary_max"):
+        low, high = job.get("salary_min"), job.get("salary_max")
+    else:
+        low, high = parse_salary(job.get("salary"))
+    salary_min, salary_max = normalise_salary(low, high)
+
+    skills = job.get("required_skills")
+    if skills is None:
+        skills = extract_skills(f"{title} {_clean(job.get('description'))}", vocabulary)
+
+    level, years = seniority(title)
+
+    return {
+        "listing_key": listing_key(job, title, company, location),
+        "title": title,
+        "company": company,
+        "location": location,
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "required_skills": skills,
+        "experience_years": job.get("experience_years", years),
+        "seniority_level": job.get("seniority_level", level),
+        "posting_date": (job.get("created") or job.get("posting_date") or day)[:10]
+    }
+
+
+# ---------- STORE ----------
+class MarketStore:
+
+    def __init__(self, path=MARKET_STORE_PATH):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._listeners = []
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS listings (
+                domain TEXT NOT NULL,
+                day TEXT NOT NULL,
+                listing_key TEXT NOT NULL,
+                title TEXT,
+                company TEXT,
+                location TEXT,
+                salary_min REAL,
+                salary_max REAL,
+                required_skills TEXT NOT NULL,
+                experience_years INTEGER,
+                seniority_level TEXT,
+                posting_date TEXT,
+                PRIMARY KEY (domain, day, listing_key)
+            ) WITHOUT ROWID;
+            CREATE UNIQUE INDEX IF NOT EXISTS listings_seen ON listings (domain, listing_key);
+            CREATE TABLE IF NOT EXISTS domain_daily (
+                domain TEXT NOT NULL,
+                day TEXT NOT NULL,
+                job_count INTEGER NOT NULL,
+                salary_sum REAL NOT NULL,
+                salary_samples INTEGER NOT NULL,
+                PRIMARY KEY (domain, day)
+            ) WITHOUT ROWID;
+        """)
+
+    def append(self, domain, jobs, day=None):
+        """
+        Normalises and appends listings to the domain's partition for day
+        (today by default). Returns how many were new; subscribers get the
+        new ones.
+        """
+        domain = domain_key(domain)
+        day = (day or date.today()).isoformat()
+        vocabulary = skill_vocabulary()
+
+        rows = [normalise_listing(job, day, vocabulary) for job in jobs]
+        rows = [row for row in rows if row["title"]]
+
+        added = []
+        salary_sum = 0.0
+        salary_samples = 0
+
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for row in rows:
+                    cursor = self._db.execute(
+                        "INSERT OR IGNORE INTO listings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            domain, day, row["listing_key"], row["title"], row["company"], row["location"],
+                            row["salary_min"], row["salary_max"], json.dumps(row["required_skills"]),
+                            row["experience_years"], row["seniority_level"], row["posting_date"]
+                        )
+                    )
+                    if not cursor.rowcount:
+                        continue
+
+                    added.append(row)
+                    if row["salary_min"] is not None:
+                        salary_sum += (row["salary_min"] + row["salary_max"]) / 2
+                        salary_samples += 1
+
+                if added:
+                    self._db.execute(
+                        "INSERT INTO domain_daily VALUES (?, ?, ?, ?, ?)"
+                        " ON CONFLICT (domain, day) DO UPDATE SET"
+                        " job_count = job_count + excluded.job_count,"
+                        " salary_sum = salary_sum + excluded.salary_sum,"
+                        " salary_samples = salary_samples + excluded.salary_samples",
+                        (domain, day, len(added), salary_sum, salary_samples)
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+            if added:
+                for listener in self._listeners:
+                    listener(domain, added)
+
+        return len(added)
+
+    def subscribe(self, listener):
+        """
+        listener(domain, listings) is called with every stored listing -
+        the existing ones now, then each batch of new ones as it is
+        appended - so a listener sees each listing exactly once.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT domain, posting_date, required_skills FROM listings ORDER BY domain, day"
+            ).fetchall()
+
+            by_domain = {}
+            for domain, posted, skills in rows:
+                by_domain.setdefault(domain, []).append(
+                    {"posting_date": posted, "required_skills": json.loads(skills)}
+                )
+            for domain, listings in by_domain.items():
+                listener(domain, listings)
+
+            self._listeners.append(listener)
+
+    def daily_counts(self, domain, days=None, today=None):
+        """[(day, new listings)] for a domain, oldest first."""
+        query = "SELECT day, job_count FROM domain_daily WHERE domain = ?"
+        args = [domain_key(domain)]
+
+        if days is not None:
+            query += " AND day > ?"
+            args.append(((today or date.today()) - timedelta(days=days)).isoformat())
+
+        with self._lock:
+            return self._db.execute(query + " ORDER BY day", args).fetchall()
+
+    def domain_slice(self, domain, days=SLICE_DAYS, max_jobs=SLICE_MAX_JOBS, today=None):
+        """
+        Aggregates and most recent listings of a domain over the last days
+        partitions, in fetch_market_data's shape; None if there are none.
+        """
+        domain = domain_key(domain)
+        since = ((today or date.today()) - timedelta(days=days)).isoformat()
+
+        with self._lock:
+            total, salary_sum, salary_samples, as_of = self._db.execute(
+                "SELECT SUM(job_count), SUM(salary_sum), SUM(salary_samples), MAX(day)"
+                " FROM domain_daily WHERE domain = ? AND day > ?",
+                (domain, since)
+            ).fetchone()
+
+            if not total:
+                return None
+
+            rows = self._db.execute(
+                "SELECT title, company, location, salary_min, salary_max, required_skills,"
+                " experience_years, seniority_level, posting_date"
+                " FROM listings WHERE domain = ? AND day > ?"
+                " ORDER BY day DESC, posting_date DESC, listing_key LIMIT ?",
+                (domain, since, max_jobs)
+            ).fetchall()
+
+        jobs = []
+        for title, company, location, low, high, skills, years, level, posted in rows:
+            job = {
+                "title": title,
+                "company": company,
+                "location": location,
+                "required_skills": json.loads(skills),
+                "experience_years": years,
+                "seniority_level": level,
+                "posting_date": posted
+            }
+            if low is not None:
+                job["salary_range"] = {"min": round(low), "max": round(high)}
+            jobs.append(job)
+
+        return {
+            "total_jobs": total,
+            "jobs": jobs,
+            "average_salary": round(salary_sum / salary_samples) if salary_samples else 0,
+            "market_size": "large" if total > 100 else "medium" if total > 20 else "small",
+            "source": "ingested",
+            "as_of": as_of
+        }
+
+    def prune(self, keep_days=RETENTION_DAYS, today=None):
+        """Drops partitions older than keep_days. Returns listings removed."""
+        cutoff = ((today or date.today()) - timedelta(days=keep_days)).isoformat()
+
+        with self._lock:
+            self._db.execute("BEGIN")
+            removed = self._db.execute("DELETE FROM listings WHERE day <= ?", (cutoff,)).rowcount
+            self._db.execute("DELETE FROM domain_daily WHERE day <= ?", (cutoff,))
+            self._db.execute("COMMIT")
+
+        return removed
+
+    def stats(self):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT domain, COUNT(*), SUM(job_count), MIN(day), MAX(day)"
+                " FROM domain_daily GROUP BY domain ORDER BY domain"
+            ).fetchall()
+
+        return {
+            domain: {"partitions": partitions, "listings": listings, "first_day": first, "last_day": last}
+            for domain, partitions, listings, first, last in rows
+        }
+
+    def close(self):
+        self._db.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_market_store(create=False):
+    """
+    The shared store at MARKET_STORE_PATH. Readers get None until the first
+    ingestion has created the file, so a fresh checkout never writes one.
+    """
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None and (create or Path(MARKET_STORE_PATH).exists()):
+                _store = MarketStore(MARKET_STORE_PATH)
+
+    return _store
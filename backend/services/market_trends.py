@@ -0,0 +1,256 @@
+"""
+Hiring trends from dated job listings.
+
+Every series (a domain, or a domain and one skill) keeps two exponentially
+decayed moments of its listing dates, so a new listing is an O(1) update
+and history is never re-read. With age_i = T - t_i and decay lam:
+
+    M0 = sum(exp(-lam * age_i))        M1 = sum(age_i * exp(-lam * age_i))
+
+If listings arrive at a rate r(t) = a + b * (t - T), the expectations of
+the two moments give the rate at T and its slope in closed form:
+
+    a = 2 * lam * M0 - lam^2 * M1      listings per day
+    b = lam^2 * M0 - lam^3 * M1        change in listings per day, per day
+
+growth_30d = 30 * b / (lam * M0) is the numeric trend: the relative change
+in the posting rate over a month if the slope holds (lam * M0 is the plain
+EWMA rate, a steadier denominator than a). A ring buffer of the last
+WINDOW_DAYS daily counts is kept alongside as the rolling series.
+"""
+
+import math
+import sys
+import threading
+import weakref
+from array import array
+from datetime import date
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from services.data_loader import get_data
+
+
+HALF_LIFE_DAYS = 14
+WINDOW_DAYS = 28
+# fewer listings than this are too few to read a trend from
+MIN_LISTINGS = 3
+GROWTH_LIMITS = (-1.0, 3.0)
+
+# (minimum monthly growth, label), checked in order
+TREND_LABELS = ((0.5, "booming"), (0.1, "growing"), (-0.1, "stable"))
+DECLINING = "declining"
+
+# growth implied by a curated label, for data without dated listings
+LABEL_GROWTH = {"booming": 0.5, "growing": 0.25, "stable": 0.0, "declining": -0.25}
+
+
+def trend_label(growth):
+    for floor, label in TREND_LABELS:
+        if growth >= floor:
+            return label
+    return DECLINING
+
+
+def _day(value):
+    """Day number for a date, or an ISO date/datetime string."""
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+# ---------- ONE SERIES ----------
+class TrendSeries:
+
+    __slots__ = ("lam", "t", "m0", "m1", "total", "window", "last_day")
+
+    def __init__(self, half_life_days=HALF_LIFE_DAYS, window_days=WINDOW_DAYS):
+        self.lam = math.log(2) / half_life_days
+        self.t = None
+        self.m0 = 0.0
+        self.m1 = 0.0
+        self.total = 0
+        self.window = array("I", bytes(4 * window_days))
+        self.last_day = None
+
+    def _moments_at(self, day):
+        # moments moved forward to day, without storing them
+        gap = day - self.t
+        decay = math.exp(-self.lam * gap)
+        return self.m0 * decay, (self.m1 + gap * self.m0) * decay
+
+    def add(self, day, count=1):
+        """Records count listings posted on day (a day number)."""
+        if self.t is None:
+            self.t = day
+
+        if day >= self.t:
+            self.m0, self.m1 = self._moments_at(day)
+            self.t = day
+            self.m0 += count
+        else:
+            # a late listing: weight it by its age instead of moving T back
+            age = self.t - day
+            weight = count * math.exp(-self.lam * age)
+            self.m0 += weight
+            self.m1 += age * weight
+
+        self.total += count
+        self._count_in_window(day, count)
+
+    def _count_in_window(self, day, count):
+        size = len(self.window)
+
+        if self.last_day is None:
+            self.last_day = day
+        elif day > self.last_day:
+            # clear the slots of the days skipped over (at most the window)
+            for skipped in range(self.last_day + 1, min(day, self.last_day + size) + 1):
+                self.window[skipped % size] = 0
+            self.last_day = day
+        elif day <= self.last_day - size:
+            return
+
+        self.window[day % size] += count
+
+    def daily_counts(self, as_of=None):
+        """Listings per day over the window ending at as_of, oldest first."""
+        size = len(self.window)
+        end = self.last_day if as_of is None else as_of
+        return [
+            self.window[d % size] if self.last_day - size < d <= self.last_day else 0
+            for d in range(end - size + 1, end + 1)
+        ]
+
+    def estimate(self, as_of=None):
+        """Rate, slope and monthly growth as of a day number (default: last listing)."""
+        # listings are dated by day: read them as posted mid-day, as of the
+        # end of the day (otherwise a flat rate shows a small upward slope)
+        m0, m1 = self._moments_at(max(self.t if as_of is None else as_of, self.t) + 0.5)
+        lam = self.lam
+
+        rate = 2 * lam * m0 - lam ** 2 * m1
+        slope = lam ** 2 * m0 - lam ** 3 * m1
+        ewma = lam * m0
+
+        growth = 30 * slope / ewma if ewma > 0 else 0.0
+        growth = min(max(growth, GROWTH_LIMITS[0]), GROWTH_LIMITS[1])
+
+        return {
+            "rate_per_day": round(max(rate, 0.0), 3),
+            "slope_per_day": round(slope, 4),
+            "growth_30d": round(growth, 3),
+            "label": trend_label(growth),
+            "listings": self.total
+        }
+
+
+# ---------- MANY SERIES ----------
+class MarketTrends:
+    """
+    Trend series per domain and per (domain, skill). Estimates default to
+    the latest listing date seen across all series, so a dataset is read
+    as of its own snapshot date.
+    """
+
+    def __init__(self, half_life_days=HALF_LIFE_DAYS, window_days=WINDOW_DAYS, min_listings=MIN_LISTINGS):
+        self.half_life_days = half_life_days
+        self.window_days = window_days
+        self.min_listings = min_listings
+        self.series = {}
+        self.latest = None
+        self._lock = threading.Lock()
+
+    def _series(self, key):
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = TrendSeries(self.half_life_days, self.window_days)
+        return series
+
+    def add_listing(self, domain, posting_date, skills=()):
+        day = _day(posting_date)
+
+        with self._lock:
+            self._series(domain).add(day)
+            for skill in set(s.lower() for s in skills):
+                self._series((domain, skill)).add(day)
+
+            if self.latest is None or day > self.latest:
+                self.latest = day
+
+    def add_listings(self, domain, listings):
+        for job in listings:
+            if job.get("posting_date"):
+                self.add_listing(domain, job["posting_date"], job.get("required_skills", ()))
+
+    def trend(self, domain, skill=None, as_of=None):
+        """Trend estimate with its rolling daily series, or None without enough listings."""
+        key = domain if skill is None else (domain, skill.lower())
+        as_of = self.latest if as_of is None else _day(as_of)
+
+        with self._lock:
+            series = self.series.get(key)
+            if series is None or series.total < self.min_listings:
+                return None
+
+            result = series.estimate(as_of)
+            result["daily_counts"] = series.daily_counts(as_of)
+
+        result["as_of"] = date.fromordinal(as_of).isoformat()
+        return result
+
+    def skill_trends(self, domain, top_n=None):
+        """Skill trends for a domain, fastest growing first."""
+        skills = [key[1] for key in list(self.series) if isinstance(key, tuple) and key[0] == domain]
+        found = [(skill, self.trend(domain, skill)) for skill in skills]
+        ranked = sorted(
+            ((skill, trend) for skill, trend in found if trend is not None),
+            key=lambda item: (-item[1]["growth_30d"], item[0])
+        )
+        return ranked[:top_n] if top_n else ranked
+
+
+# ---------- SHARED INSTANCES ----------
+_curated = (None, None)
+_stores = weakref.WeakKeyDictionary()
+_trends_lock = threading.Lock()
+
+
+def curated_trends():
+    """Trends over market_data.json listings, rebuilt when the file is reloaded."""
+    global _curated
+
+    data = get_data("market_data.json", {})
+    source, trends = _curated
+
+    if source is not data:
+        with _trends_lock:
+            source, trends = _curated
+            if source is not data:
+                trends = MarketTrends()
+                for domain, entry in data.get("job_data", {}).items():
+                    trends.add_listings(domain, entry.get("jobs", entry.get("listings", [])))
+                _curated = (data, trends)
+
+    return trends
+
+
+def store_trends(store):
+    """
+    Trends over a market store: built from its listings once, then kept
+    current by appends (O(1) per new listing).
+    """
+    trends = _stores.get(store)
+
+    if trends is None:
+        with _trends_lock:
+            trends = _stores.get(store)
+            if trends is None:
+                trends = _stores[store] = MarketTrends()
+                store.subscribe(trends.add_listings)
+
+    return trends
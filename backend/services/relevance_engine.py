@@ -1,22 +1,10 @@
 
-import json
-import os
+from services.data_loader import get_data
 
 
 def load_keywords():
 
-    path = os.path.join(
-        os.path.dirname(__file__),
-        "..",
-        "data",
-        "domain_keywords.json"
-    )
-
-    if not os.path.exists(path):
-        return {}
-
-    with open(path) as f:
-        return json.load(f)
+    return get_data("domain_keywords.json", {})
 
 
 
@@ -0,0 +1,169 @@
+"""
+Content-addressed cache for report sections.
+
+A section's key is a hash of exactly what it reads: the profile fields in
+SECTION_INPUTS, the parts of the best-domain result it uses, the results of
+the sections it depends on, and the data snapshot version. Two profiles that
+only differ in fields a section never reads share its cached result.
+
+Values are stored pickled, so every hit returns a fresh copy and the byte
+cap is measured on real payload sizes. Eviction is LRU, plus a TTL.
+"""
+
+import datetime
+import hashlib
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from core.scoring_engine import TRAITS
+from services.data_loader import current_snapshot
+
+
+CACHE_TTL_S = 300
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# every profile field, in submission order (explain() breaks ties by key order)
+ALL_FIELDS = "*"
+
+# profile fields each report section reads
+SECTION_INPUTS = {
+    "roadmap": (),
+    "skill_gap": TRAITS,
+    "explanation": ALL_FIELDS,
+    "timeline": (),
+    "alternative_paths": TRAITS,
+    "pace_customization": ("hours_per_week", "complexity_tolerance", "learning_capacity"),
+    # the optimized path's hour budget is hours_per_week x the horizon; its cost budget is
+    # max_budget, else the budget_preference limit
+    "resource_recommendations": (
+        "hours_per_week", "budget_preference", "max_budget", "learning_style", "difficulty_preference"
+    ),
+    "market_intelligence": ("current_skills", "learning_capacity", "hours_per_week")
+}
+
+# parts of the best-domain result each section reads (all read "domain")
+SECTION_BEST_FIELDS = {
+    "explanation": ("domain", "score")
+}
+
+_MISSING = "<missing>"
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+def section_key(section, profile, best, deps=None, version=None):
+    """
+    Hex digest identifying one section's inputs.
+    deps maps dependency names to their results; version defaults to the
+    current data snapshot.
+    """
+    fields = SECTION_INPUTS.get(section, ALL_FIELDS)
+
+    if fields == ALL_FIELDS:
+        read = list(profile.items())
+    else:
+        read = [(f, profile.get(f, _MISSING)) for f in fields]
+
+    parts = {
+        "section": section,
+        "profile": read,
+        # sections return an error for an empty profile
+        "empty": not profile,
+        "best": [best.get(f) for f in SECTION_BEST_FIELDS.get(section, ("domain",))],
+        "deps": deps or {},
+        "version": current_snapshot().version if version is None else version
+    }
+
+    # upcoming events depend on today's date
+    if section == "timeline":
+        parts["date"] = datetime.date.today().isoformat()
+
+    return hashlib.blake2b(_canonical(parts).encode(), digest_size=20).hexdigest()
+
+
+class ReportCache:
+    """LRU + TTL cache capped by total pickled size."""
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_TTL_S):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Fresh copy of the cached value, or None."""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            payload = entry[0]
+
+        return pickle.loads(payload)
+
+    def put(self, key, value):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if len(payload) > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+            self._entries[key] = (payload, time.monotonic() + self.ttl)
+            self._bytes += len(payload)
+
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+        return True
+
+    def _drop(self, key):
+        payload, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+REPORT_CACHE = ReportCache()
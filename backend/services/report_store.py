@@ -0,0 +1,117 @@
+"""
+Short-lived store for report sections that missed their time budget.
+
+The orchestrator hands out a token per late section; the section is
+written here when it finishes and can be fetched with that token.
+Entries expire after RESULT_TTL_S and the store keeps at most MAX_ENTRIES.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+
+RESULT_TTL_S = 600
+MAX_ENTRIES = 10000
+
+
+class ReportStore:
+
+    def __init__(self, ttl=RESULT_TTL_S, max_entries=MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        # oldest first; entries are only ever appended
+        while self._entries:
+            token, entry = next(iter(self._entries.items()))
+            if entry["expires"] > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.pop(token)
+
+    def reserve(self, section):
+        """Creates a pending entry and returns its retrieval token."""
+        token = secrets.token_urlsafe(16)
+        now = time.monotonic()
+
+        with self._lock:
+            self._entries[token] = {
+                "section": section,
+                "status": "pending",
+                "result": None,
+                "error": None,
+                "expires": now + self.ttl
+            }
+            self._evict(now)
+
+        return token
+
+    def resolve(self, token, result=None, error=None):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return False
+
+            entry["status"] = "error" if error is not None else "done"
+            entry["result"] = result
+            entry["error"] = None if error is None else f"{type(error).__name__}: {error}"
+            return True
+
+    def get(self, token):
+        """Section entry for a token, or None if unknown or expired."""
+        with self._lock:
+            self._evict(time.monotonic())
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+
+            out = {"token": token, "section": entry["section"], "status": entry["status"]}
+            if entry["status"] == "done":
+                out["result"] = entry["result"]
+            elif entry["status"] == "error":
+                out["error"] = entry["error"]
+            return out
+
+    def __len__(self):
+        return len(self._entries)
+
+
+REPORT_STORE = ReportStore()
+
+
+class PendingSections:
+    """
+    Bridges late graph tasks to the store.
+    A section can finish before its token is issued, so early results are
+    held here and resolved as soon as the token exists.
+    """
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else REPORT_STORE
+        self._tokens = {}
+        self._early = {}
+        self._lock = threading.Lock()
+
+    def on_late(self, name, result, error):
+        with self._lock:
+            token = self._tokens.get(name)
+            if token is None:
+                self._early[name] = (result, error)
+                return
+        self.store.resolve(token, result, error)
+
+    def issue(self, name):
+        """Token for a pending section, resolving it at once if it already finished."""
+        token = self.store.reserve(name)
+
+        with self._lock:
+            self._tokens[name] = token
+            early = self._early.pop(name, None)
+
+        if early is not None:
+            self.store.resolve(token, *early)
+
+        return token
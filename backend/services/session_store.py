@@ -0,0 +1,358 @@
+"""
+Assessment session storage.
+
+A session is a compact SessionRecord: answer sums and answer counts are
+fixed-size arrays in TRAITS order, asked questions are a bitmask over
+QUESTION_IDS, and only non-trait profile fields (hours_per_week, ...) are
+kept as a dict. The running domain scores are two more small arrays. That
+keeps a session well under 1 KB, so one worker can hold 100k of them.
+
+Stores are pluggable (SESSION_BACKENDS):
+    memory          in-process dict with TTL eviction (default)
+    sqlite:<path>   SQLite file, survives restarts
+
+Pick one with PATHFORGE_SESSION_STORE, e.g. "sqlite:data/sessions.db".
+Memory benchmark: python -m services.session_store --bench
+"""
+
+import json
+import math
+import os
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from agents.adaptive_agent import QUESTION_BANK, TRAITS
+from core.scoring_engine import RunningScores, get_scoring_engine
+
+
+SESSION_TTL_S = 3600
+SESSION_STORE = os.environ.get("PATHFORGE_SESSION_STORE", "memory")
+# answers and seeded trait scores are on a 0-10 scale
+MIN_SCORE = 0
+MAX_SCORE = 10
+# sessions share this many locks, picked by session id
+LOCK_STRIPES = 64
+
+# every question gets a stable bit: (trait, question text) in bank order
+QUESTION_IDS = [(trait, q) for trait in TRAITS for q in QUESTION_BANK[trait]]
+QUESTION_INDEX = {q: i for i, (_, q) in enumerate(QUESTION_IDS)}
+
+ACTIVE = "active"
+COMPLETE = "complete"
+
+
+def trait_score(trait, value):
+    """A seeded trait score as a float in MIN_SCORE..MAX_SCORE; ValueError otherwise."""
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        score = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{trait} must be a number, got {value!r}")
+
+    if not math.isfinite(score) or not MIN_SCORE <= score <= MAX_SCORE:
+        raise ValueError(f"{trait} must be from {MIN_SCORE} to {MAX_SCORE}, got {value!r}")
+
+    return score
+
+
+# ---------- SESSION RECORD ----------
+class SessionRecord:
+
+    __slots__ = ("session_id", "scores", "confidence", "asked", "pending",
+                 "clarify_count", "status", "extras", "expires", "running")
+
+    def __init__(self, session_id, expires):
+        self.session_id = session_id
+        # repeated from one item, so the arrays are allocated at their exact size
+        self.scores = array("d", [0.0]) * len(TRAITS)
+        self.confidence = array("H", [0]) * len(TRAITS)
+        self.asked = 0
+        self.pending = -1
+        self.clarify_count = 0
+        self.status = ACTIVE
+        self.extras = None
+        self.expires = expires
+        # RunningScores, built on first use; not persisted
+        self.running = None
+
+    def record_answer(self, trait, score):
+        i = TRAITS.index(trait)
+        self.scores[i] += score
+        self.confidence[i] += 1
+
+        # one trait changed: rank-1 update of the domain scores
+        if self.running is not None:
+            self.running.set(trait, self.scores[i] / self.confidence[i])
+
+    def running_scores(self):
+        """Domain scores for the current profile, kept up to date per answer."""
+        if self.running is None or self.running.engine is not get_scoring_engine():
+            self.running = RunningScores(self.profile())
+        return self.running
+
+    def set_profile(self, profile):
+        """
+        Seeds the session from a ready-made profile (one answer per trait).
+        Raises ValueError, leaving the session unchanged, if a trait score is
+        not a number in range.
+        """
+        traits = {key: trait_score(key, value) for key, value in profile.items() if key in TRAITS}
+        extras = {key: value for key, value in profile.items() if key not in TRAITS}
+
+        for key, value in traits.items():
+            i = TRAITS.index(key)
+            self.scores[i] = value
+            self.confidence[i] = 1
+        self.extras = extras or None
+        self.running = None
+
+    def profile(self):
+        """Mean answer per answered trait, then the non-trait fields."""
+        profile = {}
+        for i, trait in enumerate(TRAITS):
+            if self.confidence[i]:
+                value = self.scores[i] / self.confidence[i]
+                profile[trait] = int(value) if value.is_integer() else value
+        if self.extras:
+            profile.update(self.extras)
+        return profile
+
+    def pending_question(self):
+        if self.pending < 0:
+            return None
+        trait, question = QUESTION_IDS[self.pending]
+        remaining = sum(
+            1 for i, (t, _) in enumerate(QUESTION_IDS)
+            if t == trait and not self.asked >> i & 1
+        )
+        # same shape as adaptive_agent.next_question
+        return {"trait": trait, "question": question, "remaining": remaining}
+
+    # the adaptive agent and orchestrator work on a plain state dict
+    def to_state(self):
+        return {
+            "scores": dict(zip(TRAITS, self.scores)),
+            "confidence": dict(zip(TRAITS, self.confidence)),
+            "asked": [q for i, (_, q) in enumerate(QUESTION_IDS) if self.asked >> i & 1],
+            "clarify_count": self.clarify_count,
+            "domain_scores": self.running_scores()
+        }
+
+    def apply_state(self, state):
+        self.asked = 0
+        for question in state["asked"]:
+            self.asked |= 1 << QUESTION_INDEX[question]
+        self.clarify_count = state.get("clarify_count", 0)
+
+
+# ---------- SESSION LOCKS ----------
+class SessionLocks:
+    """
+    Striped locks so concurrent requests on one session run one at a time
+    (a lock per session would cost more than the session itself).
+    """
+
+    def __init__(self, stripes=LOCK_STRIPES):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+    def __call__(self, session_id):
+        return self._locks[hash(session_id) % len(self._locks)]
+
+
+# ---------- MEMORY STORE ----------
+class MemorySessionStore:
+    """Sessions in an LRU-ordered dict; expired ones are dropped from the front."""
+
+    def __init__(self, ttl=SESSION_TTL_S):
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        # lock(session_id): held while a request reads and updates a session
+        self.lock = SessionLocks()
+
+    def _evict(self, now):
+        while self._sessions:
+            record = next(iter(self._sessions.values()))
+            if record.expires > now:
+                break
+            self._sessions.popitem(last=False)
+
+    def create(self):
+        now = time.time()
+        record = SessionRecord(secrets.token_urlsafe(12), now + self.ttl)
+
+        with self._lock:
+            self._evict(now)
+            self._sessions[record.session_id] = record
+
+        return record
+
+    def get(self, session_id):
+        """Session record, or None if unknown or expired."""
+        with self._lock:
+            self._evict(time.time())
+            return self._sessions.get(session_id)
+
+    def save(self, record):
+        # saving counts as activity: push the expiry out and move to the back
+        with self._lock:
+            record.expires = time.time() + self.ttl
+            self._sessions[record.session_id] = record
+            self._sessions.move_to_end(record.session_id)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+# ---------- SQLITE STORE ----------
+class SQLiteSessionStore:
+    """Sessions in a SQLite table; arrays are stored as raw blobs."""
+
+    def __init__(self, path, ttl=SESSION_TTL_S):
+        self.path = str(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.lock = SessionLocks()
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                scores BLOB NOT NULL,
+                confidence BLOB NOT NULL,
+                asked INTEGER NOT NULL,
+                pending INTEGER NOT NULL,
+                clarify_count INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                extras TEXT,
+                expires REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)")
+
+    def create(self):
+        record = SessionRecord(secrets.token_urlsafe(12), 0)
+        self.save(record)
+        return record
+
+    def get(self, session_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT scores, confidence, asked, pending, clarify_count, status, extras, expires"
+                " FROM sessions WHERE session_id = ? AND expires > ?",
+                (session_id, time.time())
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        record = SessionRecord(session_id, row[7])
+        record.scores = array("d", row[0])
+        record.confidence = array("H", row[1])
+        record.asked, record.pending, record.clarify_count, record.status = row[2:6]
+        record.extras = json.loads(row[6]) if row[6] else None
+        return record
+
+    def save(self, record):
+        now = time.time()
+        record.expires = now + self.ttl
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.session_id, record.scores.tobytes(), record.confidence.tobytes(),
+                    record.asked, record.pending, record.clarify_count, record.status,
+                    json.dumps(record.extras) if record.extras else None, record.expires
+                )
+            )
+
+            # sweep expired sessions every few hundred writes
+            self._writes += 1
+            if self._writes % 500 == 0:
+                self._db.execute("DELETE FROM sessions WHERE expires <= ?", (now,))
+
+    def delete(self, session_id):
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM sessions WHERE expires > ?", (time.time(),)
+            ).fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+
+SESSION_BACKENDS = {
+    "memory": lambda arg: MemorySessionStore(),
+    "sqlite": lambda arg: SQLiteSessionStore(arg or Path(backend_path) / "data" / "sessions.db")
+}
+
+
+def create_session_store(spec=SESSION_STORE):
+    """"memory" or "sqlite:<path>" -> a session store."""
+    name, _, arg = spec.partition(":")
+
+    if name not in SESSION_BACKENDS:
+        raise ValueError(f"unknown session store {name!r}; options are {sorted(SESSION_BACKENDS)}")
+
+    return SESSION_BACKENDS[name](arg)
+
+
+SESSIONS = create_session_store()
+
+
+# ---------- MEMORY BENCHMARK ----------
+def benchmark_memory(n=100000):
+    """Bytes per session with n live sessions in the memory store."""
+    import random
+    import tracemalloc
+
+    rng = random.Random(0)
+    store = MemorySessionStore()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    for _ in range(n):
+        record = store.create()
+        # the running domain scores are kept per session too
+        record.running_scores()
+        for trait in rng.sample(TRAITS, 5):
+            record.record_answer(trait, rng.randint(0, 10))
+        record.asked = rng.getrandbits(len(QUESTION_IDS))
+        record.extras = {"hours_per_week": rng.choice([5, 10, 20])}
+        store.save(record)
+
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return {"sessions": len(store), "total_mb": round(used / 2 ** 20, 1), "bytes_per_session": round(used / n)}
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        row = benchmark_memory()
+        print(f"{row['sessions']} sessions | {row['total_mb']} MB | {row['bytes_per_session']} bytes/session")
@@ -0,0 +1,235 @@
+"""
+Shared skill vocabulary.
+
+Every skill the data names (skill_synonyms.json canonical names and
+aliases, market_data.json skill_demand and listings, resource_catalog.json)
+gets a canonical integer ID. Names are matched by a key that ignores case,
+hyphens and repeated spaces, and aliases resolve to their canonical
+skill, so "ML fundamentals", "Machine Learning" and "machine-learning"
+are all one ID. Agents compare skills as ID sets or int bitsets instead
+of lowercased strings.
+
+The vocabulary is shared and never grows after it is built. Skills named
+only at request time (a user's own skill list) get IDs in a per-call
+SkillScope, numbered from the vocabulary size, so two unknown spellings of
+the same key still match within the call and bitsets stay small.
+
+find() scans free text for skills with one compiled regex built from a
+trie of the alias keys: at each position the engine walks a single path
+of shared prefixes, longest alias first, instead of trying every name.
+"""
+
+import re
+import sys
+import threading
+from pathlib import Path
+
+# Add backend directory to path for imports
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
+
+from services.data_loader import get_data
+
+
+SYNONYMS_FILE = "skill_synonyms.json"
+
+_SEPARATORS = re.compile(r"[\s\-]+")
+
+
+def skill_key(name):
+    """Matching key: "  Machine-Learning " -> "machine learning"."""
+    return _SEPARATORS.sub(" ", str(name).lower()).strip()
+
+
+def _trie_pattern(keys):
+    """Regex for a set of keys, factored on shared prefixes (longest first)."""
+    trie = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def emit(node):
+        branches = [
+            (r"[\s\-]+" if char == " " else re.escape(char)) + emit(child)
+            for char, child in sorted((c, n) for c, n in node.items() if c)
+        ]
+        if "" in node:
+            # a key may end here, but only at a word boundary and after
+            # every longer continuation has been tried
+            branches.append(r"(?!\w)")
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    if not trie:
+        return None
+    return re.compile(r"(?<!\w)" + emit(trie), re.IGNORECASE)
+
+
+# ---------- VOCABULARY ----------
+class SkillVocabulary:
+    """
+    Canonical skill names with integer IDs.
+    synonyms: {canonical name: [aliases]}; names: further skills, where
+    the first spelling seen of a key is the canonical one.
+    """
+
+    def __init__(self, names=(), synonyms=None, sources=None):
+        self.sources = sources
+        self.names = []
+        self.alias_ids = {}
+
+        for canonical, aliases in (synonyms or {}).items():
+            skill_id = self._add(canonical)
+            for alias in aliases:
+                self.alias_ids.setdefault(skill_key(alias), skill_id)
+
+        for name in names:
+            self._add(name)
+
+        self.size = len(self.names)
+        self._patterns = {}
+
+    def _add(self, name):
+        key = skill_key(name)
+        skill_id = self.alias_ids.get(key)
+        if skill_id is None:
+            skill_id = self.alias_ids[key] = len(self.names)
+            self.names.append(name)
+        return skill_id
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, name):
+        return skill_key(name) in self.alias_ids
+
+    # ---------- IDS ----------
+    def resolve(self, name):
+        """Canonical ID of a known skill or alias, else None."""
+        return self.alias_ids.get(skill_key(name))
+
+    def name(self, skill_id):
+        """Canonical display name for an ID."""
+        return self.names[skill_id]
+
+    def scope(self):
+        """IDs for one call, including names outside the vocabulary."""
+        return SkillScope(self)
+
+    # ---------- TEXT ----------
+    def _pattern(self, restrict):
+        pattern = self._patterns.get(restrict, False)
+        if pattern is False:
+            keys = [key for key, skill_id in self.alias_ids.items() if restrict is None or skill_id in restrict]
+            pattern = self._patterns[restrict] = _trie_pattern(keys)
+        return pattern
+
+    def find(self, text, restrict=None):
+        """
+        IDs of skills mentioned in text, in order of first mention.
+        restrict: optional frozenset of IDs to look for.
+        """
+        pattern = self._pattern(restrict)
+        if pattern is None or not text:
+            return []
+
+        alias_ids = self.alias_ids
+        found = []
+        for match in pattern.finditer(text):
+            skill_id = alias_ids.get(skill_key(match.group(0)))
+            if skill_id is not None and skill_id not in found:
+                found.append(skill_id)
+        return found
+
+
+# ---------- PER-CALL IDS ----------
+class SkillScope:
+    """
+    Skill IDs for one call: the vocabulary's, plus local IDs from
+    vocabulary.size up for names it does not know. Scopes are not shared,
+    so request input never grows the vocabulary.
+    """
+
+    __slots__ = ("vocabulary", "_local", "_local_names")
+
+    def __init__(self, vocabulary):
+        self.vocabulary = vocabulary
+        self._local = {}
+        self._local_names = []
+
+    def id(self, name):
+        key = skill_key(name)
+        skill_id = self.vocabulary.alias_ids.get(key)
+        if skill_id is None:
+            skill_id = self._local.get(key)
+            if skill_id is None:
+                skill_id = self._local[key] = self.vocabulary.size + len(self._local_names)
+                self._local_names.append(key.title())
+        return skill_id
+
+    def ids(self, names):
+        return frozenset(self.id(name) for name in names)
+
+    def mask(self, names):
+        """Bitset of skill IDs as an int."""
+        bits = 0
+        for name in names:
+            bits |= 1 << self.id(name)
+        return bits
+
+    def name(self, skill_id):
+        """Canonical display name for an ID."""
+        size = self.vocabulary.size
+        return self.vocabulary.names[skill_id] if skill_id < size else self._local_names[skill_id - size]
+
+    def mask_names(self, bits):
+        """Display names of the IDs in a bitset, in ID order."""
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(self.name(low.bit_length() - 1))
+            bits ^= low
+        return found
+
+
+# ---------- SHARED VOCABULARY ----------
+_vocabulary = None
+_vocabulary_lock = threading.Lock()
+
+
+def _data_skill_names(market, catalog):
+    names = []
+    for skills in market.get("skill_demand", {}).values():
+        names.extend(skills)
+    for entry in market.get("job_data", {}).values():
+        for job in entry.get("jobs", entry.get("listings", [])):
+            names.extend(job.get("required_skills", []))
+    for section in catalog.values():
+        for resource in section.values():
+            names.extend(resource.get("skills", []))
+    return names
+
+
+def get_skill_vocabulary():
+    """Vocabulary over the data files, rebuilt when the registry serves new ones."""
+    global _vocabulary
+
+    sources = (
+        get_data(SYNONYMS_FILE, {}),
+        get_data("market_data.json", {}),
+        get_data("resource_catalog.json", {})
+    )
+    vocabulary = _vocabulary
+
+    if vocabulary is None or any(a is not b for a, b in zip(vocabulary.sources, sources)):
+        with _vocabulary_lock:
+            vocabulary = _vocabulary
+            if vocabulary is None or any(a is not b for a, b in zip(vocabulary.sources, sources)):
+                synonyms, market, catalog = sources
+                vocabulary = _vocabulary = SkillVocabulary(
+                    _data_skill_names(market, catalog), synonyms, sources=sources
+                )
+
+    return vocabulary
@@ -0,0 +1,249 @@
+"""
+Guards for calls to external APIs: a circuit breaker and a token bucket.
+
+The breaker counts consecutive failures (errors, timeouts, 5xx and 429
+responses). After FAILURE_THRESHOLD of them it opens and rejects calls at
+once for RESET_TIMEOUT_S; then it lets a single probe through (half-open)
+and closes again if the probe succeeds.
+
+The token bucket keeps us inside the upstream quota: a call takes a token
+or is rejected without waiting. Background callers (ingestion) may wait
+for a token instead, up to a timeout.
+
+Guards are registered per upstream name; upstream_metrics() reports state
+and counters for all of them.
+"""
+
+import threading
+import time
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT_S = 30.0
+
+
+# ---------- CIRCUIT BREAKER ----------
+class CircuitBreaker:
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT_S,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.successes = 0
+        self.failed = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def allow(self):
+        """True if a call may go out now; a rejected call is counted."""
+        with self._lock:
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self.state = HALF_OPEN
+
+            if self.state == HALF_OPEN:
+                # one probe at a time
+                if self._probing:
+                    self.rejected += 1
+                    return False
+                self._probing = True
+
+            self.calls += 1
+            return True
+
+    def reject_if_open(self):
+        """
+        True (and counted as a rejection) while the circuit is open and not
+        yet due for a probe - lets callers skip a whole batch of calls.
+        """
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return True
+            return False
+
+    def release(self):
+        """Hands back a call allowed by allow() that never went out."""
+        with self._lock:
+            self.calls -= 1
+            self._probing = False
+
+    def abandon(self):
+        """
+        Ends a call that went out but raised something other than an
+        upstream error (a bug, a cancellation): frees the probe slot
+        without counting a success or a failure.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self.failures = 0
+            self._probing = False
+            self.state = CLOSED
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failed += 1
+            self.failures += 1
+
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opened += 1
+                self.state = OPEN
+                self.opened_at = self.clock()
+
+            self._probing = False
+
+    def metrics(self):
+        with self._lock:
+            state = self.state
+            if state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                state = HALF_OPEN
+
+            return {
+                "state": state,
+                "consecutive_failures": self.failures,
+                "calls": self.calls,
+                "successes": self.successes,
+                "failures": self.failed,
+                "rejected": self.rejected,
+                "times_opened": self.opened
+            }
+
+
+# ---------- TOKEN BUCKET ----------
+class TokenBucket:
+    """rate tokens per second, bursts of up to capacity."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+        self.granted = 0
+        self.rejected = 0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        with self._lock:
+            self._refill(self.clock())
+
+            if self.tokens < tokens:
+                self.rejected += 1
+                return False
+
+            self.tokens -= tokens
+            self.granted += 1
+            return True
+
+    def acquire(self, timeout, tokens=1):
+        """Waits up to timeout seconds for tokens; False (and counted) if none came."""
+        deadline = self.clock() + timeout
+
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._refill(now)
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    self.granted += 1
+                    return True
+
+                wait = (tokens - self.tokens) / self.rate if self.rate > 0 else float("inf")
+                if now + wait > deadline:
+                    self.rejected += 1
+                    return False
+
+            self.sleep(wait)
+
+    def metrics(self):
+        with self._lock:
+            self._refill(self.clock())
+            return {
+                "tokens": round(self.tokens, 2),
+                "capacity": self.capacity,
+                "rate_per_s": self.rate,
+                "granted": self.granted,
+                "rejected": self.rejected
+            }
+
+
+# ---------- REGISTRY ----------
+class UpstreamGuard:
+    """Breaker + limiter pair for one upstream."""
+
+    def __init__(self, name, rate, capacity, **breaker_options):
+        self.name = name
+        self.breaker = CircuitBreaker(name, **breaker_options)
+        self.limiter = TokenBucket(rate, capacity)
+
+    def allow(self, wait_s=0):
+        """
+        None if the call may proceed, else why not ("circuit_open" or
+        "rate_limited"). The breaker is asked first, so an open circuit
+        does not spend tokens. wait_s: how long to wait for a token.
+        """
+        if not self.breaker.allow():
+            return "circuit_open"
+
+        acquired = self.limiter.acquire(wait_s) if wait_s else self.limiter.try_acquire()
+        if not acquired:
+            # the breaker let this call through; hand its probe slot back
+            self.breaker.release()
+            return "rate_limited"
+
+        return None
+
+    def metrics(self):
+        return {"breaker": self.breaker.metrics(), "limiter": self.limiter.metrics()}
+
+
+_guards = {}
+_guards_lock = threading.Lock()
+
+
+def register_upstream(name, rate, capacity, **breaker_options):
+    """Creates (or replaces) the guard for an upstream."""
+    guard = UpstreamGuard(name, rate, capacity, **breaker_options)
+    with _guards_lock:
+        _guards[name] = guard
+    return guard
+
+
+def get_upstream(name):
+    return _guards[name]
+
+
+def upstream_metrics():
+    with _guards_lock:
+        guards = list(_guards.values())
+    return {guard.name: guard.metrics() for guard in guards}
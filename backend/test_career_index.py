@@ -0,0 +1,176 @@
+"""
+Test examples for the career vector index
+Shows exact search matching the career loop, inserts, and IVF recall
+"""
+
+import random
+import threading
+
+import numpy as np
+
+from core.career_index import CareerIndex, get_career_index
+from core.scoring_engine import TRAITS
+from services.data_loader import load_careers
+
+
+def reference_careers(profile, careers):
+    """The original per-career loop, kept here as the ground truth"""
+    return sorted(
+        [(c, round(sum(profile.get(t, 0) for t in c["traits"]), 2)) for c in careers],
+        key=lambda x: x[1], reverse=True
+    )
+
+
+def synthetic_careers(n, seed):
+    rng = random.Random(seed)
+    return [
+        {
+            "career": f"Career {i}",
+            "domain": "synthetic",
+            "traits": {t: rng.randint(1, 4) / 2 for t in rng.sample(TRAITS, rng.randint(1, 4))}
+        }
+        for i in range(n)
+    ]
+
+
+def test_exact_matches_loop():
+    """Exact search equals the sorted per-career loop, ties included"""
+    print("\n" + "="*70)
+    print("TEST 1: Exact Search vs Career Loop")
+    print("="*70)
+
+    rng = random.Random(3)
+    index = get_career_index()
+    careers = load_careers()
+    mismatches = 0
+
+    for _ in range(500):
+        profile = {t: round(rng.uniform(0, 10), 2) for t in TRAITS if rng.random() < 0.9}
+        expected = reference_careers(profile, careers)
+
+        for k in (1, 5, 10, None):
+            if index.query(profile, k) != expected[:k]:
+                mismatches += 1
+
+    print(f"\n✓ Indexed careers: {index.size}")
+    print(f"  Mismatches over 500 profiles: {mismatches}")
+    assert mismatches == 0
+
+
+def test_incremental_inserts():
+    """Careers added in batches are searchable right away"""
+    print("\n" + "="*70)
+    print("TEST 2: Incremental Inserts")
+    print("="*70)
+
+    careers = synthetic_careers(3000, seed=8)
+    index = CareerIndex(capacity=16)
+
+    for start in range(0, len(careers), 700):
+        index.add(careers[start:start + 700])
+
+    profile = {t: v for t, v in zip(TRAITS, [8, 5, 6, 7, 6, 4, 7, 9, 3])}
+    expected = sorted(
+        [(c, round(sum(profile[t] * w for t, w in c["traits"].items()), 2)) for c in careers],
+        key=lambda x: x[1], reverse=True
+    )
+
+    print(f"\n✓ Index size after inserts: {index.size}")
+    print(f"  Top career: {index.query(profile, 1)[0][0]['career']}")
+    assert index.size == len(careers)
+    assert index.query(profile, 20) == expected[:20]
+
+    try:
+        index.add([{"career": "Astronaut", "domain": "space", "traits": ["gravity"]}])
+        raise AssertionError("unknown trait accepted")
+    except ValueError as e:
+        print(f"  Unknown trait rejected: {e}")
+
+
+def test_queries_during_growth():
+    """Queries racing add() see one consistent set of arrays while rows grow"""
+    print("\n" + "="*70)
+    print("TEST 3: Queries During Growth")
+    print("="*70)
+
+    # one-trait careers first, so later batches widen the layout as well
+    careers = [{"career": f"Solo {i}", "domain": "synthetic", "traits": {TRAITS[i % len(TRAITS)]: 1.0}}
+               for i in range(50)]
+    careers += synthetic_careers(4000, seed=11)
+    index = CareerIndex(capacity=1)
+
+    rows = index.rows
+    index.add(careers[:1])
+    assert index.rows is rows
+    index.add(careers[1:2])
+    assert index.rows is not rows and len(rows.vectors) == 1
+
+    profile = {t: v for t, v in zip(TRAITS, [8, 5, 6, 7, 6, 4, 7, 9, 3])}
+    vector = np.array([profile[t] for t in TRAITS], dtype=float)
+    done = threading.Event()
+    errors = []
+    queries = [0]
+
+    def reader():
+        while not done.is_set():
+            try:
+                ids, scores = index.search(vector, 10)
+                for i, score in zip(ids.tolist(), scores.tolist()):
+                    traits = careers[i]["traits"]
+                    assert score == round(sum(profile[t] * w for t, w in traits.items()), 2)
+                queries[0] += 1
+            except Exception as e:
+                errors.append(e)
+                return
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for start in range(2, len(careers), 37):
+        index.add(careers[start:start + 37])
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"\n✓ {queries[0]} queries during {index.size} inserts, rows grown to {len(index.rows.vectors)}")
+    assert not errors, errors
+    assert index.size == len(careers)
+    assert index.rows.layout_cols.shape == index.rows.layout_weights.shape
+
+
+def test_ivf_recall():
+    """IVF with int8 codes finds most of the exact top 10"""
+    print("\n" + "="*70)
+    print("TEST 4: IVF Approximate Search")
+    print("="*70)
+
+    index = CareerIndex(capacity=1024)
+    index.add(synthetic_careers(20000, seed=9))
+    index.train_ivf(quantise=True)
+
+    rng = np.random.default_rng(4)
+    recalls = []
+    for vector in rng.uniform(0, 10, size=(50, len(TRAITS))):
+        exact = set(index.search(vector, 10)[0].tolist())
+        approx = set(index.search(vector, 10, mode="ivf", nprobe=16)[0].tolist())
+        recalls.append(len(exact & approx) / 10)
+
+    # careers inserted after training go to their nearest list
+    index.add(synthetic_careers(500, seed=10))
+    ids, _ = index.search(rng.uniform(0, 10, len(TRAITS)), 10, mode="ivf")
+
+    print(f"\n✓ Lists: {len(index.lists)}, mean recall@10: {np.mean(recalls):.3f}")
+    assert np.mean(recalls) >= 0.8
+    assert len(ids) == 10
+    assert sum(len(ids) for ids in index.lists) == index.size
+
+
+if __name__ == "__main__":
+    test_exact_matches_loop()
+    test_incremental_inserts()
+    test_queries_during_growth()
+    test_ivf_recall()
+
+    print("\n" + "="*70)
+    print("✓ All Career Index Tests Completed!")
+    print("="*70 + "\n")
@@ -0,0 +1,151 @@
+"""
+Test examples for the shared data registry
+Shows read-only views, hot reload and snapshot pinning
+"""
+
+import json
+import os
+import tempfile
+
+from fastapi.testclient import TestClient
+
+from main import app
+from routes import data as data_routes
+from services.data_loader import DataRegistry, FrozenDict
+from services.data_snapshot import compile_snapshot, read_snapshot
+
+
+def _write(folder, filename, data, mtime_ns=None):
+    path = os.path.join(folder, filename)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_frozen_views():
+    """Registry data cannot be modified in place"""
+    print("\n" + "="*70)
+    print("TEST 1: Read-only Registry Views")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as folder:
+        _write(folder, "careers.json", [{"career": "Doctor", "traits": ["empathy"]}])
+
+        registry = DataRegistry(folder)
+        careers = registry.get("careers.json")
+
+        print(f"\n✓ Loaded {len(careers)} careers as {type(careers).__name__}")
+        assert isinstance(careers[0], FrozenDict)
+
+        try:
+            careers[0]["career"] = "Surgeon"
+            print("  ✗ Mutation was allowed")
+        except TypeError as e:
+            print(f"  Mutation blocked: {e}")
+
+        print(f"  JSON output: {json.dumps(careers)}")
+
+
+def test_hot_reload():
+    """Only changed files are re-parsed and pinned snapshots stay stable"""
+    print("\n" + "="*70)
+    print("TEST 2: Hot Reload Without Restart")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as folder:
+        _write(folder, "market_data.json", {"job_data": {}}, mtime_ns=1_000_000_000)
+        _write(folder, "careers.json", [], mtime_ns=1_000_000_000)
+
+        registry = DataRegistry(folder)
+        before = registry.snapshot()
+
+        _write(folder, "market_data.json", {"job_data": {"technology": {}}}, mtime_ns=2_000_000_000)
+        changed = registry.reload()
+        after = registry.snapshot()
+
+        print(f"\n✓ Reloaded files: {changed}")
+        print(f"  Stats: {registry.stats()}")
+        assert changed == ["market_data.json"]
+        assert after.files["careers.json"] is before.files["careers.json"]
+
+        print(f"  Old snapshot v{before.version}: {dict(before.get('market_data.json')['job_data'])}")
+        print(f"  New snapshot v{after.version}: {list(after.get('market_data.json')['job_data'])}")
+        assert before.get("market_data.json")["job_data"] == {}
+
+        # a half-written file keeps the last good version
+        with open(os.path.join(folder, "careers.json"), "w") as f:
+            f.write("[{")
+        os.utime(os.path.join(folder, "careers.json"), ns=(3_000_000_000, 3_000_000_000))
+        stable = registry.snapshot()
+        assert registry.reload() == [] and registry.reload() == []
+        print(f"  After broken write, careers still: {registry.get('careers.json')}")
+        assert registry.get("careers.json") == ()
+
+        # polls while it stays broken swap nothing, so caches keyed on the version survive
+        assert registry.snapshot() is stable and registry.stats()["reload_count"] == 1
+
+        _write(folder, "careers.json", ["fixed"], mtime_ns=4_000_000_000)
+        assert registry.reload() == ["careers.json"] and registry.get("careers.json") == ("fixed",)
+
+
+def test_compiled_snapshot():
+    """Workers load the binary snapshot and fall back to JSON when it is stale"""
+    print("\n" + "="*70)
+    print("TEST 3: Precompiled Binary Snapshot")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as folder:
+        _write(folder, "domain_weights.json", {"law": {"social": 1.5}}, mtime_ns=1_000_000_000)
+        _write(folder, "careers.json", [{"career": "Lawyer", "domain": "law", "traits": ["social"]}], mtime_ns=1_000_000_000)
+
+        compile_snapshot(folder)
+        registry = DataRegistry(folder)
+        mtimes = registry._scan()
+
+        print(f"\n✓ Snapshot fresh: {read_snapshot(folder, mtimes) is not None}")
+        print(f"  Indexes: {dict(registry.snapshot().indexes)}")
+        assert registry.snapshot().index("domains") == ("law",)
+
+        _write(folder, "domain_weights.json", {"medical": {"empathy": 2}}, mtime_ns=2_000_000_000)
+        stale = read_snapshot(folder, registry._scan()) is None
+        print(f"  Snapshot stale after edit: {stale}")
+        print(f"  JSON fallback domains: {DataRegistry(folder).snapshot().index('domains')}")
+        assert DataRegistry(folder).snapshot().index("domains") == ("medical",)
+
+
+def test_reload_endpoint_auth():
+    """POST /data/reload needs the admin token and is off without one"""
+    print("\n" + "="*70)
+    print("TEST 4: Reload Endpoint Auth")
+    print("="*70)
+
+    client = TestClient(app)
+    previous = data_routes.ADMIN_TOKEN
+
+    try:
+        data_routes.ADMIN_TOKEN = None
+        assert client.post("/data/reload").status_code == 403
+
+        data_routes.ADMIN_TOKEN = "s3cret"
+        assert client.post("/data/reload").status_code == 401
+        assert client.post("/data/reload", headers={"X-Admin-Token": "guess"}).status_code == 401
+
+        response = client.post("/data/reload", headers={"X-Admin-Token": "s3cret"})
+        print(f"\n✓ Authorised reload: {response.json()}")
+        assert response.status_code == 200 and "changed" in response.json()
+    finally:
+        data_routes.ADMIN_TOKEN = previous
+
+    assert client.get("/data/status").status_code == 200
+
+
+if __name__ == "__main__":
+    test_frozen_views()
+    test_hot_reload()
+    test_compiled_snapshot()
+    test_reload_endpoint_auth()
+
+    print("\n" + "="*70)
+    print("✓ All Data Registry Tests Completed!")
+    print("="*70 + "\n")
@@ -0,0 +1,601 @@
+"""
+Test examples for the Adzuna market service
+Shows concurrent role and page fetches against a local stub server
+"""
+
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from services import market_service
+from fastapi.testclient import TestClient
+
+from main import app
+from services.market_service import (
+    MarketDataCache, async_get_market_data, fallback_market_data, get_market_data, map_domain_to_roles
+)
+from services.upstream_guard import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, TokenBucket, UpstreamGuard
+
+
+DELAY_S = 0.2
+
+
+class StubAdzuna(ThreadingHTTPServer):
+    """Answers /{location}/search/{page} after DELAY_S; records traffic."""
+
+    daemon_threads = True
+
+    def __init__(self, count=20, failing=()):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.count = count
+        self.failing = set(failing)
+        self.requests = []
+        self.connections = set()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        role = parse_qs(url.query)["what"][0]
+        page = int(url.path.rsplit("/", 1)[1])
+
+        with server.lock:
+            server.requests.append((role, page))
+            server.connections.add(self.client_address)
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+
+        time.sleep(DELAY_S)
+
+        with server.lock:
+            server.in_flight -= 1
+
+        if role in server.failing:
+            status, body = 503, {"error": "unavailable"}
+        else:
+            status, body = 200, {
+                "count": server.count,
+                "results": [
+                    {
+                        "title": f"{role} {page}-{i}",
+                        "company": {"display_name": "Stub Co"},
+                        "location": {"display_name": "Remote"},
+                        "salary_min": 50000 + 1000 * i,
+                        "salary_max": 70000 + 1000 * i,
+                        # bunched towards the end of June: a rising posting rate
+                        "created": f"2024-06-{30 - (i * i) // 16:02d}T09:00:00Z"
+                    }
+                    for i in range(20)
+                ] + [{"title": "Shared Listing", "salary_min": None, "salary_max": None}]
+            }
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def open_guard(**breaker_options):
+    """Guard with a quota no test gets near; the shared one allows 25 calls a minute."""
+    return UpstreamGuard("stub", rate=1000, capacity=1000, **breaker_options)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingFetch:
+    """Stand-in for get_market_data: slow, counts calls, can be made to fail."""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.calls = 0
+        self.failing = False
+        self.lock = threading.Lock()
+
+    def __call__(self, domain, location):
+        with self.lock:
+            self.calls += 1
+            version = self.calls
+        time.sleep(self.delay)
+        if self.failing:
+            return fallback_market_data(domain)
+        return {"domain": domain, "location": location, "job_count": version, "jobs": []}
+
+
+@contextmanager
+def stub_server(**options):
+    server = StubAdzuna(**options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_roles_fetched_in_one_round_trip():
+    """Every role is queried at once, so latency is about one request"""
+    print("\n" + "="*70)
+    print("TEST 1: Concurrent Role Queries")
+    print("="*70)
+
+    roles = map_domain_to_roles("technology")
+    # building the client (TLS context) is a one-off cost, not a round-trip
+    market_service.get_client()
+
+    with stub_server() as server:
+        start = time.perf_counter()
+        data = get_market_data("technology", base_url=server.base_url, guard=open_guard())
+        elapsed = time.perf_counter() - start
+
+    print(f"\n✓ {len(roles)} roles in {elapsed * 1000:.0f} ms (one request = {DELAY_S * 1000:.0f} ms)")
+    print(f"  Jobs: {data['job_count']}, average salary: {data['average_salary']}")
+
+    assert sorted(server.requests) == sorted((role, 1) for role in roles)
+    assert elapsed < DELAY_S * 2
+
+    # results follow role order and the shared listing is kept once
+    titles = [job["title"] for job in data["jobs"]]
+    assert titles[0] == f"{roles[0]} 1-0"
+    assert titles.count("Shared Listing") == 1
+    assert data["job_count"] == 20 * len(roles) + 1
+    assert data["salary_samples"] == 20 * len(roles)
+    assert data["trend"]["growth_30d"] > 0
+    assert data["hiring_trend"] == data["trend"]["label"] in ("growing", "booming")
+
+    # many listings but no dates: no trend to report, rather than a guess from the count
+    undated = market_service._build_market_data(
+        "technology", "us", [[[{"title": f"Job {i}", "created": "soon" if i else None} for i in range(40)]]]
+    )
+    assert undated["trend"] is None and undated["hiring_trend"] == "unknown"
+
+
+def test_pages_fetched_concurrently():
+    """Pages after the first go out together once page 1 reports the total"""
+    print("\n" + "="*70)
+    print("TEST 2: Concurrent Pagination")
+    print("="*70)
+
+    roles = map_domain_to_roles("technology")
+
+    with stub_server(count=60) as server:
+        start = time.perf_counter()
+        data = get_market_data("technology", max_pages=3, base_url=server.base_url, guard=open_guard())
+        elapsed = time.perf_counter() - start
+
+    print(f"\n✓ {len(server.requests)} requests in {elapsed * 1000:.0f} ms")
+
+    assert sorted(server.requests) == sorted((role, page) for role in roles for page in (1, 2, 3))
+    # page 1, then pages 2-3 together: two round-trips in total
+    assert elapsed < DELAY_S * 3
+    assert data["job_count"] == 60 * len(roles) + 1
+
+    # a role's pages stay in page order
+    titles = [job["title"] for job in data["jobs"] if job["title"].startswith(roles[0])]
+    assert [t.split()[-1].split("-")[0] for t in titles[::20]] == ["1", "2", "3"]
+
+
+def test_connections_kept_alive():
+    """The shared client reuses its connections across lookups"""
+    print("\n" + "="*70)
+    print("TEST 3: Keep-Alive Connection Reuse")
+    print("="*70)
+
+    with stub_server() as server:
+        get_market_data("research", base_url=server.base_url, guard=open_guard())
+        opened = len(server.connections)
+        get_market_data("research", base_url=server.base_url, guard=open_guard())
+        get_market_data("research", base_url=server.base_url, guard=open_guard())
+
+    print(f"\n✓ {len(server.requests)} requests over {len(server.connections)} connections")
+
+    assert len(server.requests) == 3 * len(map_domain_to_roles("research"))
+    assert len(server.connections) == opened
+
+
+def test_async_client_bounded_by_semaphore():
+    """The async path gathers requests but never exceeds MAX_CONCURRENCY"""
+    print("\n" + "="*70)
+    print("TEST 4: Async Fan-Out under a Semaphore")
+    print("="*70)
+
+    roles = map_domain_to_roles("technology")
+
+    async def lookups(base_url):
+        start = time.perf_counter()
+        data = await async_get_market_data("technology", max_pages=2, base_url=base_url, guard=open_guard())
+        return data, time.perf_counter() - start
+
+    limit = market_service.MAX_CONCURRENCY
+    market_service.MAX_CONCURRENCY = 2
+    try:
+        with stub_server(count=40) as server:
+            data, elapsed = asyncio.run(lookups(server.base_url))
+    finally:
+        market_service.MAX_CONCURRENCY = limit
+
+    print(f"\n✓ {len(server.requests)} requests, peak {server.peak_in_flight} in flight, {elapsed * 1000:.0f} ms")
+
+    assert len(server.requests) == 2 * len(roles)
+    assert server.peak_in_flight <= 2
+    assert data["job_count"] == 40 * len(roles) + 1
+
+    # the sync and async paths build the same report
+    with stub_server(count=40) as server:
+        sync = get_market_data("technology", max_pages=2, base_url=server.base_url, guard=open_guard())
+    assert sync["jobs"] == data["jobs"]
+
+
+def test_failed_roles_and_fallback():
+    """Failing roles are skipped; an unreachable API falls back"""
+    print("\n" + "="*70)
+    print("TEST 5: Failures and Fallback")
+    print("="*70)
+
+    roles = map_domain_to_roles("business")
+
+    with stub_server(failing=roles[:1]) as server:
+        data = get_market_data("business", base_url=server.base_url, guard=open_guard())
+        print(f"\n✓ One role failing: {data['job_count']} jobs")
+        assert data["job_count"] == 21
+        assert all(not job["title"].startswith(roles[0]) for job in data["jobs"])
+
+    with stub_server(failing=roles) as server:
+        data = get_market_data("business", base_url=server.base_url, guard=open_guard())
+        print(f"✓ All roles failing: {data['note']}")
+        assert data["job_count"] == 0 and data["hiring_trend"] == "unknown"
+
+    # nothing listening on the port any more
+    data = asyncio.run(async_get_market_data("business", base_url=server.base_url, guard=open_guard()))
+    print(f"✓ Server down: {data['note']}")
+    assert data["job_count"] == 0
+
+
+def test_cache_coalesces_concurrent_requests():
+    """500 simultaneous lookups of one key cost a single upstream fetch"""
+    print("\n" + "="*70)
+    print("TEST 6: Request Coalescing")
+    print("="*70)
+
+    fetch = CountingFetch(delay=0.2)
+    cache = MarketDataCache(fetch=fetch, path=None)
+
+    with ThreadPoolExecutor(max_workers=100) as pool:
+        results = list(pool.map(lambda _: cache.get("technology", "us"), range(500)))
+
+    async def burst():
+        return await asyncio.gather(*[cache.async_get("business", "us") for _ in range(500)])
+
+    async_results = asyncio.run(burst())
+    stats = cache.stats()
+    print(f"\n✓ 1000 lookups over 2 keys -> {fetch.calls} fetches")
+    print(f"  Stats: {stats}")
+
+    assert fetch.calls == 2
+    assert all(r == results[0] for r in results)
+    assert all(r["domain"] == "business" for r in async_results)
+    assert stats["misses"] == 1000 - stats["hits"] and stats["coalesced"] == stats["misses"] - 2
+
+    # keys ignore case
+    assert cache.get("Technology", "US") == results[0] and fetch.calls == 2
+
+
+def test_cache_serves_stale_while_refreshing():
+    """Stale entries return at once; one background refresh replaces them"""
+    print("\n" + "="*70)
+    print("TEST 7: Stale-While-Revalidate")
+    print("="*70)
+
+    fetch = CountingFetch(delay=0.2)
+    cache = MarketDataCache(fetch=fetch, path=None, ttl=0.5)
+
+    first = cache.get("technology")
+    time.sleep(0.6)
+
+    start = time.perf_counter()
+    stale = [cache.get("technology") for _ in range(50)]
+    elapsed = time.perf_counter() - start
+    print(f"\n✓ 50 stale reads in {elapsed * 1000:.1f} ms while refreshing")
+
+    assert elapsed < 0.1
+    assert all(s == first for s in stale)
+
+    while cache.stats()["refreshing"]:
+        time.sleep(0.01)
+    fresh = cache.get("technology")
+    print(f"✓ After refresh: job_count {first['job_count']} -> {fresh['job_count']}")
+    assert fetch.calls == 2 and fresh["job_count"] == 2
+
+    # past max_stale a lookup waits for new data instead
+    cache.max_stale = 0.6
+    time.sleep(0.7)
+    assert cache.get("technology")["job_count"] == 3
+
+
+def test_cache_keeps_good_data_on_failure():
+    """A failed refresh keeps serving the last live result"""
+    print("\n" + "="*70)
+    print("TEST 8: Refresh Failures")
+    print("="*70)
+
+    fetch = CountingFetch(delay=0.01)
+    cache = MarketDataCache(fetch=fetch, path=None, ttl=0.05, failure_ttl=5)
+
+    good = cache.get("law")
+    fetch.failing = True
+    time.sleep(0.1)
+
+    cache.get("law")
+    while cache.stats()["refreshing"]:
+        time.sleep(0.01)
+    for _ in range(20):
+        assert cache.get("law") == good
+
+    print(f"\n✓ Failed refresh kept job_count {good['job_count']}, {fetch.calls} fetches")
+    # one retry per failure_ttl, not one per request
+    assert fetch.calls == 2 and cache.stats()["failures"] == 1
+
+    # with nothing cached the fallback is returned, and remembered briefly
+    down = cache.get("research")
+    assert down["hiring_trend"] == "unknown"
+    assert cache.get("research") == down and fetch.calls == 3
+
+
+def test_cache_persists_to_disk():
+    """A new worker loads cached entries instead of fetching"""
+    print("\n" + "="*70)
+    print("TEST 9: Disk Persistence")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/market_cache.json"
+
+        fetch = CountingFetch(delay=0.01)
+        cache = MarketDataCache(fetch=fetch, path=path)
+        saved = {domain: cache.get(domain) for domain in ("technology", "business")}
+
+        fetch.failing = True
+        cache.get("law")
+
+        restarted = MarketDataCache(fetch=fetch, path=path)
+        print(f"\n✓ Restarted cache: {restarted.stats()['entries']} entries from disk")
+
+        assert restarted.stats()["entries"] == 2
+        for domain, data in saved.items():
+            assert restarted.get(domain) == data
+        assert fetch.calls == 3
+
+        # concurrent saves each rename their own temp file and leave none behind
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: restarted._save(), range(32)))
+        assert [p.name for p in Path(tmp).iterdir()] == ["market_cache.json"]
+        assert MarketDataCache(fetch=fetch, path=path).stats()["entries"] == 2
+
+        # a corrupt file only means a cold start
+        with open(path, "w") as f:
+            f.write("{not json")
+        assert MarketDataCache(fetch=fetch, path=path).stats()["entries"] == 0
+
+
+def test_circuit_breaker_states():
+    """closed -> open after the threshold -> half-open probe -> closed"""
+    print("\n" + "="*70)
+    print("TEST 10: Circuit Breaker States")
+    print("="*70)
+
+    clock = FakeClock()
+    breaker = CircuitBreaker("stub", failure_threshold=3, reset_timeout=30, clock=clock)
+
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    # a success resets the run of failures
+    assert breaker.allow()
+    breaker.record_success()
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow() and breaker.reject_if_open()
+
+    # after the reset timeout exactly one probe goes out
+    clock.now = 30
+    assert breaker.metrics()["state"] == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # a failed probe reopens the circuit for another timeout
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now = 60
+    assert breaker.allow()
+    breaker.record_success()
+    metrics = breaker.metrics()
+    print(f"\n✓ Breaker metrics: {metrics}")
+
+    assert metrics["state"] == CLOSED
+    assert metrics["times_opened"] == 2 and metrics["rejected"] == 4
+    assert metrics["calls"] == 8 and metrics["failures"] == 6
+
+    # a probe that dies with a non-HTTP error frees the slot for the next probe
+    class BrokenClient:
+        def get(self, url, params=None):
+            raise RuntimeError("bug in the request path")
+
+    class AsyncBrokenClient:
+        async def get(self, url, params=None):
+            raise RuntimeError("bug in the request path")
+
+    guard = UpstreamGuard("stub", rate=1000, capacity=1000, failure_threshold=1, clock=clock)
+    for call in (
+        lambda: market_service._guarded_get(BrokenClient(), guard, "http://stub", "Engineer"),
+        lambda: asyncio.run(market_service._async_guarded_get(
+            AsyncBrokenClient(), guard, asyncio.Semaphore(1), "http://stub", "Engineer"
+        ))
+    ):
+        guard.breaker.record_failure()
+        clock.now += 30
+        try:
+            call()
+            raise AssertionError("error swallowed")
+        except RuntimeError:
+            pass
+        assert guard.breaker.state == HALF_OPEN and not guard.breaker._probing
+        assert guard.breaker.allow()
+        guard.breaker.record_success()
+
+
+def test_token_bucket():
+    """Bursts up to capacity, then refills at the configured rate"""
+    print("\n" + "="*70)
+    print("TEST 11: Token Bucket")
+    print("="*70)
+
+    clock = FakeClock()
+    bucket = TokenBucket(rate=25 / 60, capacity=25, clock=clock)
+
+    granted = sum(bucket.try_acquire() for _ in range(30))
+    assert granted == 25 and bucket.rejected == 5
+
+    clock.now = 12
+    granted = sum(bucket.try_acquire() for _ in range(10))
+    print(f"\n✓ 12 s after the burst: {granted} more tokens, metrics {bucket.metrics()}")
+    assert granted == 5
+
+    # tokens never pile up past capacity
+    clock.now = 3600
+    assert bucket.metrics()["tokens"] == 25
+
+    # background callers wait for the next token instead of being dropped
+    def sleep(seconds):
+        clock.now += seconds
+
+    paced = TokenBucket(rate=25 / 60, capacity=1, clock=clock, sleep=sleep)
+    start = clock.now
+    assert paced.acquire(timeout=10) and paced.acquire(timeout=10)
+    assert abs(clock.now - start - 60 / 25) < 1e-9
+    assert not paced.acquire(timeout=1) and paced.rejected == 1
+
+    # a rate-limited call hands back the breaker's half-open probe
+    guard = UpstreamGuard("stub", rate=0, capacity=0, failure_threshold=1)
+    guard.breaker.record_failure()
+    guard.breaker.opened_at -= guard.breaker.reset_timeout
+    assert guard.allow() == "rate_limited"
+    assert not guard.breaker._probing
+
+
+def test_open_circuit_skips_the_network():
+    """With the upstream down, lookups return in microseconds once the circuit opens"""
+    print("\n" + "="*70)
+    print("TEST 12: Open Circuit Short-Circuits Lookups")
+    print("="*70)
+
+    roles = map_domain_to_roles("technology")
+    guard = open_guard(failure_threshold=3)
+
+    with stub_server() as server:
+        cache = MarketDataCache(
+            fetch=lambda domain, location: get_market_data(domain, location, base_url=server.base_url, guard=guard),
+            path=None, ttl=0
+        )
+        live = cache.get("technology")
+        sent = len(server.requests)
+
+        server.failing = set(roles)
+        get_market_data("technology", base_url=server.base_url, guard=guard)
+        assert guard.breaker.state == OPEN
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            data = get_market_data("technology", base_url=server.base_url, guard=guard)
+        per_call_us = (time.perf_counter() - start) / 1000 * 1e6
+
+        # the cache keeps serving the last live data
+        cached = [cache.get("technology") for _ in range(10)]
+        time.sleep(0.05)
+
+    metrics = guard.metrics()
+    print(f"\n✓ Open circuit: {per_call_us:.1f} µs per lookup, upstream saw {len(server.requests)} requests")
+    print(f"  Breaker: {metrics['breaker']}")
+
+    assert len(server.requests) == sent + len(roles)
+    assert data["hiring_trend"] == "unknown"
+    assert per_call_us < 100
+    assert all(c == live for c in cached)
+    assert metrics["breaker"]["rejected"] >= 1000
+
+    # a spent quota skips requests instead of waiting for tokens
+    limited = UpstreamGuard("stub", rate=0, capacity=2)
+    with stub_server() as server:
+        data = get_market_data("technology", base_url=server.base_url, guard=limited)
+    print(f"✓ Quota of 2 calls: {len(server.requests)} requests, {data['job_count']} jobs")
+    assert len(server.requests) == 2 and data["job_count"] == 41
+    assert limited.limiter.rejected == 1
+
+
+def test_market_status_endpoint():
+    """GET /market/status reports breaker, limiter and cache state"""
+    print("\n" + "="*70)
+    print("TEST 13: Market Status Endpoint")
+    print("="*70)
+
+    body = TestClient(app).get("/market/status").json()
+    print(f"\n✓ Upstreams: {list(body['upstreams'])}")
+
+    adzuna = body["upstreams"]["adzuna"]
+    assert adzuna["breaker"]["state"] in (CLOSED, OPEN, HALF_OPEN)
+    assert adzuna["limiter"]["capacity"] == 25
+    assert "coalesced" in body["cache"]
+
+
+if __name__ == "__main__":
+    test_roles_fetched_in_one_round_trip()
+    test_pages_fetched_concurrently()
+    test_connections_kept_alive()
+    test_async_client_bounded_by_semaphore()
+    test_failed_roles_and_fallback()
+    test_cache_coalesces_concurrent_requests()
+    test_cache_serves_stale_while_refreshing()
+    test_cache_keeps_good_data_on_failure()
+    test_cache_persists_to_disk()
+    test_circuit_breaker_states()
+    test_token_bucket()
+    test_open_circuit_skips_the_network()
+    test_market_status_endpoint()
+
+    print("\n" + "="*70)
+    print("✓ All Market Service Tests Completed!")
+    print("="*70 + "\n")
@@ -0,0 +1,258 @@
+"""
+Test examples for market ingestion and the listings store
+Shows normalisation, partitioned storage and store-backed market data
+"""
+
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from agents.market_intelligence_agent import analyze_market_intelligence, fetch_market_data
+from services import market_store
+from services.market_ingest import MarketIngestor, ingest_domains, run_ingestion
+from services.market_service import get_job_listings
+from services.market_store import (
+    MarketStore, annual_salary, extract_skills, normalise_listing, parse_salary, seniority
+)
+from services.upstream_guard import UpstreamGuard
+from test_market_service import open_guard, stub_server
+
+
+DAY = date(2026, 3, 2)
+
+
+def adzuna_job(i, title=None, description="Python and SQL, some Docker", salary=(60000, 80000), created=None):
+    return {
+        "id": str(i),
+        "title": title or f"<strong>Backend</strong> Developer {i}",
+        "description": description,
+        "company": {"display_name": f"Company {i % 7}"},
+        "location": {"display_name": "Austin, TX"},
+        "salary_min": salary[0],
+        "salary_max": salary[1],
+        "created": created or f"{DAY.isoformat()}T09:00:00Z"
+    }
+
+
+class temporary_store:
+    """A MarketStore in a temp dir, installed as the shared store."""
+
+    def __enter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = MarketStore(Path(self.tmp.name) / "market.db")
+        self.previous = market_store._store
+        market_store._store = self.store
+        return self.store
+
+    def __exit__(self, *exc):
+        market_store._store = self.previous
+        self.store.close()
+        self.tmp.cleanup()
+
+
+def test_normalisation():
+    """Salaries become annual figures; skills and seniority come from the text"""
+    print("\n" + "="*70)
+    print("TEST 1: Listing Normalisation")
+    print("="*70)
+
+    assert annual_salary(40) == 40 * 2080
+    assert annual_salary(6000) == 72000
+    assert annual_salary(95000) == 95000.0
+    assert annual_salary(0) is None
+
+    assert parse_salary("$150,000 - $200,000") == (150000.0, 200000.0)
+    assert parse_salary("80k-95k") == (80000.0, 95000.0)
+    assert parse_salary("Competitive") == (None, None)
+
+    assert seniority("Senior Data Engineer") == ("senior", 5)
+    assert seniority("Junior Analyst") == ("entry-level", 0)
+    assert seniority("Data Engineer") == ("mid-level", 2)
+
+    skills = extract_skills("We use python, SQL and Cloud (AWS/GCP/Azure); Javascript not Java.")
+    print(f"\n✓ Skills found: {skills}")
+    assert skills == ["Python", "SQL", "Cloud (AWS/GCP/Azure)", "JavaScript", "Java"]
+
+    row = normalise_listing(adzuna_job(1, salary=(45, None)), DAY.isoformat())
+    print(f"✓ Normalised: {row}")
+    assert row["title"] == "Backend Developer 1"
+    assert row["company"] == "Company 1" and row["location"] == "Austin, TX"
+    assert row["salary_min"] == row["salary_max"] == 45 * 2080
+    assert row["required_skills"] == ["Python", "SQL", "Docker"]
+    assert row["posting_date"] == DAY.isoformat()
+    assert row["listing_key"] == "adzuna:1"
+
+    # flat listings (market_data.json shape) keep their own fields
+    flat = normalise_listing({
+        "title": "Data Scientist", "company": "Google", "location": "Mountain View, CA",
+        "salary": "$150,000 - $200,000", "required_skills": ["Python"],
+        "experience_years": 2, "seniority_level": "mid-level", "posting_date": "2024-02-15"
+    }, DAY.isoformat())
+    same = normalise_listing({"title": " data  scientist ", "company": "GOOGLE", "location": "mountain view, ca"}, "x")
+    assert flat["salary_min"] == 150000 and flat["experience_years"] == 2
+    assert flat["listing_key"] == same["listing_key"]
+
+
+def test_partitioned_append_and_dedupe():
+    """Listings are stored once, in the partition of the day they were first seen"""
+    print("\n" + "="*70)
+    print("TEST 2: Partitions and Deduplication")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MarketStore(Path(tmp) / "market.db")
+
+        first = [adzuna_job(i) for i in range(10)]
+        # the same listing returned for two roles
+        assert store.append("technology", first + first[:3], DAY) == 10
+        assert store.append("technology", first, DAY) == 0
+
+        second = first[5:] + [adzuna_job(i) for i in range(10, 16)]
+        assert store.append("Technology", second, DAY + timedelta(days=1)) == 6
+
+        # the same listing in another domain is counted there too
+        assert store.append("data science", first[:2], DAY) == 2
+
+        counts = store.daily_counts("technology")
+        stats = store.stats()
+        print(f"\n✓ Daily counts: {counts}")
+        print(f"  Stats: {stats}")
+
+        assert counts == [(DAY.isoformat(), 10), ((DAY + timedelta(days=1)).isoformat(), 6)]
+        assert stats["technology"]["partitions"] == 2 and stats["technology"]["listings"] == 16
+        assert stats["data_science"]["listings"] == 2
+
+        # retention drops whole partitions
+        removed = store.prune(keep_days=1, today=DAY + timedelta(days=1))
+        assert removed == 12
+        assert store.daily_counts("technology") == [((DAY + timedelta(days=1)).isoformat(), 6)]
+        store.close()
+
+
+def test_domain_slice():
+    """Slices come from the daily aggregates plus the newest listings"""
+    print("\n" + "="*70)
+    print("TEST 3: Domain Slices")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MarketStore(Path(tmp) / "market.db")
+
+        old = DAY - timedelta(days=40)
+        store.append("finance", [adzuna_job(i, salary=(1, 1)) for i in range(5)], old)
+        store.append("finance", [adzuna_job(i, salary=(90000, 110000)) for i in range(5, 30)], DAY)
+        store.append("finance", [adzuna_job(30, title="Senior Quant", salary=(None, None))], DAY)
+
+        data = store.domain_slice("finance", today=DAY, max_jobs=10)
+        print(f"\n✓ {data['total_jobs']} jobs as of {data['as_of']}, average salary {data['average_salary']}")
+
+        # the 40-day-old partition is outside the 30-day window
+        assert data["total_jobs"] == 26
+        assert data["average_salary"] == 100000
+        assert data["market_size"] == "medium"
+        assert len(data["jobs"]) == 10
+
+        senior = next(j for j in store.domain_slice("finance", today=DAY)["jobs"] if j["title"] == "Senior Quant")
+        assert senior["experience_years"] == 5 and "salary_range" not in senior
+        assert data["jobs"][0]["salary_range"] == {"min": 90000, "max": 110000}
+
+        assert store.domain_slice("law", today=DAY) is None
+        store.close()
+
+
+def test_ingestion_run():
+    """An ingestion pass fetches every domain and appends it to the store"""
+    print("\n" + "="*70)
+    print("TEST 4: Ingestion Pass")
+    print("="*70)
+
+    domains = ingest_domains()
+    print(f"\n✓ Ingesting {domains}")
+    assert "engineering" in domains and "data_science" in domains
+
+    with stub_server(count=40) as server, tempfile.TemporaryDirectory() as tmp:
+        store = MarketStore(Path(tmp) / "market.db")
+        guard = open_guard()
+
+        def fetch(domain, location, max_pages):
+            return get_job_listings(domain, location, max_pages=max_pages, base_url=server.base_url, guard=guard)
+
+        result = run_ingestion(["technology", "law"], store=store, fetch=fetch, day=DAY)
+        print(f"  Result: {result}")
+
+        # 3 + 2 roles, two pages each; every stub page repeats "Shared Listing"
+        assert len(server.requests) == 10
+        assert result["domains"]["technology"]["fetched"] == 126
+        assert result["domains"]["technology"]["added"] == 121
+        assert result["domains"]["law"]["added"] == 81
+
+        again = run_ingestion(["technology"], store=store, fetch=fetch, day=DAY)
+        assert again["domains"]["technology"]["added"] == 0
+
+        # the background runner does a pass as soon as it starts
+        ingestor = MarketIngestor(interval=60, domains=["business"], store=store, fetch=fetch, day=DAY).start()
+        while ingestor.last_run is None:
+            time.sleep(0.01)
+        ingestor.stop()
+        assert ingestor.last_run["domains"]["business"]["added"] == 81
+        store.close()
+
+    # over a tight quota, paced requests wait for tokens instead of being dropped
+    with stub_server(count=40) as server:
+        for wait_s, expected in ((0, 2), (5, 6)):
+            guard = UpstreamGuard("stub", rate=2, capacity=2)
+            server.peak_in_flight = 0
+            listings = get_job_listings(
+                "technology", "us", max_pages=2, base_url=server.base_url, guard=guard, wait_s=wait_s
+            )
+            print(f"  wait_s={wait_s}: {guard.limiter.metrics()['granted']} of 6 requests sent")
+            assert guard.limiter.metrics()["granted"] == expected
+        assert len(listings) == 126 and server.peak_in_flight == 1
+
+
+def test_market_data_reads_from_store():
+    """fetch_market_data serves ingested slices without touching the API"""
+    print("\n" + "="*70)
+    print("TEST 5: Store-Backed Market Data")
+    print("="*70)
+
+    curated = fetch_market_data("technology")
+
+    with temporary_store() as store:
+        today = date.today()
+        store.append("technology", [adzuna_job(i, salary=(100000, 140000)) for i in range(5000)], today)
+
+        start = time.perf_counter()
+        for _ in range(20):
+            data = fetch_market_data("technology")
+        ms = (time.perf_counter() - start) / 20 * 1000
+        print(f"\n✓ Slice of {data['total_jobs']} listings in {ms:.2f} ms")
+
+        assert data["source"] == "ingested"
+        assert data["total_jobs"] == 5000
+        assert data["hiring_trend"] == data["trend"]["label"]
+        assert ms < 50
+
+        report = analyze_market_intelligence("technology", {"current_skills": ["Python"]})
+        salary = report["market_insights"]["salary_range"]
+        print(f"  Salary range: {salary}")
+        assert salary["minimum"] == 100000 and salary["maximum"] == 140000
+        assert report["market_insights"]["in_demand_skills"][0]["skill"] == "Python"
+
+        # domains without ingested listings still use market_data.json
+        assert "source" not in fetch_market_data("finance")
+
+    assert fetch_market_data("technology") == curated
+
+
+if __name__ == "__main__":
+    test_normalisation()
+    test_partitioned_append_and_dedupe()
+    test_domain_slice()
+    test_ingestion_run()
+    test_market_data_reads_from_store()
+
+    print("\n" + "="*70)
+    print("✓ All Market Store Tests Completed!")
+    print("="*70 + "\n")
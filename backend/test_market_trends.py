@@ -0,0 +1,180 @@
+"""
+Test examples for hiring trends
+Shows EWMA rate and slope estimates from dated listings
+"""
+
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from agents.market_intelligence_agent import calculate_demand_score, fetch_market_data
+from services.market_store import MarketStore
+from services.market_trends import MarketTrends, TrendSeries, curated_trends, store_trends, trend_label
+
+
+START = date(2026, 1, 1).toordinal()
+
+
+def poisson_series(rate_on_day, days=120, seed=0):
+    """(day, listings) pairs drawn from a day-varying posting rate."""
+    rng = random.Random(seed)
+    out = []
+    for d in range(days):
+        # Poisson draw by counting exponential gaps within one day
+        count, t = 0, rng.expovariate(rate_on_day(d))
+        while t < 1:
+            count += 1
+            t += rng.expovariate(rate_on_day(d))
+        out.append((START + d, count))
+    return out
+
+
+def test_rate_and_slope_estimates():
+    """Flat, rising and falling posting rates give matching trends"""
+    print("\n" + "="*70)
+    print("TEST 1: Rate and Slope Estimates")
+    print("="*70)
+
+    cases = {
+        "flat": (lambda d: 20.0, (-0.1, 0.1), "stable"),
+        "rising": (lambda d: 5.0 + 0.25 * d, (0.15, 0.5), "growing"),
+        "falling": (lambda d: 40.0 - 0.3 * d, (-1.0, -0.2), "declining")
+    }
+
+    for name, (rate, (low, high), label) in cases.items():
+        series = TrendSeries()
+        for day, count in poisson_series(rate):
+            series.add(day, count)
+
+        result = series.estimate()
+        expected_rate = rate(119)
+        print(f"\n✓ {name:>7}: {result} (true rate {expected_rate:.1f}/day)")
+
+        assert low <= result["growth_30d"] <= high
+        assert result["label"] == label
+        assert abs(result["rate_per_day"] - expected_rate) < 0.25 * expected_rate + 2
+
+    assert [trend_label(g) for g in (0.6, 0.2, 0.0, -0.3)] == ["booming", "growing", "stable", "declining"]
+
+
+def test_incremental_updates():
+    """Listings can arrive in any order and each update is O(1)"""
+    print("\n" + "="*70)
+    print("TEST 2: Incremental, Order-Independent Updates")
+    print("="*70)
+
+    rng = random.Random(3)
+    days = [START + rng.randint(0, 60) for _ in range(2000)]
+
+    ordered = TrendSeries()
+    for day in sorted(days):
+        ordered.add(day)
+
+    shuffled = TrendSeries()
+    for day in days:
+        shuffled.add(day)
+
+    a, b = ordered.estimate(), shuffled.estimate()
+    print(f"\n✓ Sorted: {a}")
+    print(f"  Shuffled: {b}")
+    assert a == b
+    assert ordered.daily_counts() == shuffled.daily_counts()
+    assert sum(ordered.daily_counts()) == sum(1 for d in days if d > START + 60 - 28)
+
+    # read as of a later day, a quiet market is declining
+    quiet = ordered.estimate(as_of=START + 120)
+    assert quiet["growth_30d"] < a["growth_30d"] and quiet["label"] == "declining"
+
+    trends = MarketTrends()
+    skills = ["Python", "SQL", "Docker", "Spark"]
+    start = time.perf_counter()
+    for i in range(100000):
+        trends.add_listing("technology", date.fromordinal(START + i % 90), skills[:1 + i % 4])
+    us = (time.perf_counter() - start) / 100000 * 1e6
+    print(f"✓ {us:.1f} µs per listing (domain + up to 4 skill series)")
+    assert us < 100
+    assert trends.trend("technology")["listings"] == 100000
+    assert trends.trend("technology", "spark")["listings"] == 25000
+
+
+def test_store_trends_follow_appends():
+    """Store trends replay stored listings once, then update on append"""
+    print("\n" + "="*70)
+    print("TEST 3: Trends over the Market Store")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MarketStore(Path(tmp) / "market.db")
+        today = date(2026, 3, 1)
+
+        def listings(day, n, offset):
+            return [{
+                "id": f"{day.isoformat()}-{offset + i}", "title": "Data Engineer",
+                "description": "Python, SQL and Spark" if i % 2 else "Python",
+                "created": day.isoformat()
+            } for i in range(n)]
+
+        # a rising market: more new listings every day
+        for d in range(30):
+            day = today - timedelta(days=30 - d)
+            store.append("data_science", listings(day, 2 + d, 0), day)
+
+        trends = store_trends(store)
+        before = trends.trend("data_science")
+        print(f"\n✓ After 30 days: growth {before['growth_30d']}, {before['listings']} listings")
+        assert before["listings"] == sum(2 + d for d in range(30))
+        assert before["label"] in ("growing", "booming")
+        assert store_trends(store) is trends
+
+        store.append("data_science", listings(today, 50, 0), today)
+        after = trends.trend("data_science")
+        print(f"✓ After today's batch: growth {after['growth_30d']}, {after['listings']} listings")
+        assert after["listings"] == before["listings"] + 50
+        assert after["daily_counts"][-1] == 50
+
+        spark = trends.trend("data_science", "Spark")
+        # every other listing mentions Spark
+        assert spark["listings"] == sum((2 + d) // 2 for d in range(30)) + 25
+        store.close()
+
+
+def test_demand_score_uses_numeric_trend():
+    """calculate_demand_score reads growth_30d and keeps label-only data working"""
+    print("\n" + "="*70)
+    print("TEST 4: Demand Score from a Numeric Trend")
+    print("="*70)
+
+    market = fetch_market_data("data_science")
+    trend = curated_trends().trend("data_science")
+    print(f"\n✓ data_science trend: {trend}")
+    assert market["trend"] == trend and market["hiring_trend"] == trend["label"]
+    assert market["rising_skills"]
+
+    base = {"total_jobs": 5, "jobs": [], "average_salary": 0}
+    scores = {
+        growth: calculate_demand_score({**base, "trend": {"growth_30d": growth}})
+        for growth in (-0.5, 0.0, 0.1, 0.25, 1.0)
+    }
+    for growth, result in scores.items():
+        print(f"  growth {growth:>5}: bonus {result['factors']['hiring_trend']['contribution']}")
+
+    bonuses = [r["factors"]["hiring_trend"]["contribution"] for r in scores.values()]
+    assert bonuses == [-10.0, 0.0, 4.0, 10.0, 20.0]
+
+    # listings without dates fall back to the curated label's growth
+    labelled = calculate_demand_score({**base, "hiring_trend": "growing"})
+    assert labelled["factors"]["hiring_trend"] == {"value": "growing", "growth_30d": 0.25, "contribution": 10.0}
+    assert fetch_market_data("technology")["trend"] is None
+
+
+if __name__ == "__main__":
+    test_rate_and_slope_estimates()
+    test_incremental_updates()
+    test_store_trends_follow_appends()
+    test_demand_score_uses_numeric_trend()
+
+    print("\n" + "="*70)
+    print("✓ All Market Trend Tests Completed!")
+    print("="*70 + "\n")
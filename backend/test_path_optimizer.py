@@ -0,0 +1,134 @@
+"""
+Test examples for the learning-path optimizer
+Shows budgeted resource selection across all gaps, checked against brute force
+"""
+
+import random
+import time
+
+from agents.resource_recommender_agent import (
+    BUDGET_LIMITS, optimize_learning_path, recommend_by_budget, recommend_resources
+)
+from core.path_optimizer import brute_force, random_problem, solve_cover
+
+
+GAPS = [
+    {"skill": "Python", "gap_value": 0.4},
+    {"skill": "machine learning", "gap_value": 0.35},
+    {"skill": "statistics", "gap_value": 0.3},
+    {"skill": "data science", "gap_value": 0.25},
+    {"skill": "SQL", "gap_value": 0.2}
+]
+
+
+def test_matches_brute_force():
+    """The memoised DP finds the best assignment within both budgets"""
+    print("\n" + "="*70)
+    print("TEST 1: DP vs Exhaustive Search")
+    print("="*70)
+
+    for seed in range(300):
+        rng = random.Random(seed)
+        weights, options, items = random_problem(rng.randint(0, 6), rng.randint(1, 4), seed=seed)
+        max_hours = rng.choice([None, 10, 40, 100])
+        max_cost = rng.choice([None, 0, 50, 100])
+
+        solved = solve_cover(weights, options, items, max_hours, max_cost)
+        assert solved["optimal"]
+        assert abs(solved["value"] - (brute_force(weights, options, items, max_hours, max_cost) or 0)) < 1e-9
+        assert max_hours is None or solved["hours"] <= max_hours
+        assert max_cost is None or solved["cost"] <= max_cost
+
+    # an item covering two gaps is paid for once
+    shared = solve_cover([0.5, 0.5], [[(0, 100)], [(0, 100), (1, 120)]], [(10, 30), (10, 30)], 15, 40)
+    print(f"\n✓ 300 random problems match brute force; shared item: {shared}")
+    assert shared["assignment"] == [0, 0] and shared["hours"] == 10 and shared["cost"] == 30
+
+
+def test_runtime_cap():
+    """Large problems stop at the cap and narrow the options instead"""
+    print("\n" + "="*70)
+    print("TEST 2: Runtime Cap")
+    print("="*70)
+
+    weights, options, items = random_problem(40)
+
+    start = time.perf_counter()
+    capped = solve_cover(weights, options, items, 300, None)
+    ms = (time.perf_counter() - start) * 1000
+    greedy = solve_cover(weights, options, items, 300, None, max_states=0)
+
+    print(f"\n✓ 40 gaps: {ms:.0f} ms, {capped['states']} states, {capped['width']} options per gap")
+    print(f"  Value {capped['value']:.1f} vs greedy {greedy['value']:.1f}")
+
+    # the full DP does not fit in the default 0.25 s; a narrowed one (or greedy) is returned
+    assert not capped["optimal"] and capped["width"] < 6
+    assert ms < 400
+    assert capped["value"] >= greedy["value"] and capped["hours"] <= 300
+    assert greedy["width"] == 0 and greedy["hours"] <= 300
+
+
+def test_learning_path_budgets():
+    """The optimized path respects total hours and spend, and reuses shared resources"""
+    print("\n" + "="*70)
+    print("TEST 3: Budgeted Learning Path")
+    print("="*70)
+
+    profiles = {
+        "free, 5 h/week": {"hours_per_week": 5, "budget_preference": "free"},
+        "affordable, 10 h/week": {"hours_per_week": 10, "budget_preference": "affordable"},
+        "any, $50 cap": {"hours_per_week": 20, "budget_preference": "any", "max_budget": 50},
+        "any, 1 h/week": {"hours_per_week": 1}
+    }
+
+    for name, profile in profiles.items():
+        path = optimize_learning_path(GAPS, profile)
+        totals, budget = path["totals"], path["budget"]
+        print(f"\n✓ {name}: {totals}")
+        for resource in path["resources"]:
+            print(f"    {resource['id']}: {resource['covers']} ({resource['hours_to_complete']} h, ${resource['price']})")
+
+        assert totals["hours"] <= budget["hours"]
+        assert budget["cost"] is None or totals["cost"] <= budget["cost"]
+        assert path["solver"]["optimal"]
+
+        # every step points at one of the distinct resources, each listed once
+        ids = [r["id"] for r in path["resources"]]
+        assert len(ids) == len(set(ids))
+        assert [s["skill"] for s in path["steps"]] == [g["skill"] for g in GAPS]
+        assert path["uncovered_skills"] == [s["skill"] for s in path["steps"] if s["resource"] is None]
+        for step in path["steps"]:
+            if step["resource"] is not None:
+                assert step["skill"] in next(r["covers"] for r in path["resources"] if r["id"] == step["resource"]["id"])
+
+    free = optimize_learning_path(GAPS, profiles["free, 5 h/week"])
+    assert all(r["price"] == 0 for r in free["resources"])
+    assert any(len(r["covers"]) > 1 for r in free["resources"])
+    assert any(s["shared_with_earlier_step"] for s in free["steps"])
+
+    # a tighter week never buys more hours than the budget allows
+    tight = optimize_learning_path(GAPS, profiles["any, 1 h/week"])
+    assert tight["totals"]["hours"] <= 12 and tight["totals"]["coverage"] < 1
+
+    report = recommend_resources(GAPS, profiles["affordable, 10 h/week"])
+    assert report["optimized_path"] == optimize_learning_path(GAPS, profiles["affordable, 10 h/week"])
+    assert report["optimized_path"]["totals"]["coverage"] == 1.0
+
+    # "affordable" is one tier: per resource by budget, for the whole path here
+    limit = BUDGET_LIMITS["affordable"]
+    assert optimize_learning_path(GAPS, profiles["affordable, 10 h/week"])["budget"]["cost"] == limit
+    prices = [
+        float(r["cost"].lstrip("$").split()[0]) if r["cost"].startswith("$") else 0.0
+        for rec in recommend_by_budget(GAPS, "affordable") for r in rec["resources"]
+    ]
+    assert prices and max(prices) <= limit
+
+
+if __name__ == "__main__":
+    test_matches_brute_force()
+    test_runtime_cap()
+    test_learning_path_budgets()
+
+    print("\n" + "="*70)
+    print("✓ All Path Optimizer Tests Completed!")
+    print("="*70 + "\n")
@@ -0,0 +1,54 @@
+"""
+Test examples for shared top-k ranking
+Shows that partial selection matches a full stable sort, ties included
+"""
+
+import random
+
+import numpy as np
+
+from core.ranking import bottom_k, top_k, top_k_indices
+
+
+def test_top_k_matches_sort():
+    """top_k / bottom_k equal the sorted prefix, with stable ties"""
+    print("\n" + "="*70)
+    print("TEST 1: Top-k vs Full Sort")
+    print("="*70)
+
+    rng = random.Random(5)
+    items = [{"id": i, "score": rng.randint(0, 20)} for i in range(2000)]
+    key = lambda x: x["score"]
+
+    for k in (0, 1, 5, 10, 1999, 2000, 5000):
+        assert top_k(items, k, key) == sorted(items, key=key, reverse=True)[:k]
+        assert bottom_k(items, k, key) == sorted(items, key=key)[:k]
+
+    best = top_k(items, 5, key)
+    print(f"\n✓ Top 5 ids/scores: {[(i['id'], i['score']) for i in best]}")
+
+
+def test_top_k_indices_matches_argsort():
+    """top_k_indices equals a stable argsort prefix"""
+    print("\n" + "="*70)
+    print("TEST 2: Top-k Indices vs Stable Argsort")
+    print("="*70)
+
+    rng = np.random.default_rng(5)
+    scores = rng.integers(0, 50, size=10000).astype(float)
+    expected = np.argsort(-scores, kind="stable")
+
+    for k in (1, 3, 10, 100, 9999, 10000):
+        assert (top_k_indices(scores, k) == expected[:k]).all()
+
+    print(f"\n✓ Top 10 indices: {top_k_indices(scores, 10).tolist()}")
+    print(f"  Scores: {scores[top_k_indices(scores, 10)].tolist()}")
+
+
+if __name__ == "__main__":
+    test_top_k_matches_sort()
+    test_top_k_indices_matches_argsort()
+
+    print("\n" + "="*70)
+    print("✓ All Ranking Tests Completed!")
+    print("="*70 + "\n")
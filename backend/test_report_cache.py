@@ -0,0 +1,145 @@
+"""
+Test examples for the content-addressed report section cache
+Shows per-section hits, targeted invalidation and eviction
+"""
+
+import time
+
+from agents.master_orchestrator import build_full_report, evaluate_all_domains
+from services.report_cache import ReportCache, section_key
+
+
+PROFILE = {
+    "analytical": 8, "creative": 5, "social": 6, "leadership": 7,
+    "practical": 6, "empathy": 4, "risk": 7, "focus": 9,
+    "hours_per_week": 6, "budget_preference": "free"
+}
+
+# low enough scores for skill gaps, so the report builds a learning path
+GAP_PROFILE = {
+    "analytical": 0.2, "creative": 0.4, "social": 0.0, "leadership": 0.2,
+    "practical": 0.4, "empathy": 0.5, "risk": 0.2, "focus": 0.2,
+    "hours_per_week": 6
+}
+
+
+def _report(profile, cache):
+    numeric = {k: v for k, v in profile.items() if isinstance(v, (int, float))}
+    results = evaluate_all_domains(numeric)
+    report = build_full_report(results[0], results, numeric, cache=cache)
+    report.pop("report_timing")
+    return report
+
+
+def _misses(cache, profile):
+    before = cache.stats()["misses"]
+    report = _report(profile, cache)
+    return cache.stats()["misses"] - before, report
+
+
+def test_repeat_profile_hits():
+    """An identical profile is served entirely from cache"""
+    print("\n" + "="*70)
+    print("TEST 1: Repeated Profile")
+    print("="*70)
+
+    cache = ReportCache()
+
+    start = time.perf_counter()
+    cold = _report(PROFILE, cache)
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    warm = _report(dict(PROFILE), cache)
+    warm_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n✓ Cold {cold_ms:.2f} ms, warm {warm_ms:.2f} ms")
+    print(f"  Stats: {cache.stats()}")
+    assert warm == cold
+    assert cache.stats()["hits"] == 8
+
+
+def test_targeted_invalidation():
+    """Changing hours_per_week only recomputes the sections that read it"""
+    print("\n" + "="*70)
+    print("TEST 2: Per-section Invalidation")
+    print("="*70)
+
+    cache = ReportCache()
+    _report(PROFILE, cache)
+
+    missed, _ = _misses(cache, dict(PROFILE, hours_per_week=12))
+
+    # pace, resources and market read hours_per_week; explanation reads every field
+    print(f"\n✓ Sections recomputed after hours_per_week change: {missed}")
+    assert missed == 4
+
+    # same values in a different key order only change the explanation
+    reordered = dict(reversed(list(PROFILE.items())))
+    missed, _ = _misses(cache, reordered)
+    print(f"  Sections recomputed after reordering keys: {missed}")
+    assert missed == 1
+
+    key = section_key("skill_gap", PROFILE, {"domain": "law"}, version=1)
+    assert key != section_key("skill_gap", PROFILE, {"domain": "law"}, version=2)
+    assert key == section_key("skill_gap", dict(PROFILE, hours_per_week=40), {"domain": "law"}, version=1)
+
+
+def test_eviction():
+    """Byte cap evicts least recently used entries; TTL expires them"""
+    print("\n" + "="*70)
+    print("TEST 3: LRU, Byte Cap and TTL")
+    print("="*70)
+
+    cache = ReportCache(max_bytes=3000)
+    for i in range(5):
+        cache.put(f"k{i}", "x" * 900)
+        cache.get("k0")
+
+    stats = cache.stats()
+    print(f"\n✓ After 5 puts of ~900 bytes: {stats}")
+    assert stats["bytes"] <= 3000
+    assert cache.get("k0") is not None
+    assert cache.get("k1") is None
+
+    value = {"nested": [1, 2]}
+    cache.put("copy", value)
+    cache.get("copy")["nested"].append(3)
+    assert cache.get("copy") == value
+
+    short = ReportCache(ttl=0.05)
+    short.put("k", "v")
+    time.sleep(0.1)
+    assert short.get("k") is None
+
+
+def test_budget_in_path_key():
+    """Profiles differing only in max_budget get their own learning path"""
+    print("\n" + "="*70)
+    print("TEST 4: Learning-Path Budget in Key")
+    print("="*70)
+
+    cache = ReportCache()
+    open_path = _report(GAP_PROFILE, cache)["resource_recommendations"]["optimized_path"]
+
+    capped = dict(GAP_PROFILE, max_budget=0)
+    missed, report = _misses(cache, capped)
+    path = report["resource_recommendations"]["optimized_path"]
+    print(f"\n✓ No budget cap: {open_path['totals']}")
+    print(f"  max_budget=0: {path['totals']} ({missed} sections recomputed)")
+
+    # resources and the explanation (every field) read max_budget
+    assert missed == 2
+    assert path["totals"]["cost"] == 0 and open_path["totals"]["cost"] > 0
+    assert path == _report(capped, None)["resource_recommendations"]["optimized_path"]
+
+
+if __name__ == "__main__":
+    test_repeat_profile_hits()
+    test_targeted_invalidation()
+    test_eviction()
+    test_budget_in_path_key()
+
+    print("\n" + "="*70)
+    print("✓ All Report Cache Tests Completed!")
+    print("="*70 + "\n")
@@ -0,0 +1,246 @@
+"""
+Test examples for the resource skill index
+Shows postings lookups matching a catalog scan, multi-skill queries and rebuilds
+"""
+
+import copy
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.resource_recommender_agent import (
+    get_resources_for_skill, get_resources_for_skills, load_resource_catalog, rank_resources
+)
+from core.ranking import top_k
+from core.resource_index import (
+    RESOURCE_TYPES, ResourceIndex, get_resource_index, scan, score_columns, synthetic_catalog
+)
+from services import data_loader
+from services.skill_vocabulary import skill_key
+
+
+def reference_rank(resources, criteria=None, limit=None):
+    """The per-resource scoring loop rank_resources replaced."""
+    criteria = criteria or {"max_hours": 100, "budget": "any", "learning_style": "any", "difficulty": "any"}
+    scored = []
+
+    for resource in resources:
+        price = resource.get("price", 0)
+        if criteria["budget"] == "free" and price > 0 or criteria["budget"] == "paid" and price == 0:
+            continue
+
+        score = 100
+        hours = resource.get("hours_to_complete", 50)
+        if hours > criteria["max_hours"]:
+            score -= (hours - criteria["max_hours"]) / 10
+        if criteria["learning_style"] != "any":
+            score += 15 if criteria["learning_style"] in resource.get("learning_style", []) else -10
+        if criteria["difficulty"] != "any" and resource.get("difficulty") == criteria["difficulty"]:
+            score += 10
+
+        score += (resource.get("rating", 4.0) - 3.0) * 10
+        score += min((resource.get("reviews", 0) / 1000) * 5, 20)
+        score += max((resource.get("updated_year", 2024) - 2020) * 2, 0)
+
+        resource["score"] = max(0, round(score, 1))
+        scored.append(resource)
+
+    return top_k(scored, limit, key=lambda x: x["score"])
+
+
+def test_lookup_matches_scan():
+    """Index lookups return the same resources, in the same order, as a scan"""
+    print("\n" + "="*70)
+    print("TEST 1: Index Lookup vs Catalog Scan")
+    print("="*70)
+
+    catalog = load_resource_catalog()
+    index = get_resource_index()
+    assert index is get_resource_index()
+
+    for skill in index.skills() + ["Python", "  Machine   Learning ", "ML fundamentals", "underwater basket weaving"]:
+        for rtype in ["all"] + [t for t, _ in RESOURCE_TYPES] + ["podcast"]:
+            found = get_resources_for_skill(skill, rtype)
+            assert [r.to_dict() for r in found] == scan(catalog, skill, rtype, index.vocabulary)
+
+    python = get_resources_for_skill("python")
+    print(f"\n✓ {len(index)} resources, {len(index.skills())} skills")
+    print(f"  'python' -> {[r['id'] for r in python]}")
+
+    # catalog spellings like "Python" and "SQL" are found case-insensitively
+    assert python and all("python" in [skill_key(s) for s in r["skills"]] for r in python)
+    assert [r["type"] for r in get_resources_for_skill("Python", "video")] == ["video"] * len(
+        get_resources_for_skill("python", "video"))
+
+    # results are the index's shared records, and they are read-only
+    assert python[0] is get_resources_for_skill("Python")[0]
+    assert python[0]["title"] == python[0].data["title"] and python[0]["type"] == python[0].type
+    for write in (lambda r: setattr(r, "score", 1), lambda r: r.data.__setitem__("score", 1)):
+        try:
+            write(python[0])
+            assert False, "records must be immutable"
+        except (AttributeError, TypeError):
+            pass
+    assert "score" not in python[0]
+
+
+def test_multi_skill_queries():
+    """Union and intersection of postings"""
+    print("\n" + "="*70)
+    print("TEST 2: Multi-Skill Queries")
+    print("="*70)
+
+    skills = ["Python", "statistics", "deep learning"]
+    ids = lambda resources: [r["id"] for r in resources]
+
+    union = ids(get_resources_for_skills(skills))
+    both = ids(get_resources_for_skills(["Python", "statistics"], match="all"))
+    print(f"\n✓ Any of {skills}: {len(union)} resources")
+    print(f"  Python and statistics: {both}")
+
+    expected_union = []
+    for skill in skills:
+        expected_union += [i for i in ids(get_resources_for_skill(skill)) if i not in expected_union]
+
+    assert sorted(union) == sorted(expected_union) and len(union) == len(set(union))
+    assert set(both) == set(ids(get_resources_for_skill("python"))) & set(ids(get_resources_for_skill("statistics")))
+    assert both and set(both) <= set(union)
+
+    assert get_resources_for_skills([]) == []
+    assert get_resources_for_skills(["Python", "nonexistent skill"], match="all") == []
+    books = get_resources_for_skills(skills, resource_type="book")
+    assert ids(books) == [r["id"] for r in get_resources_for_skills(skills) if r["type"] == "book"]
+
+
+def test_rebuilt_on_catalog_reload():
+    """A new catalog snapshot gets a new index"""
+    print("\n" + "="*70)
+    print("TEST 3: Rebuild on Catalog Change")
+    print("="*70)
+
+    before = get_resource_index()
+    snapshot = data_loader.current_snapshot()
+    files = dict(snapshot.files)
+    files["resource_catalog.json"] = data_loader.freeze({"books": {"sql_book": {"title": "SQL", "skills": ["SQL"]}}})
+
+    with data_loader.pinned_snapshot(data_loader.DataSnapshot(snapshot.version + 1, files, snapshot.mtimes)):
+        pinned = get_resource_index()
+        assert pinned is not before and len(pinned) == 1
+        assert [r["id"] for r in get_resources_for_skill("sql", "book")] == ["sql_book"]
+
+    assert len(get_resource_index()) == len(before)
+    print("\n✓ Pinned snapshot served its own index")
+
+
+def test_large_catalog():
+    """Postings lookups stay fast at 100k resources"""
+    print("\n" + "="*70)
+    print("TEST 4: 100k-Resource Catalog")
+    print("="*70)
+
+    catalog = synthetic_catalog(100000)
+    index = ResourceIndex(catalog)
+
+    for skill in ("skill 0", "skill 50", "skill 1999"):
+        assert [r.to_dict() for r in index.resources(index.lookup(skill, "book"))] == scan(catalog, skill, "book")
+
+    start = time.perf_counter()
+    for i in range(1000):
+        index.lookup(f"skill {i}")
+        index.lookup_many([f"skill {i}", "skill 0"], match="all")
+    us = (time.perf_counter() - start) / 1000 * 1e6
+    print(f"\n✓ {us:.1f} µs per lookup + intersection over {len(index)} resources")
+    assert us < 1000
+
+
+def test_vectorised_ranking():
+    """Column scoring ranks exactly like the per-resource loop"""
+    print("\n" + "="*70)
+    print("TEST 5: Vectorised Ranking")
+    print("="*70)
+
+    rng = random.Random(11)
+    catalog = synthetic_catalog(3000)
+    for resource in catalog["books"].values():
+        resource["reviews"] = rng.randint(0, 5000)
+        resource["learning_style"] = rng.sample(["video", "hands-on", "reading"], rng.randint(0, 2))
+        resource["difficulty"] = rng.choice(["beginner", "intermediate", "advanced"])
+    resources = [dict(r, type="synthetic", id=i) for section in catalog.values() for i, r in section.items()]
+
+    for _ in range(200):
+        criteria = {
+            "max_hours": rng.choice([3, 10, 36, 47.5, 120]),
+            "budget": rng.choice(["any", "free", "paid", "affordable"]),
+            "learning_style": rng.choice(["any", "video", "hands-on", "podcast"]),
+            "difficulty": rng.choice(["any", "beginner", "advanced"])
+        }
+        candidates = rng.sample(resources, rng.randint(0, 400))
+        limit = rng.choice([None, 3, 5, 50])
+        ranked = rank_resources(candidates, criteria, limit)
+        assert [r.to_dict() for r in ranked] == reference_rank(copy.deepcopy(candidates), criteria, limit)
+        assert not any("score" in r for r in candidates)
+
+    skills = ["Python", "statistics", "machine learning", "AI"]
+    ranked = rank_resources(get_resources_for_skills(skills), {
+        "max_hours": 120, "budget": "free", "learning_style": "video", "difficulty": "beginner"
+    })
+    print(f"\n✓ Top free video resources: {[(r['id'], r['score']) for r in ranked[:3]]}")
+    assert [r.to_dict() for r in ranked] == reference_rank([r.to_dict() for r in get_resources_for_skills(skills)], {
+        "max_hours": 120, "budget": "free", "learning_style": "video", "difficulty": "beginner"
+    })
+
+    # rankings are (id, score) views; the shared records are not written to
+    assert [tuple(r) for r in ranked[:1]] == [(ranked[0].id, ranked[0].score)]
+    assert all("score" not in r.resource for r in ranked)
+
+    # static terms are computed once per catalog; a query is a few array operations
+    index = ResourceIndex(synthetic_catalog(100000))
+    rows = index.lookup_many([f"skill {i}" for i in range(20)])
+    criteria = {"max_hours": 40, "budget": "free", "learning_style": "video", "difficulty": "beginner"}
+
+    start = time.perf_counter()
+    for _ in range(20):
+        kept, scores = score_columns(index.columns, rows, criteria)
+    ms = (time.perf_counter() - start) / 20 * 1000
+    print(f"  Scored {len(rows)} candidates in {ms:.2f} ms ({len(kept)} within budget)")
+    assert ms < 20
+
+
+def test_concurrent_ranking():
+    """Threads ranking the same shared records with different criteria agree with serial runs"""
+    print("\n" + "="*70)
+    print("TEST 6: Concurrent Ranking over Shared Records")
+    print("="*70)
+
+    resources = get_resources_for_skills(["Python", "statistics", "machine learning", "data science"])
+    queries = [
+        {"max_hours": hours, "budget": budget, "learning_style": style, "difficulty": "beginner"}
+        for hours in (5, 40, 120)
+        for budget in ("any", "free", "paid")
+        for style in ("any", "video", "hands-on")
+    ]
+
+    def rank(criteria):
+        return [tuple(r) for r in rank_resources(resources, criteria)]
+
+    serial = [rank(c) for c in queries]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(20):
+            assert list(pool.map(rank, queries)) == serial
+
+    print(f"\n✓ {len(queries)} criteria x 20 rounds on 8 threads matched the serial rankings")
+    print(f"  e.g. free/video/40h: {serial[13][:3]}")
+    assert len({tuple(ranking) for ranking in serial}) > 1
+
+
+if __name__ == "__main__":
+    test_lookup_matches_scan()
+    test_multi_skill_queries()
+    test_rebuilt_on_catalog_reload()
+    test_large_catalog()
+    test_vectorised_ranking()
+    test_concurrent_ranking()
+
+    print("\n" + "="*70)
+    print("✓ All Resource Index Tests Completed!")
+    print("="*70 + "\n")
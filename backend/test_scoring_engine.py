@@ -0,0 +1,216 @@
+"""
+Test examples for the compiled domain scoring engine
+Shows that matrix scoring matches the per-domain dict loop
+"""
+
+import random
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from agents.assessment_agent import evaluate_domain_fit, evaluate_domain_fit_batch
+from agents.master_orchestrator import evaluate_all_domains
+from agents.domain_agent import evaluate_all_domains as evaluate_all_careers
+from core.career_engine import cosine_score, rank_domains
+from main import app
+from core.scoring_engine import RunningScores, TRAITS, get_scoring_engine, project, scoring_scope
+from services.career_matcher import match_careers
+from services.data_loader import get_data, load_careers, load_weights
+
+
+def reference_domain_fit(domain, profile):
+    """The original dict-based scorer, kept here as the ground truth"""
+    weights = load_weights().get(domain)
+
+    score = 0
+    strengths = []
+    weaknesses = []
+
+    for skill, weight in weights.items():
+        val = profile.get(skill, 0)
+        score += val * weight
+
+        if val >= 7:
+            strengths.append(skill)
+        elif val <= 4:
+            weaknesses.append(skill)
+
+    final_score = round(score / (sum(weights.values()) or 1), 2)
+
+    return {
+        "domain": domain,
+        "score": final_score,
+        "verdict": "Excellent Fit" if final_score >= 7 else "Moderate Fit" if final_score >= 4 else "Low Fit",
+        "confidence": round((len(strengths) / len(weights)) * 100, 2),
+        "strengths": strengths,
+        "weaknesses": weaknesses
+    }
+
+
+def test_engine_layout():
+    """Inspect the compiled domains x traits matrix"""
+    print("\n" + "="*70)
+    print("TEST 1: Compiled Weight Matrix")
+    print("="*70)
+
+    engine = get_scoring_engine()
+
+    print(f"\n✓ Matrix shape: {engine.matrix.shape} (domains x traits)")
+    print(f"  Domains: {engine.domains}")
+    print(f"  Row totals: {engine.totals.tolist()}")
+    assert engine.matrix.shape == (len(load_weights()), len(TRAITS))
+
+
+def test_matches_dict_scorer():
+    """Engine output is identical to the dict loop for random profiles"""
+    print("\n" + "="*70)
+    print("TEST 2: Engine vs Dict Loop")
+    print("="*70)
+
+    rng = random.Random(7)
+    mismatches = 0
+
+    for n in range(2000):
+        if n % 2:
+            profile = {t: rng.randint(0, 10) for t in TRAITS}
+        else:
+            profile = {t: round(rng.uniform(0, 10), 3) for t in TRAITS if rng.random() < 0.9}
+
+        expected = [reference_domain_fit(d, profile) for d in load_weights()]
+        ranked = sorted(expected, key=lambda x: x["score"], reverse=True)
+
+        if evaluate_all_domains(profile) != ranked:
+            mismatches += 1
+        for result in expected:
+            if evaluate_domain_fit(result["domain"], profile) != result:
+                mismatches += 1
+
+    print(f"\n✓ Compared 2000 profiles, mismatches: {mismatches}")
+    print(f"  Unknown domain: {evaluate_domain_fit('astronomy', {})}")
+    assert mismatches == 0
+
+
+def test_batch_ranking():
+    """Batch ranking agrees with per-profile evaluation"""
+    print("\n" + "="*70)
+    print("TEST 3: Cohort Batch Ranking")
+    print("="*70)
+
+    rng = np.random.default_rng(11)
+    matrix = np.round(rng.uniform(0, 10, size=(500, len(TRAITS))), 2)
+    profiles = [dict(zip(TRAITS, row)) for row in matrix.tolist()]
+
+    from_dicts = evaluate_domain_fit_batch(profiles, top_k=3)
+    from_array = evaluate_domain_fit_batch(matrix, top_k=3)
+
+    mismatches = 0
+    for profile, ranked in zip(profiles, from_dicts):
+        expected = [(r["domain"], r["score"]) for r in evaluate_all_domains(profile)[:3]]
+        if [(r["domain"], r["score"]) for r in ranked] != expected:
+            mismatches += 1
+
+    print(f"\n✓ Ranked {len(from_dicts)} profiles")
+    print(f"  First profile top 3: {from_dicts[0]}")
+    print(f"  Mismatches vs evaluate_all_domains: {mismatches}")
+    assert mismatches == 0
+    assert from_dicts == from_array
+
+    # malformed cohorts and top_k are client errors, not 500s
+    client = TestClient(app)
+    ok = client.post("/assessment/evaluate-batch", json={"profiles": matrix[:2].tolist(), "top_k": 2})
+    assert ok.status_code == 200 and ok.json()["results"] == [ranked[:2] for ranked in from_array[:2]]
+    for body in (
+        {"profiles": [[1, 2, 3], [1, 2]]},
+        {"profiles": [[1, "x", 3]]},
+        {"profiles": [[1, None, 3]]},
+        {"profiles": [{"analytical": "high"}]},
+        {"profiles": [{"analytical": None}]},
+        {"profiles": [{"analytical": 7}, {"focus": None, "creative": 5}]},
+        {"profiles": matrix[:2].tolist(), "top_k": 2.5},
+        {"profiles": matrix[:2].tolist(), "top_k": -1},
+        {"profiles": matrix[:2].tolist(), "top_k": "3"}
+    ):
+        assert client.post("/assessment/evaluate-batch", json=body).status_code == 422, body
+
+
+def test_unified_views():
+    """All four scorers are views over the same compiled core"""
+    print("\n" + "="*70)
+    print("TEST 4: Unified Scoring Core")
+    print("="*70)
+
+    profile = {
+        "analytical": 8, "creative": 5, "social": 6, "leadership": 7,
+        "practical": 6, "empathy": 4, "risk": 7, "focus": 9
+    }
+
+    expected_domains = sorted(
+        [{"domain": d, "score": round(cosine_score(profile, v), 3)}
+         for d, v in get_data("domain_vectors.json").items()],
+        key=lambda x: x["score"], reverse=True
+    )
+    expected_careers = sorted(
+        [{"career": c["career"], "domain": c["domain"],
+          "score": round(sum(profile.get(t, 0) for t in c["traits"]), 2)}
+         for c in load_careers()],
+        key=lambda x: x["score"], reverse=True
+    )
+
+    with scoring_scope():
+        domains = rank_domains(profile)
+        careers = match_careers(profile)
+        all_careers = evaluate_all_careers(profile)
+        fits = evaluate_all_domains(profile)
+        shared = project(profile) is project(profile)
+
+    print(f"\n✓ rank_domains top: {domains[0]}")
+    print(f"  match_careers top: {careers[0]}")
+    print(f"  domain fit top: {fits[0]['domain']} ({fits[0]['score']})")
+    print(f"  Projection shared within scope: {shared}")
+
+    assert domains == expected_domains
+    assert careers == expected_careers[:10]
+    assert all_careers == expected_careers
+    assert shared
+
+
+def test_running_scores():
+    """Rank-1 updates give the same top two as re-scoring the profile"""
+    print("\n" + "="*70)
+    print("TEST 5: Incremental Re-scoring")
+    print("="*70)
+
+    rng = random.Random(3)
+    engine = get_scoring_engine()
+    mismatches = 0
+    updates = 0
+
+    for _ in range(300):
+        profile = {t: rng.randint(0, 10) for t in TRAITS if rng.random() < 0.7}
+        running = RunningScores(profile)
+
+        for _ in range(30):
+            trait = rng.choice(TRAITS)
+            profile[trait] = rng.randint(0, 10) + rng.choice([0, 0.5, 1 / 3])
+            running.set(trait, profile[trait])
+            updates += 1
+
+            expected = [(r["domain"], r["score"]) for r in engine.evaluate_all(profile, top_k=2)]
+            if running.top_two() != expected:
+                mismatches += 1
+
+    print(f"\n✓ {updates} single-trait updates, mismatches: {mismatches}")
+    print(f"  Last top two: {running.top_two()}")
+    assert mismatches == 0
+
+
+if __name__ == "__main__":
+    test_engine_layout()
+    test_matches_dict_scorer()
+    test_batch_ranking()
+    test_unified_views()
+    test_running_scores()
+
+    print("\n" + "="*70)
+    print("✓ All Scoring Engine Tests Completed!")
+    print("="*70 + "\n")
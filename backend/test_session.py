@@ -0,0 +1,241 @@
+"""
+Test examples for assessment sessions
+Shows the question/answer flow, session stores and the streamed report
+"""
+
+import json
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from agents import master_orchestrator
+from agents.master_orchestrator import build_full_report, evaluate_all_domains, stream_full_report
+from agents.session_agent import answer_session_question, next_session_question, start_session
+from main import app
+from services.session_store import SESSIONS, MemorySessionStore, SQLiteSessionStore, benchmark_memory
+
+
+PROFILE = {
+    "analytical": 8, "creative": 5, "social": 6, "leadership": 7,
+    "practical": 6, "empathy": 4, "risk": 7, "focus": 9
+}
+
+
+def _parse_sse(lines):
+    events = []
+    event = None
+    for line in lines:
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            events.append((event, json.loads(line[len("data: "):])))
+    return events
+
+
+def test_stream_report_over_sse():
+    """Every section arrives as its own event and matches the full report"""
+    print("\n" + "="*70)
+    print("TEST 1: Streamed Report over SSE")
+    print("="*70)
+
+    client = TestClient(app)
+    session_id = client.post("/session", json={"profile": PROFILE}).json()["session_id"]
+
+    # like /result, the stream waits for a completed assessment
+    assert client.get(f"/session/{session_id}/report/stream").status_code == 409
+
+    # answering with the seeded scores (5 for unseeded traits) completes it
+    while True:
+        step = client.get(f"/session/{session_id}/question").json()
+        if step["action"] == "complete":
+            break
+        client.post(f"/session/{session_id}/answer", json={"score": PROFILE.get(step["data"]["trait"], 5)})
+    profile = SESSIONS.get(session_id).profile()
+
+    with client.stream("GET", f"/session/{session_id}/report/stream") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(response.iter_lines())
+
+    names = [event for event, _ in events]
+    print(f"\n✓ Session {session_id}")
+    print(f"  Events in order: {names}")
+
+    assert names[:2] == ["best_domain", "top_5"]
+    assert names[-1] == "done"
+    assert sorted(names[2:-1]) == sorted(master_orchestrator.REPORT_SECTIONS)
+
+    # sections are cached by input, so the blocking report is the same
+    results = evaluate_all_domains(profile, top_k=5)
+    report = json.loads(json.dumps(build_full_report(results[0], results, profile), default=str))
+    for event, payload in events[:-1]:
+        assert report[event] == payload
+
+    assert client.get("/session/missing/report/stream").status_code == 404
+
+
+def test_first_section_does_not_wait_for_slowest():
+    """A slow market section does not hold back the others"""
+    print("\n" + "="*70)
+    print("TEST 2: Sections Stream Before the Slowest Finishes")
+    print("="*70)
+
+    original = master_orchestrator.analyze_market_intelligence
+    master_orchestrator.analyze_market_intelligence = lambda *args: time.sleep(0.3) or original(*args)
+
+    try:
+        results = evaluate_all_domains(PROFILE)
+        start = time.perf_counter()
+        arrivals = []
+        for event, _ in stream_full_report(results[0], results, PROFILE, cache=None):
+            arrivals.append((event, round((time.perf_counter() - start) * 1000, 1)))
+    finally:
+        master_orchestrator.analyze_market_intelligence = original
+
+    for event, ms in arrivals:
+        print(f"  {ms:>7} ms  {event}")
+
+    timings = dict(arrivals)
+    assert timings["roadmap"] < 100
+    assert timings["market_intelligence"] >= 300
+    assert arrivals[-2][0] == "market_intelligence"
+
+
+def test_session_flow_api():
+    """start -> question/answer loop -> result"""
+    print("\n" + "="*70)
+    print("TEST 3: Session Question Flow")
+    print("="*70)
+
+    client = TestClient(app)
+    rng = random.Random(1)
+    session_id = client.post("/session", json={"profile": {"hours_per_week": 8}}).json()["session_id"]
+
+    assert client.get(f"/session/{session_id}/result").status_code == 409
+
+    # the question loop only decides; the report is built once, by /result
+    reports = []
+    original = master_orchestrator._build_full_report
+    master_orchestrator._build_full_report = lambda *args, **kwargs: reports.append(1) or original(*args, **kwargs)
+
+    try:
+        answered = 0
+        while True:
+            step = client.get(f"/session/{session_id}/question").json()
+            if step["action"] == "complete":
+                break
+
+            # asking twice before answering returns the same question
+            assert client.get(f"/session/{session_id}/question").json()["data"] == step["data"]
+
+            reply = client.post(f"/session/{session_id}/answer", json={"score": rng.randint(3, 10)}).json()
+            assert reply["trait"] == step["data"]["trait"]
+            answered += 1
+
+        assert reports == []
+        result = client.get(f"/session/{session_id}/result").json()
+        assert len(reports) == 1
+    finally:
+        master_orchestrator._build_full_report = original
+
+    print(f"\n✓ Answered {answered} questions")
+    print(f"  Best domain: {result['best_domain']['domain']} ({result['best_domain']['score']})")
+    assert result["action"] == "final_result"
+    assert result["pace_customization"]["profile_analysis"]
+    assert client.post(f"/session/{session_id}/answer", json={"score": 5}).status_code == 422
+    assert client.get("/session/missing/question").status_code == 404
+
+
+def test_session_stores():
+    """SQLite sessions survive a restart; memory sessions expire"""
+    print("\n" + "="*70)
+    print("TEST 4: Memory and SQLite Session Stores")
+    print("="*70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sessions.db"
+
+        store = SQLiteSessionStore(path)
+        record = start_session({"analytical": 8, "hours_per_week": 12}, store=store)
+        step = next_session_question(record, store=store)
+        answer_session_question(record, 6.5, store=store)
+        store.close()
+
+        # "restart": a new store over the same file
+        reopened = SQLiteSessionStore(path)
+        loaded = reopened.get(record.session_id)
+        reopened.close()
+
+    print(f"\n✓ Reloaded from SQLite: {loaded.profile()}, asked mask {loaded.asked:b}")
+    assert loaded.profile() == record.profile()
+    assert loaded.asked == record.asked and loaded.asked
+    assert step["data"]["trait"] in loaded.profile()
+
+    memory = MemorySessionStore(ttl=0.05)
+    record = memory.create()
+    assert memory.get(record.session_id) is record
+    time.sleep(0.1)
+    assert memory.get(record.session_id) is None and len(memory) == 0
+
+    footprint = benchmark_memory(10000)
+    print(f"  Memory store footprint: {footprint}")
+    assert footprint["bytes_per_session"] < 1024
+
+
+def test_profile_validation_and_concurrent_answers():
+    """Bad trait scores are a 422; racing answers to one question count once"""
+    print("\n" + "="*70)
+    print("TEST 5: Profile Validation and Concurrent Answers")
+    print("="*70)
+
+    client = TestClient(app)
+    for bad in ({"analytical": "high"}, {"analytical": None}, {"focus": 11}, {"risk": True}, {"social": [1]}):
+        response = client.post("/session", json={"profile": bad})
+        assert response.status_code == 422, bad
+
+    response = client.post("/session", json={"profile": {"analytical": "7.5", "hours_per_week": 5}})
+    print(f"\n✓ Invalid trait scores rejected; numeric strings coerced: {response.status_code}")
+    assert response.status_code == 200
+
+    store = MemorySessionStore()
+    assert len(store) == 0
+    try:
+        start_session({"analytical": "x"}, store=store)
+        assert False, "invalid profile must raise"
+    except ValueError:
+        pass
+    assert len(store) == 0
+
+    record = start_session({"hours_per_week": 5}, store=store)
+    trait = next_session_question(record, store=store)["data"]["trait"]
+    barrier = threading.Barrier(8)
+
+    def answer(_):
+        barrier.wait()
+        try:
+            return answer_session_question(record, 6, store=store)
+        except ValueError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        replies = [r for r in pool.map(answer, range(8)) if r is not None]
+
+    print(f"  8 concurrent answers: {len(replies)} recorded")
+    assert len(replies) == 1
+    assert record.profile()[trait] == 6 and replies[0]["answers"] == 1
+
+
+if __name__ == "__main__":
+    test_stream_report_over_sse()
+    test_first_section_does_not_wait_for_slowest()
+    test_session_flow_api()
+    test_session_stores()
+    test_profile_validation_and_concurrent_answers()
+
+    print("\n" + "="*70)
+    print("✓ All Session Tests Completed!")
+    print("="*70 + "\n")
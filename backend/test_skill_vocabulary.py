@@ -0,0 +1,187 @@
+"""
+Test examples for the shared skill vocabulary
+Shows canonical IDs for aliases and spellings, bitsets, trie text matching and agent recall
+"""
+
+import random
+import re
+import time
+
+from agents.market_intelligence_agent import (
+    calculate_competition_score, extract_in_demand_skills, generate_job_alerts
+)
+from agents.resource_recommender_agent import get_resources_for_skill
+from services import data_loader
+from services.market_store import extract_skills, skill_vocabulary
+from services.skill_vocabulary import SkillVocabulary, get_skill_vocabulary, skill_key
+
+
+def regex_find(names, text):
+    """The alternation regex extract_skills used before the trie."""
+    pattern = re.compile(
+        r"(?<!\w)(" + "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True)) + r")(?!\w)",
+        re.IGNORECASE
+    )
+    canonical = {name.lower(): name for name in names}
+    found = []
+    for match in pattern.finditer(text):
+        name = canonical[match.group(1).lower()]
+        if name not in found:
+            found.append(name)
+    return found
+
+
+def test_canonical_ids():
+    """Aliases, case and hyphen variants share one ID; unknown names get per-call IDs"""
+    print("\n" + "="*70)
+    print("TEST 1: Canonical Skill IDs")
+    print("="*70)
+
+    vocabulary = get_skill_vocabulary()
+    assert vocabulary is get_skill_vocabulary()
+
+    before = len(vocabulary.alias_ids)
+    ml = vocabulary.resolve("Machine Learning")
+    for spelling in ("ML fundamentals", "machine-learning", "  MACHINE   learning ", "ml"):
+        assert vocabulary.resolve(spelling) == ml
+    assert vocabulary.name(ml) == "Machine Learning"
+    assert vocabulary.name(vocabulary.resolve("k8s")) == "Kubernetes"
+    assert skill_key(" Node-JS ") == "node js"
+
+    # words used in passing are not aliases: only specific forms resolve
+    assert vocabulary.resolve("cloud") is None and vocabulary.resolve("Torch") is None
+    assert vocabulary.name(vocabulary.resolve("cloud computing")) == "Cloud (AWS/GCP/Azure)"
+    assert vocabulary.name(vocabulary.resolve("torch framework")) == "PyTorch"
+    prose = "Our team works in the cloud and carries the torch for quality."
+    assert vocabulary.find(prose) == [] and extract_skills(prose) == []
+    print(f"\n✓ {len(vocabulary)} canonical skills; 'ML fundamentals' -> {ml} ({vocabulary.name(ml)})")
+
+    # request-time names get IDs in a per-call scope, stable per key,
+    # numbered from the vocabulary size; the shared vocabulary never grows
+    assert vocabulary.resolve("Underwater Basket Weaving") is None
+    skills = vocabulary.scope()
+    weaving = skills.id("Underwater Basket Weaving")
+    assert weaving == len(vocabulary) and skills.id("underwater-basket weaving") == weaving
+    assert skills.name(weaving) == "Underwater Basket Weaving"
+    assert skills.id("Pottery") == len(vocabulary) + 1
+    assert vocabulary.scope().id("Pottery") == len(vocabulary)
+    assert vocabulary.resolve("Underwater Basket Weaving") is None and len(vocabulary.alias_ids) == before
+
+    # bitsets: set operations on ints, no wider than the vocabulary plus the call's own names
+    user = skills.mask(["python", "ML fundamentals", "Underwater Basket Weaving"])
+    job = skills.mask(["Python", "Machine Learning", "SQL"])
+    assert (user & job).bit_count() == 2
+    assert skills.mask_names(job & ~user) == ["SQL"]
+    assert user.bit_length() <= len(vocabulary) + 2
+    assert skills.ids(["Python", "python 3", "Python3"]) == {vocabulary.resolve("Python")}
+
+
+def test_trie_matches_regex():
+    """The prefix trie finds the same skills as the alternation regex, faster"""
+    print("\n" + "="*70)
+    print("TEST 2: Trie vs Alternation Regex")
+    print("="*70)
+
+    names = list(skill_vocabulary())
+    plain = SkillVocabulary(names)
+    rng = random.Random(5)
+    words = ["and", "with", "experienced", "senior", "-", ",", "(remote)", "Javas", "Pythonic", "SQLite"]
+    texts = [
+        " ".join(rng.choice(names + words).upper() if rng.random() < 0.2 else rng.choice(names + words)
+                 for _ in range(rng.randint(0, 40)))
+        for _ in range(500)
+    ]
+
+    for text in texts:
+        assert [plain.name(i) for i in plain.find(text)] == regex_find(names, text)
+
+    # synthetic vocabulary with long shared prefixes
+    many = [f"skill {i}" for i in range(3000)] + [f"skill {i} advanced" for i in range(0, 3000, 7)]
+    big = SkillVocabulary(many)
+    text = " ".join(rng.choice(many) for _ in range(300))
+    assert [big.name(i) for i in big.find(text)] == regex_find(many, text)
+
+    def _time(fn):
+        start = time.perf_counter()
+        for _ in range(20):
+            fn()
+        return (time.perf_counter() - start) / 20 * 1000
+
+    trie_ms = _time(lambda: big.find(text))
+    regex_ms = _time(lambda: regex_find(many, text))
+    print(f"\n✓ 500 texts matched the regex; {len(many)} names: trie {trie_ms:.2f} ms vs regex {regex_ms:.2f} ms")
+    assert trie_ms < regex_ms
+
+    # listing text resolves aliases to the market vocabulary's names
+    found = extract_skills("Looking for ML fundamentals, NodeJS, k8s and Python3; JS a plus.")
+    print(f"  Aliases in a listing: {found}")
+    assert found[0] == "Machine Learning" and "JavaScript" in found and "Python" in found
+
+
+def test_agent_recall():
+    """Agents match skills by ID, so aliases and spellings agree"""
+    print("\n" + "="*70)
+    print("TEST 3: Agent Recall with Aliases")
+    print("="*70)
+
+    ml = [r["id"] for r in get_resources_for_skill("Machine Learning")]
+    assert ml and [r["id"] for r in get_resources_for_skill("ML fundamentals")] == ml
+    assert [r["id"] for r in get_resources_for_skill("machine-learning", "course")] == [
+        r["id"] for r in get_resources_for_skill("Machine Learning", "course")
+    ]
+    print(f"\n✓ 'ML fundamentals' finds {len(ml)} Machine Learning resources")
+
+    market = {"jobs": [
+        {"title": "ML Engineer", "required_skills": ["Machine Learning", "Python", "SQL"], "experience_years": 2},
+        {"title": "Data Scientist", "required_skills": ["ML", "python", "Statistics"], "experience_years": 4}
+    ]}
+
+    alerts = generate_job_alerts(market, ["ML fundamentals", "Python 3"])
+    print(f"  Alerts: {[(a['title'], a['match_score'], a['missing_skills']) for a in alerts]}")
+    assert alerts[0]["matching_skills"] == ["Machine Learning", "Python"]
+    assert [a["missing_skills"] for a in alerts] == [["SQL"], ["Statistics"]]
+
+    in_demand = extract_in_demand_skills(market)
+    assert in_demand[:2] == [
+        {"skill": "Machine Learning", "frequency": 2, "percentage_of_jobs": "100.0%"},
+        {"skill": "Python", "frequency": 2, "percentage_of_jobs": "100.0%"}
+    ]
+
+    competition = calculate_competition_score(market, ["machine learning", "PYTHON"])
+    assert competition["factors"]["required_skills"]["unique_count"] == 4
+    assert competition["factors"]["skill_match_with_user"]["match_ratio"] == "50.0%"
+
+
+def test_rebuilt_on_synonyms_change():
+    """A new synonyms file gets a new vocabulary and resource index"""
+    print("\n" + "="*70)
+    print("TEST 4: Rebuild on Synonyms Change")
+    print("="*70)
+
+    before = get_skill_vocabulary()
+    snapshot = data_loader.current_snapshot()
+    files = dict(snapshot.files)
+    files["skill_synonyms.json"] = data_loader.freeze({"Machine Learning": ["statistical learning"]})
+
+    with data_loader.pinned_snapshot(data_loader.DataSnapshot(snapshot.version + 1, files, snapshot.mtimes)):
+        pinned = get_skill_vocabulary()
+        assert pinned is not before
+        assert pinned.resolve("statistical learning") == pinned.resolve("Machine Learning")
+        assert pinned.resolve("k8s") is None
+        assert [r["id"] for r in get_resources_for_skill("statistical learning")] == [
+            r["id"] for r in get_resources_for_skill("Machine Learning")
+        ]
+
+    assert get_skill_vocabulary().resolve("statistical learning") is None
+    print("\n✓ Pinned snapshot served its own aliases")
+
+
+if __name__ == "__main__":
+    test_canonical_ids()
+    test_trie_matches_regex()
+    test_agent_recall()
+    test_rebuilt_on_synonyms_change()
+
+    print("\n" + "="*70)
+    print("✓ All Skill Vocabulary Tests Completed!")
+    print("="*70 + "\n")
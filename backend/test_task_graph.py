@@ -0,0 +1,278 @@
+"""
+Test examples for the report section task graph
+Shows concurrent fan-out, deadlines and per-section timings
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+from agents import master_orchestrator
+from agents.master_orchestrator import (
+    DEFAULT_SECTION_BUDGET_S, REPORT_SECTIONS, build_full_report, evaluate_all_domains
+)
+from core.task_graph import MAX_WORKERS, Task, get_executor, run_graph
+from main import app
+from services.report_cache import REPORT_CACHE
+from services.report_store import PendingSections, ReportStore
+
+
+def test_fan_out():
+    """Independent tasks overlap; dependents get their inputs"""
+    print("\n" + "="*70)
+    print("TEST 1: Concurrent Fan-out")
+    print("="*70)
+
+    def slow(value):
+        def fn(**deps):
+            time.sleep(0.1)
+            return value + sum(deps.values())
+        return fn
+
+    tasks = [
+        Task("a", slow(1)),
+        Task("b", slow(2)),
+        Task("c", slow(3)),
+        Task("d", slow(10), deps=("a", "b"))
+    ]
+    run = run_graph(tasks)
+
+    print(f"\n✓ Results: {run.results}")
+    print(f"  Total: {run.total_ms:.0f} ms, critical path: {run.critical_path_ms:.0f} ms")
+    assert run.results == {"a": 1, "b": 2, "c": 3, "d": 13}
+    assert run.total_ms < 350
+
+
+def test_deadline_and_errors():
+    """Deadline marks slow tasks; errors and bad graphs are raised"""
+    print("\n" + "="*70)
+    print("TEST 2: Deadline, Errors and Cycles")
+    print("="*70)
+
+    tasks = [
+        Task("fast", lambda: "ok"),
+        Task("slow", lambda: time.sleep(0.5)),
+        Task("after_slow", lambda slow: "never", deps=("slow",))
+    ]
+    run = run_graph(tasks, deadline=0.1)
+    summary = run.summary()
+
+    print(f"\n✓ Status: { {k: v['status'] for k, v in summary['sections'].items()} }")
+    assert run.results == {"fast": "ok"}
+    assert summary["sections"]["slow"]["status"] == "timeout"
+    assert summary["sections"]["after_slow"]["status"] == "skipped"
+
+    def boom():
+        raise RuntimeError("section failed")
+
+    for bad in ([Task("x", boom)], [Task("x", lambda y: y, deps=("y",)), Task("y", lambda x: x, deps=("x",))]):
+        try:
+            run_graph(bad)
+            raise AssertionError("expected an error")
+        except (RuntimeError, ValueError) as e:
+            print(f"  Raised: {e}")
+
+
+def test_context_propagation():
+    """Tasks see the caller's context variables"""
+    print("\n" + "="*70)
+    print("TEST 3: Context Propagation")
+    print("="*70)
+
+    var = contextvars.ContextVar("request", default=None)
+    var.set("req-42")
+
+    run = run_graph([Task("read", lambda: var.get())])
+
+    print(f"\n✓ Value seen in worker: {run.results['read']}")
+    assert run.results["read"] == "req-42"
+
+
+def test_report_timing():
+    """Full report carries per-section wall times"""
+    print("\n" + "="*70)
+    print("TEST 4: Report Section Timings")
+    print("="*70)
+
+    profile = {
+        "analytical": 8, "creative": 5, "social": 6, "leadership": 7,
+        "practical": 6, "empathy": 4, "risk": 7, "focus": 9
+    }
+    results = evaluate_all_domains(profile)
+    report = build_full_report(results[0], results, profile)
+    timing = report["report_timing"]
+
+    for name, section in timing["sections"].items():
+        print(f"  {name:<26} {section['status']:<8} {section['ms']} ms")
+    print(f"\n✓ Total {timing['total_ms']} ms, critical path {timing['critical_path_ms']} ms")
+
+    assert all(s["status"] == "done" for s in timing["sections"].values())
+    assert report["pace_customization"] is not None
+    assert report["market_intelligence"] is not None
+
+
+def test_budgets_and_late_sections():
+    """Late tasks go pending, keep running and land in the store"""
+    print("\n" + "="*70)
+    print("TEST 5: Section Budgets and Pending Results")
+    print("="*70)
+
+    store = ReportStore()
+    pending = PendingSections(store)
+
+    tasks = [
+        Task("fast", lambda: "ok", budget=1.0),
+        Task("slow", lambda: time.sleep(0.2) or "late", budget=0.05),
+        Task("after_slow", lambda slow: slow + "!", deps=("slow",), budget=0.05),
+        Task("broken", lambda: time.sleep(0.1) or 1 / 0, budget=0.05)
+    ]
+    run = run_graph(tasks, on_late=pending.on_late)
+    tokens = {name: pending.issue(name) for name, status in run.status.items() if status == "pending"}
+
+    print(f"\n✓ Returned after {run.total_ms:.0f} ms with {run.results}")
+    assert run.results == {"fast": "ok"}
+    assert set(tokens) == {"slow", "after_slow", "broken"}
+    assert store.get(tokens["slow"])["status"] == "pending"
+
+    time.sleep(0.4)
+    for name, token in tokens.items():
+        print(f"  {name}: {store.get(token)}")
+
+    assert store.get(tokens["slow"])["result"] == "late"
+    assert store.get(tokens["after_slow"])["result"] == "late!"
+    assert store.get(tokens["broken"])["status"] == "error"
+    assert store.get("missing") is None
+
+
+def test_budgets_exclude_queue_wait():
+    """Budgets start when a worker picks the task up; queue waits are capped too"""
+    print("\n" + "="*70)
+    print("TEST 6: Budgets on a Busy Pool")
+    print("="*70)
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    ran = []
+
+    def work(name, seconds=0.01):
+        def fn(**deps):
+            ran.append(name)
+            time.sleep(seconds)
+            return name
+        return fn
+
+    try:
+        # another request holds the only worker for 0.1 s; the queue wait
+        # plus the run is past the budget, but each alone is within it
+        pool.submit(release.wait, 0.1)
+        run = run_graph([Task("a", work("a", 0.1), budget=0.15)], executor=pool)
+
+        print(f"\n✓ After {run.total_ms:.0f} ms (0.1 s queued): {run.status}")
+        assert run.status == {"a": "done"}
+        assert run.total_ms >= 180
+
+        # a task still queued after its budget is given up on, and cancelled
+        pool.submit(release.wait, 0.3)
+        ran.clear()
+        run = run_graph([
+            Task("b", work("b"), budget=0.05),
+            Task("c", work("c"), deps=("b",), budget=0.05)
+        ], executor=pool)
+        print(f"  Budget 0.05 s on a busy pool: {run.status} after {run.total_ms:.0f} ms")
+        assert run.status == {"b": "skipped", "c": "skipped"}
+        assert run.total_ms < 150
+
+        # the run deadline caps the wait for tasks without a budget
+        run = run_graph([Task("d", work("d"))], deadline=0.05, executor=pool)
+        time.sleep(0.4)
+        print(f"  Deadline on a busy pool: {run.status}, ran afterwards: {ran}")
+        assert run.status == {"d": "skipped"} and ran == []
+
+        # a running task past its budget still times out
+        run = run_graph([Task("slow", lambda: time.sleep(0.2), budget=0.05)], executor=pool)
+        assert run.status == {"slow": "timeout"}
+    finally:
+        release.set()
+        pool.shutdown(wait=False)
+
+
+def test_report_api_pending_sections():
+    """POST /report with a slow market section, then fetch it by token"""
+    print("\n" + "="*70)
+    print("TEST 7: Partial Report over the API")
+    print("="*70)
+
+    client = TestClient(app)
+    profile = {
+        "analytical": 8, "creative": 5, "social": 6, "leadership": 7,
+        "practical": 6, "empathy": 4, "risk": 7, "focus": 9
+    }
+
+    # stand-in for a live market fetch that blows its budget
+    REPORT_CACHE.clear()
+    original = master_orchestrator.analyze_market_intelligence
+    master_orchestrator.analyze_market_intelligence = lambda *args: time.sleep(0.3) or original(*args)
+
+    try:
+        start = time.perf_counter()
+        report = client.post("/report", json={"profile": profile, "budgets": {"market_intelligence": 0.05}}).json()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        master_orchestrator.analyze_market_intelligence = original
+
+    placeholder = report["market_intelligence"]
+    print(f"\n✓ Report in {elapsed_ms:.0f} ms, market section: {placeholder}")
+    assert placeholder["status"] == "pending"
+    assert report["roadmap"] is not None
+    assert report["report_timing"]["sections"]["market_intelligence"]["status"] == "pending"
+
+    entry = client.get(f"/report/sections/{placeholder['token']}").json()
+    print(f"  Fetched right away: {entry['status']}")
+
+    time.sleep(0.5)
+    entry = client.get(f"/report/sections/{placeholder['token']}").json()
+    print(f"  Fetched later: {entry['status']}, keys {sorted(entry['result'])[:4]}")
+    assert entry["status"] == "done"
+    assert client.get("/report/sections/nope").status_code == 404
+
+    # with every shared worker busy, budgeted sections come back pending
+    # instead of the request waiting for the report deadline
+    release = threading.Event()
+    blockers = [get_executor().submit(release.wait, 5) for _ in range(MAX_WORKERS)]
+    try:
+        start = time.perf_counter()
+        busy = client.post("/report", json={
+            "profile": profile, "budgets": {name: 0.05 for name in REPORT_SECTIONS}
+        }).json()
+        elapsed_s = time.perf_counter() - start
+    finally:
+        release.set()
+        for blocker in blockers:
+            blocker.result()
+
+    print(f"  Busy pool: report in {elapsed_s:.2f} s, roadmap {busy['roadmap']['status']}")
+    assert elapsed_s < DEFAULT_SECTION_BUDGET_S + 0.5
+    assert all(busy[name]["status"] == "pending" for name in REPORT_SECTIONS)
+
+    # budgets must map known sections to non-negative seconds (or null)
+    for budgets in ([1], None, "fast", {"roadmap": "fast"}, {"roadmap": -1}, {"roadmap": True}, {"intro": 1}):
+        response = client.post("/report", json={"profile": profile, "budgets": budgets})
+        assert response.status_code == 422, (budgets, response.status_code)
+    assert client.post("/report", json={"profile": profile, "budgets": {"roadmap": None}}).status_code == 200
+
+
+if __name__ == "__main__":
+    test_fan_out()
+    test_deadline_and_errors()
+    test_context_propagation()
+    test_report_timing()
+    test_budgets_and_late_sections()
+    test_budgets_exclude_queue_wait()
+    test_report_api_pending_sections()
+
+    print("\n" + "="*70)
+    print("✓ All Task Graph Tests Completed!")
+    print("="*70 + "\n")